@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""全局图片资源管理：每张图片只从磁盘读取一次，并缓存转换后的图像和各尺寸的缩放结果"""
+import pygame
+
+# 图片路径 -> pygame.Surface
+_image_cache = {}
+# 已经转换为显示像素格式的图片路径
+_converted = set()
+# (图片路径, 尺寸) -> 缩放后的 pygame.Surface
+_scaled_cache = {}
+
+
+def _convert(image):
+    """转换为显示像素格式，带透明通道的图片保留透明度"""
+    if image.get_flags() & pygame.SRCALPHA:
+        return image.convert_alpha()
+    return image.convert()
+
+
+def load_image(path):
+    """按路径取出图片，首次使用时才读盘；返回的图像为共享对象，调用方不应修改"""
+    image = _image_cache.get(path)
+    if image is None:
+        image = pygame.image.load(path)
+        _image_cache[path] = image
+    if path not in _converted and pygame.display.get_surface() is not None:
+        # 窗口创建之前加载的图片，等有了显示窗口再转换
+        image = _convert(image)
+        _image_cache[path] = image
+        _converted.add(path)
+    return image
+
+
+def get_scaled_image(path, size):
+    """取出缩放到指定尺寸的图片，每个尺寸只缩放一次"""
+    size = tuple(size)
+    key = (path, size)
+    image = _scaled_cache.get(key)
+    if image is None or path not in _converted:
+        image = load_image(path)
+        if image.get_size() != size:
+            image = pygame.transform.scale(image, size)
+        _scaled_cache[key] = image
+    return image
+
+
+def clear_image_cache():
+    """清空图片缓存"""
+    _image_cache.clear()
+    _converted.clear()
+    _scaled_cache.clear()
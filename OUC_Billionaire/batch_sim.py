@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+批量对局模拟：用进程池在所有CPU核上跑完整对局，小游戏按抽样结果结算，
+扫描轮数、初始金钱、商店价格和小游戏奖励等参数，汇总胜率、得分分布和对局长度
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rules import GameRules, SHOP_PRICES, SHOP_QUBITS, build_board, read_board, PlayerState
+from bomb_simulator import (ROTATION_CARDS, STANDARD_MEASURE_COST, BOMB_PROBABILITY, CORRECT_REWARD,
+                            WRONG_PENALTY, EXPLOSION_PENALTY, zeno_prediction)
+
+# 默认参数（与 Settings 中的设置一致）
+DEFAULT_CONFIG = {
+    "locations_data_path": "data/locations_list.txt",
+    "player_names": ("红色小人", "橙色小人"),
+    "max_rounds": 8,
+    "player_init_money": 1000,
+    "shop_prices": SHOP_PRICES,
+    "reward_scale": 1.0,   # 小游戏金钱奖励的倍数
+}
+
+# Simon问题的设定（见 simon.py）：默认 3 个量子比特，每轮花费 叠加态 10 + H变换 5 + 测量A 10，
+# 解出后奖励 {n: (金钱, 积分)}，每少用一次Oracle额外奖励 30
+SIMON_QUBITS = 3
+SIMON_ROUND_COST = 10 + 5 + 10
+SIMON_REWARDS = {2: (300, 1), 3: (500, 2), 4: (800, 3)}
+SIMON_QUERY_BONUS = 30
+
+# 量子炸弹开局送给玩家的两个量子比特 |0> 和 |+>（见 quantum_bomb.play），检测用的是 |0> 的副本
+BOMB_GIFT_QUBITS = ((1, 0), (1 / np.sqrt(2), 1 / np.sqrt(2)))
+
+
+def bomb_outcomes(n=ROTATION_CARDS, bomb_probability=BOMB_PROBABILITY):
+    """
+    量子炸弹：用送的 |0> 比特执行 N 步Zeno策略（与 simulate_strategy(zeno_strategy(n)) 相同），
+    概率取解析预测；没有爆炸时要花一次标准基测量的钱
+    """
+    prediction = zeno_prediction(n, bomb_probability=bomb_probability)
+    wrong = 1 - prediction["accuracy"] - prediction["explosion_rate"]
+    return [
+        (prediction["accuracy"], {"money": CORRECT_REWARD, "cost": STANDARD_MEASURE_COST,
+                                  "qubits": BOMB_GIFT_QUBITS}),
+        (wrong, {"score": -WRONG_PENALTY, "cost": STANDARD_MEASURE_COST, "qubits": BOMB_GIFT_QUBITS}),
+        (prediction["explosion_rate"], {"score": -EXPLOSION_PENALTY, "qubits": BOMB_GIFT_QUBITS}),
+    ]
+
+
+def simon_outcomes(n=SIMON_QUBITS, max_queries=None):
+    """
+    Simon问题（与 simon.py 的价格和奖励一致）：每轮制备叠加态、查询Oracle、H变换、测量A，
+    测得的 y 在 s 的正交补中均匀分布。线性无关的 y 凑齐 n-1 个就能解出 s；
+    查询次数用完还没凑齐时，在剩下的候选中随便猜一个。按秩的变化精确计算每种结果的概率
+    """
+    max_queries = n * 2 if max_queries is None else max_queries
+    reward, score = SIMON_REWARDS[n]
+    outcomes = []
+    ranks = {0: 1.0}  # {已有的线性无关个数: 概率}
+    for queries in range(1, max_queries + 1):
+        next_ranks = {}
+        for rank, probability in ranks.items():
+            grow = 1 - 2.0 ** (rank - (n - 1))
+            next_ranks[rank + 1] = next_ranks.get(rank + 1, 0) + probability * grow
+            next_ranks[rank] = next_ranks.get(rank, 0) + probability * (1 - grow)
+        solved = next_ranks.pop(n - 1, 0)
+        bonus = (max_queries - queries) * SIMON_QUERY_BONUS
+        outcomes.append((solved, {"money": reward + bonus, "score": score,
+                                  "cost": queries * SIMON_ROUND_COST}))
+        ranks = next_ranks
+    # 没有解出时猜测：s 在剩下的 2^(n-rank)-1 个非零候选中均匀分布
+    win = lose = 0
+    for rank, probability in ranks.items():
+        candidates = 2 ** (n - rank) - 1
+        win += probability / candidates
+        lose += probability * (1 - 1 / candidates)
+    cost = max_queries * SIMON_ROUND_COST
+    outcomes.append((win, {"money": reward, "score": score, "cost": cost}))
+    outcomes.append((lose, {"cost": cost}))
+    return outcomes
+
+
+# 各小游戏的结果分布：[(概率, {"money": 奖励, "score": 积分变化, "cost": 花费, "qubits": 得到的量子比特}), ...]
+# 量子炸弹和Simon问题由上面的模型计算；量子迷宫没有花费，提示总是指向概率最大的格子，
+# 做一次 Oracle+Diffusion 后目标就是概率最大的格子，跟着提示走再 Check 一定成功（奖励 100），
+# 找错格子只得 10，这里按玩家跟着提示走计算
+MINI_GAME_OUTCOMES = {
+    "quantum_bomb": bomb_outcomes(),
+    "mini_game_2": [(1.0, {"money": 100})],
+    "simon": simon_outcomes(),
+}
+
+
+class SampledMiniGames():
+    """按结果分布抽样小游戏的结果，代替真正游玩（可以被子进程序列化）"""
+    def __init__(self, outcomes=None, reward_scale=1.0):
+        self.outcomes = outcomes or MINI_GAME_OUTCOMES
+        self.reward_scale = reward_scale
+
+    def __call__(self, rules, player, mini_game_id):
+        return self.sample(rules.rng, mini_game_id)
+
+    def sample(self, rng, mini_game_id):
+        """
+        用 rng（RandomStream 或 random.Random）抽样一次小游戏结果，
+        返回 {"money": 扣除花费后的金钱变化, "score": 积分变化, "qubits": 得到的量子比特的振幅}
+        """
+        outcomes = self.outcomes.get(mini_game_id)
+        if not outcomes:
+            return None
+        r = rng.random()
+        for probability, effect in outcomes:
+            r -= probability
+            if r < 0:
+                break
+        # 奖励按倍数缩放，花费不变
+        return {"money": int(effect.get("money", 0) * self.reward_scale) - effect.get("cost", 0),
+                "score": effect.get("score", 0),
+                "qubits": effect.get("qubits", ())}
+
+
+def buy_best_qubit(rules, player):
+    """商店决策：买一个买得起的、测得 |1> 概率最大的量子比特，同样概率时买便宜的"""
+    affordable = [name for name in SHOP_QUBITS if rules.shop_prices[name] <= player.money]
+    if not affordable:
+        return []
+    def value(name):
+        alpha, beta = SHOP_QUBITS[name]
+        return (abs(beta) ** 2 / (abs(alpha) ** 2 + abs(beta) ** 2), -rules.shop_prices[name])
+    return [max(affordable, key=value)]
+
+
+def _run_games(config, seeds):
+    """在一个进程中跑一批对局，返回每局的 (得分, 金钱, 回合数)"""
+    board = build_board(read_board(config["locations_data_path"]))
+    mini_games = SampledMiniGames(config.get("mini_game_outcomes"), config["reward_scale"])
+    scores, money, turns = [], [], []
+    for seed in seeds:
+        players = [PlayerState(name, config["player_init_money"], i + 1)
+                   for i, name in enumerate(config["player_names"])]
+        rules = GameRules(board, players, max_rounds=config["max_rounds"], seed=int(seed),
+                          shop_prices=config["shop_prices"], mini_game_policy=mini_games,
+                          shop_policy=config.get("shop_policy", buy_best_qubit))
+        rules.play_game()
+        scores.append([player.score for player in players])
+        money.append([player.money for player in players])
+        turns.append(rules.turns)
+    return scores, money, turns
+
+
+def run_batch(games, config=None, workers=None, seed=0, executor=None):
+    """
+    用进程池跑 games 局完整对局
+    参数:
+        config: 覆盖 DEFAULT_CONFIG 中的参数
+        workers: 进程数，默认为CPU核数
+        executor: 复用已有的进程池
+    返回:
+        汇总统计字典
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    seeds = np.random.SeedSequence(seed).generate_state(games)
+    workers = workers or os.cpu_count() or 1
+    # 每个进程一次跑一大块，减少进程间通信
+    chunks = [chunk for chunk in np.array_split(seeds, workers * 4) if len(chunk)]
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_games, [config] * len(chunks), chunks))
+    else:
+        parts = list(executor.map(_run_games, [config] * len(chunks), chunks))
+    scores = np.concatenate([np.array(part[0]) for part in parts])
+    money = np.concatenate([np.array(part[1]) for part in parts])
+    turns = np.concatenate([np.array(part[2]) for part in parts])
+    return summarize(scores, money, turns, config["player_names"])
+
+
+def summarize(scores, money, turns, player_names):
+    """汇总胜率（得分最高者获胜，并列单独统计）、得分分布和对局长度"""
+    best = scores.max(axis=1, keepdims=True)
+    winners = scores == best
+    tie = winners.sum(axis=1) > 1
+    return {
+        "games": len(scores),
+        "win_rate": {name: float((winners[:, i] & ~tie).mean()) for i, name in enumerate(player_names)},
+        "tie_rate": float(tie.mean()),
+        "score_mean": scores.mean(axis=0).tolist(),
+        "score_std": scores.std(axis=0).tolist(),
+        "score_percentiles": np.percentile(scores, [10, 50, 90]).tolist(),
+        "money_mean": money.mean(axis=0).tolist(),
+        "turns_mean": float(turns.mean()),
+    }
+
+
+def sweep(param, values, games=2000, config=None, workers=None, seed=0):
+    """依次改变一个参数，返回 [(参数值, 汇总统计), ...]"""
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for value in values:
+            run_config = dict(config or {})
+            run_config[param] = value
+            rows.append((value, run_batch(games, run_config, workers, seed, executor=pool)))
+    return rows
+
+
+def scaled_prices(scale):
+    """所有商品按比例调价"""
+    return {name: int(price * scale) for name, price in SHOP_PRICES.items()}
+
+
+def format_table(param, rows):
+    """把扫描结果排成文本表格"""
+    names = list(rows[0][1]["win_rate"])
+    header = [param] + [f"{name}胜率" for name in names] + ["平局", "平均得分", "得分P10/P50/P90", "平均金钱", "回合数"]
+    lines = [" | ".join(header)]
+    for value, stats in rows:
+        cells = [str(value)]
+        cells += [f"{stats['win_rate'][name]:.3f}" for name in names]
+        cells.append(f"{stats['tie_rate']:.3f}")
+        cells.append("/".join(f"{x:.2f}" for x in stats["score_mean"]))
+        cells.append("/".join(f"{x:.0f}" for x in stats["score_percentiles"]))
+        cells.append("/".join(f"{x:.0f}" for x in stats["money_mean"]))
+        cells.append(f"{stats['turns_mean']:.1f}")
+        lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sweeps = [
+        ("max_rounds", [4, 8, 12, 16]),
+        ("player_init_money", [500, 1000, 2000]),
+        ("shop_prices", [scaled_prices(s) for s in (0.5, 1.0, 1.5)]),
+        ("reward_scale", [0.5, 1.0, 2.0]),
+    ]
+    for param, values in sweeps:
+        rows = sweep(param, values, games)
+        if param == "shop_prices":
+            rows = [(f"价格×{s}", stats) for s, (_, stats) in zip((0.5, 1.0, 1.5), rows)]
+        print(format_table(param, rows))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import math
+import pygame
+
+
+def draw_dashed_arrow(screen, color, start, end, dash_length=10, space_length=5, arrow_size=10):
+    # 向量差
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    distance = math.hypot(dx, dy)
+    angle = math.atan2(dy, dx)
+
+    # 单位向量
+    x_unit = math.cos(angle)
+    y_unit = math.sin(angle)
+
+    # 虚线部分
+    drawn = 0
+    while drawn + dash_length < distance - arrow_size:
+        start_x = start[0] + x_unit * drawn
+        start_y = start[1] + y_unit * drawn
+        end_x = start[0] + x_unit * (drawn + dash_length)
+        end_y = start[1] + y_unit * (drawn + dash_length)
+        pygame.draw.line(screen, color, (start_x, start_y), (end_x, end_y), 2)
+        drawn += dash_length + space_length
+
+    # 箭头部分
+    # 箭头基准角度是主线角度 + 120° 和 -120°
+    arrow_tip = end
+    left_angle = angle + math.radians(150)
+    right_angle = angle - math.radians(150)
+
+    left_point = (
+        arrow_tip[0] + math.cos(left_angle) * arrow_size,
+        arrow_tip[1] + math.sin(left_angle) * arrow_size,
+    )
+    right_point = (
+        arrow_tip[0] + math.cos(right_angle) * arrow_size,
+        arrow_tip[1] + math.sin(right_angle) * arrow_size,
+    )
+
+    pygame.draw.polygon(screen, color, [arrow_tip, left_point, right_point])
+
+
+class Board():
+    """静态棋盘图层：地图、地点圆点、地点名称和连线箭头只在创建时绘制一次"""
+    def __init__(self, ai_settings, screen, locations, location_points):
+        self.ai_settings = ai_settings
+        self.screen = screen
+        self.locations = locations
+        self.location_points = location_points
+        self.rect = screen.get_rect()
+        self.image = None
+        self.rebuild()
+
+    def rebuild(self):
+        """重新绘制棋盘图层（地点数据变化时调用）"""
+        layer = pygame.Surface(self.rect.size)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(self.ai_settings.bg_color)
+        layer.blit(self.ai_settings.map, (0, 0))
+        for location in self.locations:
+            location.draw_location(layer)
+        for i in range(len(self.location_points)):
+            start = self.location_points[i]
+            end = self.location_points[(i + 1) % len(self.location_points)]  # 闭环
+            draw_dashed_arrow(layer, (0, 0, 0), start, end)
+        self.image = layer
+
+    def draw_board(self):
+        """将缓存的棋盘图层绘制到屏幕上"""
+        self.screen.blit(self.image, self.rect)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+量子炸弹检测的批量蒙特卡洛模拟：同一操作序列在大量试验上一次性向量化执行，用数据平衡价格和卡牌数量
+以及量子Zeno策略的解析预测：查表即可得到成功率，不需要模拟
+"""
+import numpy as np
+
+# 量子炸弹游戏的数值设定，游戏和模拟共用
+ROTATION_CARDS = 15          # 每局的旋转卡数量
+STANDARD_MEASURE_COST = 20   # 标准基测量的花费
+PM_MEASURE_COST = 10         # ±基测量的花费
+STRATEGY_COST = 50           # 查看策略指南的花费
+BOMB_PROBABILITY = 0.5       # 黑箱中有炸弹的概率
+
+# 结算（与 QuantumBombGame.get_result 的结果信息一致）
+CORRECT_REWARD = 400         # 判断正确获得的金钱
+WRONG_PENALTY = 2            # 判断错误扣除的积分
+EXPLOSION_PENALTY = 3        # 爆炸扣除的积分
+
+# 操作序列中可用的操作：("rotate", 弧度), "measure_std", "measure_pm", "blackbox"
+OPERATIONS = ("rotate", "measure_std", "measure_pm", "blackbox")
+
+
+def zeno_strategy(n, finish="measure_std"):
+    """量子Zeno策略：旋转 π/n 后过一次黑箱，重复 n 次，最后测量"""
+    return [("rotate", np.pi / n), "blackbox"] * n + [finish]
+
+
+def _zeno_tables(max_steps, angles):
+    """
+    预先计算 N 步“旋转θ后过黑箱”再标准基测量的解析结果，下标为 [N, θ(度)]
+    有炸弹时每一步以 cos²(θ/2) 的概率坍缩回 |0> 而不爆炸；没有炸弹时量子态一共旋转 Nθ
+    """
+    steps = np.arange(max_steps + 1)[:, None]
+    half = np.radians(angles)[None, :] / 2
+    survival = np.cos(half) ** (2 * steps)
+    dud_flip = np.sin(steps * half) ** 2
+    return survival, dud_flip
+
+
+# Zeno策略查询表：旋转次数 0~ROTATION_CARDS，角度取游戏中可输入的整数度数 0~360
+ZENO_SURVIVAL, ZENO_DUD_FLIP = _zeno_tables(ROTATION_CARDS, np.arange(361))
+
+
+def zeno_prediction(n, degrees=None, bomb_probability=BOMB_PROBABILITY):
+    """
+    N 步Zeno策略的解析预测，查表 O(1)
+    参数:
+        n: “旋转后过黑箱”的次数
+        degrees: 每次旋转的角度（度），默认 180/n，使没有炸弹时恰好转到 |1>；
+                 不指定角度时 n 至少为 1
+    返回:
+        字典：有炸弹时不爆炸的概率、没有炸弹时最后测到 |1> 的概率、爆炸率和最优判断的正确率
+    """
+    if degrees is None:
+        if n < 1:
+            raise ValueError(f"默认角度 180/n 要求 n >= 1，收到 n={n}；n=0 时请指定 degrees")
+        degrees = 180 / n
+    if 0 <= n <= ROTATION_CARDS and float(degrees).is_integer() and 0 <= degrees <= 360:
+        survival = ZENO_SURVIVAL[n, int(degrees)]
+        dud_flip = ZENO_DUD_FLIP[n, int(degrees)]
+    else:
+        half = np.radians(degrees) / 2
+        survival = np.cos(half) ** (2 * n)
+        dud_flip = np.sin(n * half) ** 2
+    # 测到 |1> 一定没有炸弹；测到 |0> 时按哪一方概率更大判断
+    accuracy = ((1 - bomb_probability) * dud_flip
+                + max(bomb_probability * survival, (1 - bomb_probability) * (1 - dud_flip)))
+    return {
+        'survival': float(survival),
+        'dud_flip': float(dud_flip),
+        'explosion_rate': float(bomb_probability * (1 - survival)),
+        'accuracy': float(accuracy),
+    }
+
+
+def _parse(operation):
+    """把操作统一成 (名称, 参数)"""
+    if isinstance(operation, str):
+        name, arg = operation, None
+    else:
+        name, arg = operation
+    if name not in OPERATIONS:
+        raise ValueError(f"未知的操作: {name}")
+    return name, arg
+
+
+def _measure(states, alive, basis, rng):
+    """
+    对存活的试验同时测量并坍缩，basis 为 (2, 2) 的测量基（每行一个基矢）
+    返回每个试验的测量结果（0/1）
+    """
+    # 旋转都是幺正的，量子态始终保持归一化
+    prob_0 = np.abs(states @ basis[0].conj()) ** 2
+    outcomes = (rng.random(len(states)) >= prob_0) & alive
+    states[alive] = basis[outcomes[alive].astype(int)]
+    return outcomes
+
+
+def _map_decision(keys, has_bomb, alive):
+    """
+    最大后验判断：测量结果相同的试验归为一类，每类按炸弹出现更多的一方判断
+    这是该操作序列能达到的最好判断，不依赖人为设定的判断规则
+    """
+    _, inverse = np.unique(keys[alive], return_inverse=True)
+    bombs = np.bincount(inverse, weights=has_bomb[alive])
+    totals = np.bincount(inverse)
+    judgment = np.zeros(len(keys), dtype=bool)
+    judgment[alive] = (2 * bombs > totals)[inverse]
+    return judgment
+
+
+def simulate_strategy(operations, trials=1000000, initial_state=(1, 0), decide=None,
+                      rotation_cards=ROTATION_CARDS, standard_cost=STANDARD_MEASURE_COST,
+                      pm_cost=PM_MEASURE_COST, bomb_probability=BOMB_PROBABILITY, rng=None, seed=None):
+    """
+    在 trials 次试验上同时执行一个操作序列，统计爆炸、识别和花费
+    参数:
+        operations: 操作列表，元素为 ("rotate", 弧度) 或 "measure_std"、"measure_pm"、"blackbox"
+        initial_state: 初始量子比特 (α, β)
+        decide: 判断函数，参数为 (trials, 测量次数) 的测量结果数组，返回每次试验是否判断为有炸弹；
+                为 None 时使用最大后验判断
+        rng: numpy.random.Generator，为 None 时用 seed 新建
+    返回:
+        统计结果字典
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    operations = [_parse(operation) for operation in operations]
+    rotations = sum(1 for name, _ in operations if name == "rotate")
+    if rotations > rotation_cards:
+        raise ValueError(f"操作序列需要 {rotations} 张旋转卡，超过了 {rotation_cards} 张")
+    measurements = sum(1 for name, _ in operations if name.startswith("measure"))
+    if measurements > 62:
+        raise ValueError("测量次数过多，无法编码测量结果")
+
+    standard_basis = np.eye(2, dtype=complex)
+    pm_basis = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+
+    states = np.empty((trials, 2), dtype=complex)
+    states[:] = initial_state
+    states /= np.linalg.norm(states[0])
+    has_bomb = rng.random(trials) < bomb_probability
+    alive = np.ones(trials, dtype=bool)
+    cost = np.zeros(trials)
+    outcomes = np.zeros((trials, measurements), dtype=np.int8)
+    keys = np.zeros(trials, dtype=np.int64)  # 测量结果序列的二进制编码
+
+    column = 0
+    for name, arg in operations:
+        if name == "rotate":
+            # 与 Qubit.apply_rotation 相同的绕Y轴旋转
+            c, s = np.cos(arg / 2), np.sin(arg / 2)
+            states = states @ np.array([[c, s], [-s, c]], dtype=complex)
+        elif name == "blackbox":
+            # 有炸弹的试验被标准基测量，测到 |1> 则爆炸；没有炸弹时量子态不变
+            tested = alive & has_bomb
+            exploded = _measure(states, tested, standard_basis, rng)
+            alive &= ~exploded
+        else:
+            basis = standard_basis if name == "measure_std" else pm_basis
+            cost[alive] += standard_cost if name == "measure_std" else pm_cost
+            result = _measure(states, alive, basis, rng)
+            outcomes[:, column] = result
+            keys = keys * 2 + result
+            column += 1
+
+    if decide is None:
+        judgment = _map_decision(keys, has_bomb, alive)
+    else:
+        judgment = np.asarray(decide(outcomes), dtype=bool)
+    exploded = ~alive
+    correct = alive & (judgment == has_bomb)
+    wrong = alive & ~correct
+
+    bomb_count = max(int(has_bomb.sum()), 1)
+    dud_count = max(int((~has_bomb).sum()), 1)
+    accuracy = correct.mean()
+    explosion_rate = exploded.mean()
+    return {
+        'trials': trials,
+        'rotations': rotations,
+        'measurements': measurements,
+        'explosion_rate': float(explosion_rate),
+        'accuracy': float(accuracy),
+        'error_rate': float(wrong.mean()),
+        # 有炸弹时既没爆炸又判断出炸弹（无相互作用检测）的比例
+        'bomb_detection_rate': float((correct & has_bomb).sum() / bomb_count),
+        'false_alarm_rate': float((alive & judgment & ~has_bomb).sum() / dud_count),
+        'mean_cost': float(cost.mean()),
+        'cost_std': float(cost.std()),
+        'max_cost': float(cost.max()),
+        # 每局的期望金钱收益（奖励减去测量花费）和期望扣除的积分
+        'expected_money': float(CORRECT_REWARD * accuracy - cost.mean()),
+        'expected_score_loss': float(WRONG_PENALTY * wrong.mean() + EXPLOSION_PENALTY * explosion_rate),
+    }
+
+
+def main():
+    """比较几种常见策略"""
+    strategies = {
+        "±基直接测量": ["measure_pm"],
+        "|+>过黑箱后±基测量": [("rotate", np.pi / 2), "blackbox", "measure_pm"],
+        "Zeno N=5": zeno_strategy(5),
+        "Zeno N=10": zeno_strategy(10),
+        f"Zeno N={ROTATION_CARDS}": zeno_strategy(ROTATION_CARDS),
+    }
+    for name, operations in strategies.items():
+        stats = simulate_strategy(operations, seed=0)
+        print(f"{name}: 爆炸 {stats['explosion_rate']:.3f}  正确 {stats['accuracy']:.3f}  "
+              f"检出炸弹 {stats['bomb_detection_rate']:.3f}  花费 {stats['mean_cost']:.1f}  "
+              f"期望收益 {stats['expected_money']:.1f}")
+    for n in (5, 10, ROTATION_CARDS):
+        prediction = zeno_prediction(n)
+        print(f"Zeno N={n} 解析预测: 爆炸 {prediction['explosion_rate']:.3f}  "
+              f"正确 {prediction['accuracy']:.3f}  检出炸弹 {prediction['survival']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+机器人玩家：只根据玩家的数据（量子比特、门、道具、金钱）做决策，不需要绘制画面
+界面中的 Player 和规则引擎中的 PlayerState 都可以使用
+"""
+import functools
+import itertools
+import random
+
+import numpy as np
+
+from qubit_states import GATE_MATRICES
+from random_service import stream, POLICIES
+from rules import SHOP_GATES, SHOP_QUBITS
+
+MEASURE_CARD = "不限回合测量卡"
+# LookaheadBot 最多缓存的局面估值个数
+VALUE_CACHE_SIZE = 100000
+
+
+def gate_label(gate):
+    """门的名称：界面中是 Gate 对象，规则引擎中直接是 "X"/"Z"/"H" """
+    return getattr(gate, "name", gate)
+
+
+def item_label(item):
+    """道具的名称：界面中是 Item 对象，规则引擎中直接是名称"""
+    return getattr(item, "name", item)
+
+
+def prob_one(states):
+    """每个量子比特测得 |1> 的概率（游戏结束时的期望得分）"""
+    return np.abs(np.asarray(states)[:, 1]) ** 2 if len(states) else np.zeros(0)
+
+
+def match_gates(player, plan):
+    """把 [(门名, 量子比特下标), ...] 换成玩家持有的门对象"""
+    remaining = list(player.gates)
+    choices = []
+    for name, index in plan:
+        gate = next(gate for gate in remaining if gate_label(gate) == name)
+        remaining.remove(gate)
+        choices.append((gate, index))
+    return choices
+
+
+def _apply(state, names):
+    """对单个量子比特的振幅按顺序作用一串门"""
+    for name in names:
+        state = GATE_MATRICES[name] @ state
+    return state
+
+
+@functools.lru_cache(maxsize=None)
+def _sequence_table(names, depth):
+    """
+    持有的门（排好序的元组）中取出最多 depth 个组成的所有不同序列，按长度排列，
+    以及每个序列的乘积矩阵叠成的数组（门的种类很少，结果可以一直缓存）
+    """
+    sequences = set()
+    for length in range(1, min(depth, len(names)) + 1):
+        sequences.update(itertools.permutations(names, length))
+    sequences = sorted(sequences, key=lambda sequence: (len(sequence), sequence))
+    matrices = np.array([functools.reduce(lambda m, name: GATE_MATRICES[name] @ m, sequence,
+                                          np.eye(2, dtype=complex)) for sequence in sequences])
+    return sequences, matrices
+
+
+# 商店中量子比特的归一化振幅
+SHOP_STATES = {name: np.array(amplitudes, dtype=complex) / np.linalg.norm(amplitudes)
+               for name, amplitudes in SHOP_QUBITS.items()}
+
+
+class Policy():
+    """
+    玩家决策接口，默认什么都不做
+    每个方法只读取玩家数据并返回决策，由界面或规则引擎执行
+    """
+    name = "human"
+
+    def observe(self, rules):
+        """决策前看到当前局面（GameRules），需要整局信息的机器人（如 MCTSBot）才会用到"""
+        pass
+
+    def close(self):
+        """游戏结束时释放占用的资源（如 MCTSBot 的进程池）"""
+        pass
+
+    def choose_gates(self, player):
+        """背包阶段要使用的门：[(player.gates 中的门, 量子比特下标), ...]，按顺序执行"""
+        return []
+
+    def choose_measurement(self, player):
+        """要用测量卡测量的量子比特下标，不使用时返回 None"""
+        return None
+
+    def choose_purchases(self, player, prices):
+        """在商店中要购买的商品名称列表（按顺序购买，钱不够的跳过）"""
+        return []
+
+
+class RandomBot(Policy):
+    """随机决策，作为基准"""
+    name = "random"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose_gates(self, player):
+        if not len(player.qubits):
+            return []
+        return [(gate, self.rng.randrange(len(player.qubits)))
+                for gate in player.gates if self.rng.random() < 0.5]
+
+    def choose_measurement(self, player):
+        has_card = any(item_label(item) == MEASURE_CARD for item in player.items)
+        if has_card and len(player.qubits) and self.rng.random() < 0.5:
+            return self.rng.randrange(len(player.qubits))
+        return None
+
+    def choose_purchases(self, player, prices):
+        names = [name for name, price in prices.items() if price <= player.money]
+        self.rng.shuffle(names)
+        return names[:self.rng.randint(0, min(2, len(names)))]
+
+
+class GreedyBot(Policy):
+    """贪心：每一步都选让期望得分（所有量子比特测得 |1> 的概率之和）增加最多的操作"""
+    name = "greedy"
+
+    def choose_gates(self, player):
+        states = [np.array(state) for state in player.qubits.states]
+        gates = list(player.gates)
+        plan = []
+        while gates and states:
+            best = None
+            for gate in gates:
+                matrix = GATE_MATRICES[gate_label(gate)]
+                for index, state in enumerate(states):
+                    gain = abs((matrix @ state)[1]) ** 2 - abs(state[1]) ** 2
+                    if gain > 1e-9 and (best is None or gain > best[0]):
+                        best = (gain, gate, index)
+            if best is None:
+                break
+            _, gate, index = best
+            states[index] = GATE_MATRICES[gate_label(gate)] @ states[index]
+            gates.remove(gate)
+            plan.append((gate, index))
+        return plan
+
+    def item_value(self, player, name):
+        """一件商品马上能带来的期望得分"""
+        if name in SHOP_QUBITS:
+            alpha, beta = SHOP_QUBITS[name]
+            return abs(beta) ** 2 / (abs(alpha) ** 2 + abs(beta) ** 2)
+        if name in SHOP_GATES:
+            states = player.qubits.states
+            if not len(states):
+                return 0.0
+            after = states @ GATE_MATRICES[SHOP_GATES[name]].T
+            return float(max(prob_one(after) - prob_one(states)))
+        # 测量卡和抢夺卡不直接增加期望得分
+        return 0.0
+
+    def choose_purchases(self, player, prices):
+        # 金钱在游戏结束时不计分，按“期望得分/价格”从高到低买到钱不够为止
+        money = player.money
+        values = {name: self.item_value(player, name) for name in prices}
+        plan = []
+        while True:
+            affordable = [name for name in prices if prices[name] <= money and values[name] > 0]
+            if not affordable:
+                return plan
+            name = max(affordable, key=lambda n: (values[n] / prices[n], -prices[n]))
+            plan.append(name)
+            money -= prices[name]
+            if name in SHOP_GATES:
+                # 同一个门只对最合适的那个量子比特有用，买过之后不再重复计价
+                values[name] = 0.0
+
+
+class LookaheadBot(GreedyBot):
+    """
+    向前搜索：对每个量子比特考虑最多 depth 个门组成的序列，
+    能发现贪心看不到的组合（例如 |+> 先 Z 再 H 得到 |1>）
+    """
+    name = "lookahead"
+
+    def __init__(self, depth=2):
+        self.depth = depth
+        self.values = {}  # {(振幅, 门): 期望得分}，局面在一局中会反复出现
+
+    def _sequences(self, names):
+        """从持有的门中取出最多 depth 个组成的所有不同序列（按长度排列）"""
+        return _sequence_table(tuple(sorted(names)), self.depth)[0]
+
+    def _allocate(self, states, names):
+        """把门分配给量子比特，返回 (期望得分增量, [(门名, 量子比特下标), ...])"""
+        states = np.array(states, dtype=complex).reshape(-1, 2)
+        names = list(names)
+        total, plan = 0.0, []
+        while names and len(states):
+            sequences, matrices = _sequence_table(tuple(sorted(names)), self.depth)
+            # 所有序列作用在所有量子比特上之后 |1> 的振幅只需要一次矩阵乘法：第 i 行第 k 列
+            # 是第 i 个序列作用在第 k 个量子比特上的结果
+            gains = np.abs(matrices[:, 1, :] @ states.T) ** 2 - np.abs(states[:, 1]) ** 2
+            # 序列按长度排列，同样的增量 argmax 取到门更少的序列
+            i, index = divmod(int(gains.argmax()), len(states))
+            if gains[i, index] <= 1e-9:
+                break
+            states[index] = matrices[i] @ states[index]
+            for name in sequences[i]:
+                names.remove(name)
+                plan.append((name, index))
+            total += float(gains[i, index])
+        return total, plan
+
+    def choose_gates(self, player):
+        _, plan = self._allocate(player.qubits.states, [gate_label(gate) for gate in player.gates])
+        return match_gates(player, plan)
+
+    def _value(self, states, names):
+        """
+        量子比特和门的最优组合能达到的期望得分，同样的局面只算一次
+        已经是 |1> 的量子比特不会再用门，直接各计 1 分，不放进缓存的键里
+        """
+        states = np.asarray(states, dtype=complex).reshape(-1, 2)
+        probabilities = prob_one(states)
+        done = probabilities > 1 - 1e-12
+        rest = states[~done]
+        key = (rest.tobytes(), tuple(sorted(names)))
+        value = self.values.get(key)
+        if value is None:
+            if len(self.values) >= VALUE_CACHE_SIZE:
+                self.values.clear()
+            gain = self._allocate(rest, names)[0] if names and len(rest) else 0.0
+            value = self.values[key] = float(probabilities[~done].sum()) + gain
+        return int(done.sum()) + value
+
+    def choose_purchases(self, player, prices):
+        """
+        每次考虑买一件或两件，按“期望得分增量/花费”选最好的一组，直到没有划算的
+        测量卡和抢夺卡不改变期望得分，不参与比较；每个量子比特的期望得分最多为 1，
+        两件组合的增量上限达不到最好单件的性价比时不再计算
+        （单核实测：手持 5 个量子比特、4 个门、1000 金钱时约 1000 次/秒，缓存命中后约 2400 次/秒；
+        对局中约 2500 次/秒。选门约 2 万次/秒）
+        """
+        money = player.money
+        states = np.array(player.qubits.states, dtype=complex).reshape(-1, 2)
+        names = [gate_label(gate) for gate in player.gates]
+        current = self._value(states, names)
+        useful = [name for name in prices if name in SHOP_QUBITS or name in SHOP_GATES]
+        # 所有单件和两件组合：(组合, 花费, 新的量子比特, 新的门)，每一步只是可选的范围在变
+        bundles = []
+        for size in (1, 2):
+            for bundle in itertools.combinations_with_replacement(useful, size):
+                bundles.append((bundle, sum(prices[name] for name in bundle),
+                                [SHOP_STATES[name] for name in bundle if name in SHOP_QUBITS],
+                                [SHOP_GATES[name] for name in bundle if name in SHOP_GATES]))
+        plan = []
+        while True:
+            best = None
+            for bundle, cost, new_qubits, new_gates in bundles:
+                if cost > money:
+                    continue
+                bound = len(states) + len(new_qubits) - current
+                if best is not None and bound / cost <= best[0]:
+                    continue
+                new_states = np.vstack([states] + new_qubits) if new_qubits else states
+                new_names = names + new_gates
+                gain = self._value(new_states, new_names) - current
+                if gain > 1e-9 and (best is None or gain / cost > best[0]):
+                    best = (gain / cost, bundle, new_states, new_names, cost)
+            if best is None:
+                return plan
+            _, bundle, states, names, cost = best
+            plan.extend(bundle)
+            money -= cost
+            current = self._value(states, names)
+
+
+BOTS = {
+    "random": RandomBot,
+    "greedy": GreedyBot,
+    "lookahead": LookaheadBot,
+}
+
+
+def make_bot(kind, seed=None):
+    """
+    按名称创建机器人，None 表示由人操作
+    seed 为 None 时从全局随机数服务的机器人子系统中取种子，设定了 random_seed 的一局可以复现
+    （MCTSBot 按思考时间搜索，每步的模拟次数随机器快慢变化，它的决策不能保证复现）
+    """
+    if kind is None:
+        return None
+    if seed is None:
+        seed = stream(POLICIES).integers(0, 2 ** 32)
+    if kind == "mcts":
+        # MCTSBot 建立在这里的机器人之上，在这里导入避免循环导入
+        from mcts_bot import MCTSBot
+        return MCTSBot(seed=seed)
+    if kind == RandomBot.name:
+        return RandomBot(seed)
+    return BOTS[kind]()
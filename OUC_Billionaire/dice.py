@@ -6,10 +6,15 @@ Created on Wed Jun 12 10:28:09 2019
 """
 
 import pygame
-import random
+from assets import load_image
+from random_service import stream, DICE
 
 class Dice():
     """骰子类"""
+    # 掷骰子动画的帧数和每帧持续时间（毫秒）
+    ROLL_FRAMES = 17
+    ROLL_FRAME_MS = 100
+
     def __init__(self, screen, messageboard):
         self.screen = screen
         self.messageboard = messageboard
@@ -17,11 +22,13 @@ class Dice():
         self.dice_side = []
         #显示骰子
         self.show_dice = True
+        # 骰子是否正在滚动（动画进行中）
+        self.rolling = False
         # 导入骰子的图片
         for i in range(1, 7):
             file_name_str = "dice" + str(i)
             file_path_str = "images/" + file_name_str + ".png"
-            dice_image = pygame.image.load(file_path_str)
+            dice_image = load_image(file_path_str)
             self.dice_side.append(dice_image)
         # 设置当前骰子的面图片以及位置参数
         self.cur_dice = self.dice_side[0]
@@ -57,33 +64,37 @@ class Dice():
         """绘制骰子"""
         self.screen.blit(dice_image, self.rect)
     
-    def roll_dice(self):
-        """掷骰子"""
-        #print("rolling dice...")
-        # 随机骰子的值并制造出骰子随机的效果
+    def start_roll(self):
+        """开始掷骰子，动画由主循环每帧调用 update() 推进，不再阻塞事件处理"""
+        self.rolling = True
+        self._roll_frame = 0
+        self._final_index = 0
+        self._next_frame_time = pygame.time.get_ticks()
+
+    def update(self):
+        """推进掷骰子动画，骰子停下时返回点数，否则返回 None"""
+        if not self.rolling:
+            return None
 
         if self._forced_value is not None:
             # 秘密控制模式下直接返回预设值
             value = self._forced_value
             self.cur_dice = self.dice_side[value - 1]
-            self.draw_dice(self.cur_dice)
-            pygame.display.update()
+            self.rolling = False
             return value
-        
-        final_index=0
-        
-        for i in range(1, 18):
-            index = random.randint(0, 5)
-            self.cur_dice = self.dice_side[index]
-            self.draw_dice(self.cur_dice)
-            pygame.display.update()
-            pygame.time.wait(100)
-            final_index = index
+
+        now = pygame.time.get_ticks()
+        if now < self._next_frame_time:
+            return None
+        self._next_frame_time = now + self.ROLL_FRAME_MS
+
+        if self._roll_frame < self.ROLL_FRAMES:
+            # 随机骰子的值并制造出骰子随机的效果
+            self._final_index = stream(DICE).integers(0, 6)
+            self.cur_dice = self.dice_side[self._final_index]
+            self._roll_frame += 1
+            return None
+
         # 骰子最后停下时的值
-        # result = random.randint(0, 5)
-        self.cur_dice = self.dice_side[final_index]
-        # self.cur_dice=self.dice_side[2]
-        self.draw_dice(self.cur_dice)
-        return final_index + 1
-        # return 2
-        
\ No newline at end of file
+        self.rolling = False
+        return self._final_index + 1
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""全局字体池与文字渲染缓存，所有模块共用同一份字体和已渲染的文字图像"""
+from collections import OrderedDict
+
+import pygame
+
+# 游戏中默认使用的中文字体
+FONT_PATH = 'fonts/Noto_Sans_SC.ttf'
+# 已渲染文字图像的最大缓存数量（超过后淘汰最久未使用的条目）
+TEXT_CACHE_SIZE = 1024
+
+# (字体路径, 字号) -> pygame.font.Font
+_font_pool = {}
+# (字体, 文字, 颜色, 背景色, 抗锯齿) -> pygame.Surface
+_text_cache = OrderedDict()
+
+
+def get_font(path, size):
+    """按 (字体路径, 字号) 从字体池取出字体，同一字体只加载一次；字体文件缺失时退回默认字体"""
+    key = (path, size)
+    font = _font_pool.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(path, size)
+        except (OSError, pygame.error):
+            font = pygame.font.Font(None, size)
+        _font_pool[key] = font
+    return font
+
+
+def render_text(font, text, color, bg=None, antialias=True):
+    """渲染文字并缓存结果，返回的图像为共享对象，调用方不应修改"""
+    color = tuple(color)
+    if bg is not None:
+        bg = tuple(bg)
+    key = (font, text, color, bg, antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    if bg is None:
+        surface = font.render(text, antialias, color)
+    else:
+        surface = font.render(text, antialias, color, bg)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def clear_text_cache():
+    """清空文字渲染缓存"""
+    _text_cache.clear()
@@ -2,6 +2,7 @@
 
 import sys
 import pygame
+from concurrent.futures import ThreadPoolExecutor
 from location import Location
 from location import Dorm
 from location import ScienceBuilding
@@ -17,56 +18,36 @@ from tools import UnlimitedMeasurementCard, StealCard
 import mini_game_teleportation
 import mini_game_2
 import json
-from player import Player
+from player import Player, Qubit
+from gate import XGate, ZGate, HGate
 import os
 import simon
 import quantum_bomb
-import math
 import shop
 import numpy as np
-
-def draw_dashed_arrow(screen, color, start, end, dash_length=10, space_length=5, arrow_size=10):
-    # 向量差
-    dx = end[0] - start[0]
-    dy = end[1] - start[1]
-    distance = math.hypot(dx, dy)
-    angle = math.atan2(dy, dx)
-
-    # 单位向量
-    x_unit = math.cos(angle)
-    y_unit = math.sin(angle)
-
-    # 虚线部分
-    drawn = 0
-    while drawn + dash_length < distance - arrow_size:
-        start_x = start[0] + x_unit * drawn
-        start_y = start[1] + y_unit * drawn
-        end_x = start[0] + x_unit * (drawn + dash_length)
-        end_y = start[1] + y_unit * (drawn + dash_length)
-        pygame.draw.line(screen, color, (start_x, start_y), (end_x, end_y), 2)
-        drawn += dash_length + space_length
-
-    # 箭头部分
-    # 箭头基准角度是主线角度 + 120° 和 -120°
-    arrow_tip = end
-    left_angle = angle + math.radians(150)
-    right_angle = angle - math.radians(150)
-
-    left_point = (
-        arrow_tip[0] + math.cos(left_angle) * arrow_size,
-        arrow_tip[1] + math.sin(left_angle) * arrow_size,
-    )
-    right_point = (
-        arrow_tip[0] + math.cos(right_angle) * arrow_size,
-        arrow_tip[1] + math.sin(right_angle) * arrow_size,
-    )
-
-    pygame.draw.polygon(screen, color, [arrow_tip, left_point, right_point])
-
-
-def update_screen(ai_settings, screen, gs, play_button, locations,
-                  location_points, messageboard, dice, pq):
+from fonts import FONT_PATH, get_font, render_text
+from scoring import score_players
+from rules import read_board, SHOP_PRICES, SHOP_GATES, SHOP_ITEMS, SHOP_QUBITS
+from bots import make_bot
+from mcts_bot import rules_from_game
+from random_service import stream, EVENTS, MEASUREMENT
+from batch_sim import SampledMiniGames
+
+def register_screen_regions(ai_settings, renderer, messageboard, dice):
+    """向渲染器注册主地图画面中需要单独跟踪变化的区域"""
+    renderer.add_region("board", pygame.Rect(0, 0, messageboard.box_1.left,
+                                             ai_settings.screen_height))
+    renderer.add_region("box_1", messageboard.box_1)
+    renderer.add_region("box_2", messageboard.box_2)
+    renderer.add_region("box_3", messageboard.box_3)
+    renderer.add_region("dice", dice.rect)
+    renderer.add_region("round_info", pygame.Rect(ai_settings.screen_width - 240, 10, 230, 40))
+
+def update_screen(ai_settings, screen, gs, play_button, board,
+                  messageboard, dice, pq, renderer):
     """更新屏幕上的图像，并切换到新屏幕"""
+    # 画面切换时渲染器会整屏刷新，主地图画面内只推送发生变化的区域
+    renderer.set_scene((gs.game_active, gs.game_state))
     screen.fill(ai_settings.bg_color)
     if gs.game_active:
         if gs.game_state == ai_settings.MINI_GAME_ACTIVE:
@@ -86,9 +67,7 @@ def update_screen(ai_settings, screen, gs, play_button, locations,
             
 
         elif gs.game_state in (ai_settings.GET_QUBIT, ai_settings.GET_ITEM):
-            scaled_bg = pygame.transform.scale(ai_settings.get_qubit_item_image, 
-                                      (ai_settings.screen_width, ai_settings.screen_height))
-            screen.blit(scaled_bg, (0, 0))
+            screen.blit(ai_settings.get_qubit_item_image, (0, 0))
             # 绘制奖励信息
             _draw_reward_message(ai_settings,gs, screen, messageboard)
 
@@ -113,7 +92,7 @@ def update_screen(ai_settings, screen, gs, play_button, locations,
                 )
                 pygame.draw.rect(screen, (255, 255, 200), msg_rect, border_radius=5)
                 pygame.draw.rect(screen, (200, 200, 100), msg_rect, width=2, border_radius=5)
-                msg_img = messageboard.font.render(gs.temp_message, True, (80, 80, 80))
+                msg_img = render_text(messageboard.font, gs.temp_message, (80, 80, 80))
                 screen.blit(msg_img, (
                     msg_rect.centerx - msg_img.get_width()//2,
                     msg_rect.centery - msg_img.get_height()//2
@@ -129,38 +108,59 @@ def update_screen(ai_settings, screen, gs, play_button, locations,
                 messageboard.draw_target_qubits(gs.steal_target)
                 
         else:
-            # 绘制地图等主游戏元素
-            screen.blit(ai_settings.map, (0, 0))
-            for location in locations:
-                location.draw_location()
-            # pygame.draw.lines(screen, ai_settings.line_color, True, location_points, 3)
-            for i in range(len(location_points)):
-                start = location_points[i]
-                end = location_points[(i + 1) % len(location_points)]  # 闭环
-                draw_dashed_arrow(screen, (0, 0, 0), start, end)
+            # 绘制地图等主游戏元素（地图、地点和连线已预先绘制在棋盘图层中）
+            board.draw_board()
             # print(f"Player {pq.cur_player.player_name}'s pos: ", pq.cur_player.pos)
             pq.reverse_draw() # 绘制玩家
             messageboard.draw_messageboard(gs, pq)
             # if gs.game_state == ai_settings.ROLL_DICE : # 只在掷骰子阶段画骰子
             dice.draw_dice(dice.cur_dice)
-            draw_round_info(screen, ai_settings, gs)
+            round_text = draw_round_info(screen, ai_settings, gs)
+
+            # 记录各区域的内容签名，只有签名变化的区域会被推送
+            renderer.mark("board", tuple(player.pos for player in pq.queue))
+            renderer.mark("box_1", None)
+            box_signatures = messageboard.get_box_signatures(gs)
+            renderer.mark("box_2", box_signatures["box_2"])
+            renderer.mark("box_3", box_signatures["box_3"])
+            renderer.mark("dice", dice.cur_dice)
+            renderer.mark("round_info", round_text)
+            renderer.present()
+            return
+        # 其余画面（背包、弹窗、结束界面等）整屏刷新
+        renderer.invalidate()
 
     else: # 游戏未激活
         screen.blit(ai_settings.bg_image, (0, 0))
         play_button.draw_button()
+        renderer.invalidate()
 
-    pygame.display.flip()
+    renderer.present()
 
 def draw_round_info(screen, ai_settings, gs):
     """在屏幕上显示当前回合信息"""
-    font = pygame.font.Font(None, 36)
+    font = get_font(None, 36)
     round_text = f"Round: {gs.current_round}/{gs.max_rounds}"
-    text_surface = font.render(round_text, True, (255, 255, 255))
+    text_surface = render_text(font, round_text, (255, 255, 255))
     
     # 在屏幕右上角显示回合信息
     text_rect = text_surface.get_rect()
     text_rect.topright = (ai_settings.screen_width - 20, 20)
     screen.blit(text_surface, text_rect)
+    return round_text
+
+def close_bots(pq):
+    """关闭所有机器人玩家（结束 MCTSBot 的进程池）"""
+    for player in pq.queue:
+        if player.policy is not None:
+            player.policy.close()
+
+def enter_game_over(ai_settings, gs, pq):
+    """进入游戏结束状态，并对所有玩家的量子比特统一测量计分（只进行一次）"""
+    gs.game_state = ai_settings.GAME_OVER
+    if gs.final_scores is None:
+        gs.final_scores = score_players(pq.queue, rng=stream(MEASUREMENT).generator)
+    close_bots(pq)
 
 def draw_game_over_screen(screen, ai_settings, gs, pq):
     """绘制美化版游戏结束界面"""
@@ -180,12 +180,13 @@ def draw_game_over_screen(screen, ai_settings, gs, pq):
     pygame.draw.rect(screen, (180, 170, 220), inner_border, 2)
     
     # 加载字体
-    font_large = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 72)
-    font_medium = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 48)
-    font_small = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 36)
+    font_large = get_font(FONT_PATH, 72)
+    font_medium = get_font(FONT_PATH, 48)
+    font_small = get_font(FONT_PATH, 36)
+    font_detail = get_font(FONT_PATH, 22)
     
     # 游戏结束标题 - 白色
-    game_over_text = font_large.render("游戏结束", True, (255, 255, 255))
+    game_over_text = render_text(font_large, "游戏结束", (255, 255, 255))
     game_over_rect = game_over_text.get_rect(center=(ai_settings.screen_width//2, 150))
     screen.blit(game_over_text, game_over_rect)
     
@@ -201,13 +202,14 @@ def draw_game_over_screen(screen, ai_settings, gs, pq):
         pygame.draw.rect(screen, (255, 255, 255), (rect_x, line_y + 10, 15, 15))
     
     # 显示最终结果 - 浅紫色
-    final_round_text = font_medium.render(f"总共进行了 {gs.max_rounds} 回合", True, (220, 210, 255))
+    final_round_text = render_text(font_medium, f"总共进行了 {gs.max_rounds} 回合", (220, 210, 255))
     final_round_rect = final_round_text.get_rect(center=(ai_settings.screen_width//2, 250))
     screen.blit(final_round_text, final_round_rect)
     
     # 排名区域
     ranking_start_y = 320
     sorted_players = sorted(pq.queue, key=lambda p: p.score, reverse=True)
+    final_results = {id(result['player']): result for result in (gs.final_scores or [])}
     ranking_height = 80 + len(sorted_players) * 45
     
     # 排名背景框 - 白色背景
@@ -222,7 +224,7 @@ def draw_game_over_screen(screen, ai_settings, gs, pq):
     pygame.draw.rect(screen, (180, 170, 220), title_bg_rect)
     
     # 排名标题 - 白色字体
-    ranking_title = font_medium.render("最终排名", True, (255, 255, 255))
+    ranking_title = render_text(font_medium, "最终排名", (255, 255, 255))
     ranking_title_rect = ranking_title.get_rect(center=(ai_settings.screen_width//2, ranking_start_y + 5))
     screen.blit(ranking_title, ranking_title_rect)
     
@@ -242,15 +244,25 @@ def draw_game_over_screen(screen, ai_settings, gs, pq):
         pygame.draw.rect(screen, color, rank_bg_rect)
         
         # 排名序号
-        rank_num = font_small.render(f"{i+1}", True, (255, 255, 255))
+        rank_num = render_text(font_small, f"{i+1}", (255, 255, 255))
         rank_num_rect = rank_num.get_rect(center=rank_bg_rect.center)
         screen.blit(rank_num, rank_num_rect)
         
         # 玩家信息
-        player_info = font_small.render(f"{player.player_name}: ${player.score}", True, color)
+        player_info = render_text(font_small, f"{player.player_name}: ${player.score}", color)
         player_rect = player_info.get_rect(left=ai_settings.screen_width//2 - 210, 
                                          centery=ranking_start_y + 57 + i*40)
         screen.blit(player_info, player_rect)
+
+        # 终局测量结果：测得 |1> 的个数，以及测量前的期望得分 ± 标准差
+        result = final_results.get(id(player))
+        if result is not None:
+            detail = (f"|1>×{result['ones']}/{result['qubit_count']}  "
+                      f"期望{result['expected']:.1f}±{result['variance'] ** 0.5:.1f}")
+            detail_info = render_text(font_detail, detail, color)
+            detail_rect = detail_info.get_rect(right=ai_settings.screen_width//2 + 260,
+                                               centery=ranking_start_y + 57 + i*40)
+            screen.blit(detail_info, detail_rect)
     
     # 退出提示区域背景 - 浅紫色
     quit_bg_y = ranking_start_y + ranking_height + 30
@@ -259,7 +271,7 @@ def draw_game_over_screen(screen, ai_settings, gs, pq):
     pygame.draw.rect(screen, (255, 255, 255), quit_bg_rect, 2)
     
     # 退出提示 - 深紫色
-    quit_text = font_small.render("点击x退出游戏", True, (80, 60, 120))
+    quit_text = render_text(font_small, "点击x退出游戏", (80, 60, 120))
     quit_rect = quit_text.get_rect(center=(ai_settings.screen_width//2, quit_bg_y + 25))
     screen.blit(quit_text, quit_rect)
 
@@ -289,30 +301,30 @@ def _draw_reward_message(ai_settings, gs, screen, messageboard):
         alpha_str = f"{qubit.alpha.real:.2f}".rstrip('0').rstrip('.')
         beta_str = f"{qubit.beta.real:.2f}".rstrip('0').rstrip('.')
         prob_1 = abs(qubit.beta)**2 * 100
-        title_surf = ai_settings.reward_font_large.render(title, True, (30, 30, 120))
+        title_surf = render_text(ai_settings.reward_font_large, title, (30, 30, 120))
         screen.blit(title_surf, (popup_rect.centerx - title_surf.get_width()//2, popup_rect.top + 20))
         
         state_text = f"量子态: {alpha_str}|0> + {beta_str}|1>"
-        state_surf = ai_settings.reward_font_small.render(state_text, True, (60, 60, 60))
+        state_surf = render_text(ai_settings.reward_font_small, state_text, (60, 60, 60))
         screen.blit(state_surf, (popup_rect.centerx - state_surf.get_width()//2, popup_rect.top + 120))
         
         prob_text = f"测量结果为1的概率: {prob_1:.1f}%"
-        prob_surf = ai_settings.reward_font_small.render(prob_text, True, (60, 60, 60))
+        prob_surf = render_text(ai_settings.reward_font_small, prob_text, (60, 60, 60))
         screen.blit(prob_surf, (popup_rect.centerx - prob_surf.get_width()//2, popup_rect.top + 160))
 
     elif gs.game_state == ai_settings.GET_ITEM:
         title = "获得道具"
         item = gs.reward_data["content"]
-        title_surf = ai_settings.reward_font_large.render(title, True, (30, 30, 120))
+        title_surf = render_text(ai_settings.reward_font_large, title, (30, 30, 120))
         screen.blit(title_surf, (popup_rect.centerx - title_surf.get_width()//2, popup_rect.top + 20))
         
         name_text = f"名称: {item.name}"
-        name_surf = ai_settings.reward_font_small.render(name_text, True, (60, 60, 60))
+        name_surf = render_text(ai_settings.reward_font_small, name_text, (60, 60, 60))
         screen.blit(name_surf, (popup_rect.centerx - name_surf.get_width()//2, popup_rect.top + 120))
         
         desc_lines = _wrap_text(item.description, ai_settings.reward_font_small, popup_width - 100)
         for i, line in enumerate(desc_lines):
-            desc_surf = ai_settings.reward_font_small.render(line, True, (80, 80, 80))
+            desc_surf = render_text(ai_settings.reward_font_small, line, (80, 80, 80))
             screen.blit(desc_surf, (popup_rect.centerx - desc_surf.get_width()//2, popup_rect.top + 160 + i*20))
     else:
         return
@@ -331,7 +343,7 @@ def _draw_reward_message(ai_settings, gs, screen, messageboard):
     pygame.draw.rect(screen, button_color, button_rect, border_radius=10)
     pygame.draw.rect(screen, (40, 80, 40), button_rect, width=2, border_radius=10)
     
-    confirm_text = ai_settings.reward_font_small.render("确认", True, (255, 255, 255))
+    confirm_text = render_text(ai_settings.reward_font_small, "确认", (255, 255, 255))
     screen.blit(confirm_text, (
         button_rect.centerx - confirm_text.get_width()//2,
         button_rect.centery - confirm_text.get_height()//2
@@ -359,6 +371,20 @@ def _wrap_text(text, font, max_width):
     
     return lines
 
+def is_animating(ai_settings, gs, dice):
+    """判断当前画面是否有动画需要按满帧率刷新"""
+    # 机器人操作时不阻塞等待事件，按帧推进
+    return dice.rolling or gs.bot_active
+
+def wait_for_events(ai_settings, gs, dice):
+    """空闲时阻塞等待事件，没有事件和动画时不再以固定帧率重绘"""
+    if is_animating(ai_settings, gs, dice) or pygame.event.peek():
+        return
+    event = pygame.event.wait(ai_settings.idle_wait_ms)
+    if event.type != pygame.NOEVENT:
+        # 放回队列，交给 check_events 统一处理
+        pygame.event.post(event)
+
 def check_events(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen):
     """监视并相应鼠标和键盘事件"""
     if gs.game_state == ai_settings.MINI_GAME_ACTIVE:
@@ -368,6 +394,7 @@ def check_events(ai_settings, gs, play_button, locations, messageboard, dice, pq
     for event in pygame.event.get():
         # 退出事件
         if event.type == pygame.QUIT:
+            close_bots(pq)
             pygame.quit()
             sys.exit()
 
@@ -383,10 +410,51 @@ def check_events(ai_settings, gs, play_button, locations, messageboard, dice, pq
                  check_click_events(ai_settings, gs, play_button, locations,
                                    messageboard, dice, pq, screen)
 
-def check_click_events(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen):
-    """处理鼠标点击事件的函数"""
+def update_dice(ai_settings, gs, locations, dice, pq):
+    """每帧推进掷骰子动画，骰子停下后结算本次移动"""
+    step = dice.update()
+    if step is not None:
+        handle_dice_result(ai_settings, gs, locations, step, pq)
+
+def handle_dice_result(ai_settings, gs, locations, step, pq):
+    """骰子停下后移动当前玩家并触发地点事件"""
+    # print(f"Player num:{}")
+    print(f"Player {pq.cur_player.player_name} rolled a {step}.")
+    print(f"Player {pq.cur_player.player_name} is at {pq.cur_player.pos}.")
+    pq.cur_player.move(step)
+    current_loc = locations[pq.cur_player.pos]
+    print(f"Player {pq.cur_player.player_name} moved to {current_loc.name}.")
+    gs.cur_event_index = current_loc.trigger_event(pq.cur_player) # cur_event_index 现在可以是字符串
+
+    gs.mini_game_result_message = "" # 重置小游戏结果
+    gs.shop_result_message = "" # 重置商店结果
+
+    # 进入背包前重置消息
+    if gs.cur_event_index == "SHOW_INVENTORY":
+        gs.temp_message = ""  # 明确初始化为空字符串
+    # 先进入背包展示状态
+    gs.game_state = ai_settings.SHOW_INVENTORY
+    gs.pending_reward = None  # 新增：存储待获得的奖励
+
+    # 根据地点事件设置后续状态
+    if gs.cur_event_index == "TRIGGER_MINI_GAME":
+        gs.next_state_after_inventory = ai_settings.MINI_GAME_STARTING
+        gs.current_mini_game_id = current_loc.mini_game_id
+    elif gs.cur_event_index == "TRIGGER_SHOP":
+        gs.next_state_after_inventory = ai_settings.SHOP_ENTERING
+    elif gs.cur_event_index == "GET_RANDOM_QUBIT":
+        gs.next_state_after_inventory = ai_settings.GET_QUBIT
+        gs.pending_reward = {"type": "qubit", "content": current_loc.get_random_qubit()}
+    elif gs.cur_event_index == "GET_RANDOM_ITEM":
+        gs.next_state_after_inventory = ai_settings.GET_ITEM
+        gs.pending_reward = {"type": "item", "content": current_loc.get_random_item()}
+    else:
+        gs.next_state_after_inventory = ai_settings.END_ROUND
+
+def check_click_events(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen, pos=None):
+    """处理鼠标点击事件的函数，pos 不为空时代替鼠标位置（机器人点击）"""
     # 定位鼠标点击位置
-    mouse_x, mouse_y = pygame.mouse.get_pos()
+    mouse_x, mouse_y = pos if pos is not None else pygame.mouse.get_pos()
 
     if not gs.game_active:
         if play_button.img_rect.collidepoint(mouse_x, mouse_y):
@@ -395,46 +463,15 @@ def check_click_events(ai_settings, gs, play_button, locations, messageboard, di
         return # 如果游戏未激活，则不处理其他点击
     
     if gs.is_game_over():
-        gs.game_state = ai_settings.GAME_OVER
+        enter_game_over(ai_settings, gs, pq)
         return
                 
 
     # 游戏激活后的点击事件处理
     if gs.game_state == ai_settings.ROLL_DICE:
         if dice.rect.collidepoint(mouse_x, mouse_y):
-            step = dice.roll_dice()
-            # print(f"Player num:{}")
-            print(f"Player {pq.cur_player.player_name} rolled a {step}.")
-            print(f"Player {pq.cur_player.player_name} is at {pq.cur_player.pos}.")
-            pq.cur_player.move(step)
-            current_loc = locations[pq.cur_player.pos]
-            print(f"Player {pq.cur_player.player_name} moved to {current_loc.name}.")
-            gs.cur_event_index = current_loc.trigger_event(pq.cur_player) # cur_event_index 现在可以是字符串
-
-            gs.mini_game_result_message = "" # 重置小游戏结果
-            gs.shop_result_message = "" # 重置商店结果
-
-            # 进入背包前重置消息
-            if gs.cur_event_index == "SHOW_INVENTORY":
-                gs.temp_message = ""  # 明确初始化为空字符串
-            # 先进入背包展示状态
-            gs.game_state = ai_settings.SHOW_INVENTORY
-            gs.pending_reward = None  # 新增：存储待获得的奖励
-        
-            # 根据地点事件设置后续状态
-            if gs.cur_event_index == "TRIGGER_MINI_GAME":
-                gs.next_state_after_inventory = ai_settings.MINI_GAME_STARTING
-                gs.current_mini_game_id = current_loc.mini_game_id
-            elif gs.cur_event_index == "TRIGGER_SHOP":
-                gs.next_state_after_inventory = ai_settings.SHOP_ENTERING
-            elif gs.cur_event_index == "GET_RANDOM_QUBIT":
-                gs.next_state_after_inventory = ai_settings.GET_QUBIT
-                gs.pending_reward = {"type": "qubit", "content": current_loc.get_random_qubit()}
-            elif gs.cur_event_index == "GET_RANDOM_ITEM":
-                gs.next_state_after_inventory = ai_settings.GET_ITEM
-                gs.pending_reward = {"type": "item", "content": current_loc.get_random_item()}
-            else:
-                gs.next_state_after_inventory = ai_settings.END_ROUND
+            if not dice.rolling:
+                dice.start_roll() # 骰子动画由主循环推进，停下后再移动玩家
 
     elif gs.game_state == ai_settings.SHOW_INVENTORY:
         pq.cur_player = pq.cur_player
@@ -455,10 +492,8 @@ def check_click_events(ai_settings, gs, play_button, locations, messageboard, di
             for index, rect in getattr(messageboard, 'qubit_buttons', []):
                 if rect.collidepoint(mouse_x, mouse_y):
                     if index < len(pq.cur_player.qubits):
-                        # 应用量子门操作
-                        qubit = pq.cur_player.qubits[index]
-                        new_state = messageboard.selecting_gate.apply(np.array([qubit.alpha, qubit.beta]))
-                        qubit.alpha, qubit.beta = new_state[0], new_state[1]
+                        # 应用量子门操作（直接作用在玩家的量子比特寄存器上）
+                        pq.cur_player.qubits.apply_gate(messageboard.selecting_gate.matrix, [index])
                         
                         gs.temp_message = f"已对Q{index+1}应用{messageboard.selecting_gate.name}门"
                         pq.cur_player.gates.remove(messageboard.selecting_gate)
@@ -639,7 +674,7 @@ def check_click_events(ai_settings, gs, play_button, locations, messageboard, di
             
             # 检查游戏是否结束
             if gs.is_game_over():
-                gs.game_state = ai_settings.GAME_OVER
+                enter_game_over(ai_settings, gs, pq)
             else:
                 gs.game_state = ai_settings.ROLL_DICE
 
@@ -670,14 +705,132 @@ def check_click_events(ai_settings, gs, play_button, locations, messageboard, di
             
             # 检查游戏是否结束
             if gs.is_game_over():
-                gs.game_state = ai_settings.GAME_OVER
+                enter_game_over(ai_settings, gs, pq)
             else:
                 gs.game_state = ai_settings.ROLL_DICE
                 
     elif gs.game_state == ai_settings.GAME_OVER:
+            close_bots(pq)
             pygame.quit()
             sys.exit()
 
+# 机器人在这个后台线程中思考，主循环照常绘制画面
+_bot_thread = ThreadPoolExecutor(max_workers=1)
+
+def update_bot(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen):
+    """当前玩家是机器人时，每隔 bot_step_ms 替它完成一步操作"""
+    policy = pq.cur_player.policy if gs.game_active and pq.cur_player else None
+    gs.bot_active = policy is not None and gs.game_state != ai_settings.GAME_OVER
+    if not gs.bot_active or dice.rolling:
+        return
+    now = pygame.time.get_ticks()
+    if now - gs.bot_last_step < ai_settings.bot_step_ms:
+        return
+    gs.bot_last_step = now
+    player = pq.cur_player
+
+    if gs.game_state == ai_settings.ROLL_DICE:
+        dice.start_roll()
+    elif gs.game_state == ai_settings.SHOW_INVENTORY:
+        decision = bot_decide(gs, locations, pq, plan_inventory)
+        if decision is None:
+            return
+        bot_use_inventory(gs, player, *decision)
+        # 点击“继续”离开背包
+        check_click_events(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen,
+                           pos=messageboard.button_rect.center)
+    elif gs.game_state == ai_settings.SHOP_ENTERING:
+        decision = bot_decide(gs, locations, pq, plan_shop)
+        if decision is None:
+            return
+        bot_shop(ai_settings, gs, player, decision)
+    elif gs.game_state == ai_settings.MINI_GAME_STARTING:
+        bot_mini_game(ai_settings, gs, player)
+    else:
+        # 其余状态只需要点击“结束回合/继续”按钮
+        check_click_events(ai_settings, gs, play_button, locations, messageboard, dice, pq, screen,
+                           pos=messageboard.button_rect.center)
+
+def bot_decide(gs, locations, pq, plan):
+    """
+    在后台线程中执行 plan(policy, player)，思考期间不阻塞主循环
+    第一次调用时提交任务，之后每次检查是否完成；完成前返回 None
+    """
+    if gs.bot_future is None:
+        player = pq.cur_player
+        player.policy.observe(rules_from_game(locations, pq.queue, pq.cur_player_index,
+                                              gs.current_round, gs.max_rounds))
+        gs.bot_future = _bot_thread.submit(plan, player.policy, player)
+        gs.temp_message = f"{player.player_name}思考中..."
+        return None
+    if not gs.bot_future.done():
+        return None
+    future, gs.bot_future = gs.bot_future, None
+    return future.result()
+
+def plan_inventory(policy, player):
+    """背包阶段的决策：(要使用的门, 要测量的量子比特下标)"""
+    return policy.choose_gates(player), policy.choose_measurement(player)
+
+def plan_shop(policy, player):
+    """商店的决策：要购买的商品名称"""
+    return policy.choose_purchases(player, SHOP_PRICES)
+
+def bot_use_inventory(gs, player, gates, index):
+    """机器人在背包中使用门和测量卡"""
+    messages = []
+    for gate, qubit_index in gates:
+        player.qubits.apply_gate(gate.matrix, [qubit_index])
+        player.gates.remove(gate)
+        messages.append(f"对Q{qubit_index+1}应用{gate.name}门")
+    card = next((item for item in player.items if isinstance(item, UnlimitedMeasurementCard)), None)
+    if index is not None and card is not None:
+        success, result_msg = card.use(player, index)
+        player.qubits.pop(index)
+        player.qubit_count -= 1
+        if success:
+            player.items.remove(card)
+        messages.append(result_msg)
+    gs.temp_message = "，".join(messages)
+
+def bot_shop(ai_settings, gs, player, purchases):
+    """机器人直接按决策购买商品，不打开商店界面"""
+    bought, cost = [], 0
+    for name in purchases:
+        price = SHOP_PRICES[name]
+        if player.money - cost < price:
+            continue
+        cost += price
+        bought.append(name)
+        if name in SHOP_GATES:
+            player.add_gate({"X": XGate, "Z": ZGate, "H": HGate}[SHOP_GATES[name]]())
+        elif name == "抢夺卡":
+            player.add_item(StealCard())
+        elif name in SHOP_ITEMS:
+            player.add_item(UnlimitedMeasurementCard())
+        else:
+            alpha, beta = SHOP_QUBITS[name]
+            player.add_qubit(Qubit(alpha=alpha, beta=beta))
+    player.money -= cost
+    gs.shop_cost = cost
+    gs.shop_result_message = f"购买了{'、'.join(bought)}，花费{cost}金钱" if bought else "什么也没买"
+    gs.game_state = ai_settings.SHOP_RESULT
+
+def bot_mini_game(ai_settings, gs, player):
+    """机器人不打开小游戏界面，按与规则引擎相同的结果分布抽样（已扣除小游戏中的花费）"""
+    outcome = SampledMiniGames().sample(stream(EVENTS), gs.current_mini_game_id) or {}
+    effect = outcome.get("money", 0)
+    player.money += effect
+    player.score += outcome.get("score", 0)
+    for alpha, beta in outcome.get("qubits", ()):
+        player.qubits.append(Qubit(alpha, beta))
+    message = f"{player.player_name}完成小游戏，金钱 {effect:+d}"
+    if outcome.get("score"):
+        message += f"，积分 {outcome['score']:+d}"
+    gs.mini_game_result_message = message
+    gs.mini_game_player_effect = effect
+    gs.game_state = ai_settings.SHOW_MINI_GAME_RESULT
+
 def create_location(ai_settings, screen, locations, index, x, y, name, mini_game_id):
     """创建一个地点"""
     if name == "宿舍区":
@@ -716,15 +869,7 @@ def create_all_locations(ai_settings, screen, locations, location_points):
         
 def read_locations_list(ai_settings):
     """从txt文件中读取地点信息"""
-    data = []
-    with open(ai_settings.locations_data_path, encoding = ('utf-8')) as file_data:
-        for line in file_data:
-            line = line.rstrip()
-            parts = line.split(' ')
-            x, y, name = parts[0], parts[1], parts[2]
-            mini_game_id = parts[3] if len(parts) > 3 and parts[3].lower() != 'none' else None
-            data.append([x, y, name, mini_game_id])
-    return data
+    return read_board(ai_settings.locations_data_path)
 
 def read_events_list(ai_settings):
     """从json文件中读取事件信息"""
@@ -778,8 +923,10 @@ def run_specific_mini_game(ai_settings, screen, gs, current_player):
             target = gs.steal_data["target"]
             index = gs.steal_data["qubit_index"]
             if 0 <= index < len(target.qubits):
-                stolen_qubit = target.qubits.pop(index)
-                current_player.qubits.append(stolen_qubit)
+                # 原量子比特在贝尔测量中被消耗，抢夺者得到传输后的量子态
+                target.qubits.pop(index)
+                alpha, beta = game_result["qubit_state"]
+                current_player.qubits.append(Qubit(alpha=alpha, beta=beta))
         # 移除一张抢夺卡
         for item in current_player.items:
             if isinstance(item, StealCard):
@@ -807,7 +954,6 @@ def run_specific_mini_game(ai_settings, screen, gs, current_player):
     else:
         print(f"Warning: Minigame effect '{gs.mini_game_player_effect}' is not a number.")
 
-    screen = pygame.display.set_mode(ai_settings.screen_size)
     pygame.display.set_caption(original_caption[0])
     print("11111111")
     gs.game_state = ai_settings.SHOW_MINI_GAME_RESULT
@@ -841,8 +987,10 @@ def run_shop(ai_settings, screen, gs, current_player):
 
 def create_player_queue(ai_settings, screen, locations, pq):
     # 创建所有玩家
-    player1 = Player(ai_settings, screen, locations, 1, "红色小人")
-    player2 = Player(ai_settings, screen, locations, 2, "橙色小人")
+    player1 = Player(ai_settings, screen, locations, 1, "红色小人",
+                     policy=make_bot(ai_settings.bot_seats.get(1)))
+    player2 = Player(ai_settings, screen, locations, 2, "橙色小人",
+                     policy=make_bot(ai_settings.bot_seats.get(2)))
     # player3 = Player(ai_settings, screen, locations, 3, "蓝色小人")
     # 将所有玩家加入游戏队列
     pq.add_player(player1)
@@ -35,6 +35,12 @@ class GameState():
         self.steal_target = None  # 目标玩家
         self.steal_data = None  # 小游戏传输数据
 
+        self.final_scores = None  # 游戏结束时每个玩家的测量计分结果
+
+        self.bot_active = False  # 当前是否轮到机器人操作
+        self.bot_last_step = 0   # 机器人上一步操作的时间（毫秒）
+        self.bot_future = None   # 机器人正在后台思考的决策
+
     def is_game_over(self):
         """检查游戏是否应该结束"""
         return self.current_round > self.max_rounds
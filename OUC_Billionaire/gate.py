@@ -1,5 +1,12 @@
 import numpy as np
 
+# 所有门对象共用同一个只读矩阵，qubit_states 按对象（而不是数值）识别门
+X_MATRIX = np.array([[0, 1], [1, 0]])
+Z_MATRIX = np.array([[1, 0], [0, -1]])
+H_MATRIX = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]])
+for _matrix in (X_MATRIX, Z_MATRIX, H_MATRIX):
+    _matrix.setflags(write=False)
+
 class Gate:
     """量子门基类"""
     def __init__(self, name, matrix):
@@ -18,19 +25,18 @@ class XGate(Gate):
     """Pauli-X 门（量子 NOT 门）"""
     def __init__(self):
         # X 门的矩阵表示：[[0, 1], [1, 0]]
-        super().__init__("X", np.array([[0, 1], [1, 0]]))
+        super().__init__("X", X_MATRIX)
 
 
 class ZGate(Gate):
     """Pauli-Z 门（相位翻转门）"""
     def __init__(self):
         # Z 门的矩阵表示：[[1, 0], [0, -1]]
-        super().__init__("Z", np.array([[1, 0], [0, -1]]))
+        super().__init__("Z", Z_MATRIX)
 
 
 class HGate(Gate):
     """Hadamard 门（叠加门）"""
     def __init__(self):
         # H 门的矩阵表示：(1/√2) * [[1, 1], [1, -1]]
-        h_matrix = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]])
-        super().__init__("H", h_matrix)
\ No newline at end of file
+        super().__init__("H", H_MATRIX)
\ No newline at end of file
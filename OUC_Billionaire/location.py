@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 import pygame
-import random
-import math
 from player import Qubit
 import tools as tool
+from fonts import FONT_PATH, get_font, render_text
+from rules import tile_event, random_qubit_amplitudes
+from random_service import stream, EVENTS
 
 class Location():
     """地点类"""
@@ -21,44 +22,48 @@ class Location():
         self.can_give_item = False   # 是否可以给予道具
         self.item_pool = []          # 道具池
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 20)
+        self.font = get_font(FONT_PATH, 20)
         self.color = self.ai_settings.circle_color
         self.create_location_name()
 
     def trigger_event(self, player=None):
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
+        """触发事件，判定规则见 rules.tile_event；普通地点返回随机事件的编号"""
+        event = tile_event(self.mini_game_id, self.isShop, self.can_give_qubit, self.can_give_item)
+        if event is not None:
+            return event
+        return self.general_event_index()
+
+    def general_event_index(self):
+        """随机事件的编号"""
         if self.ai_settings.event_cnt > 3:
-            index = random.randint(3, self.ai_settings.event_cnt - 1)
-        else:
-            index = 0
-            # print("Warning: Not enough general events to choose from.") # Optional: Keep or remove print
-        return index
+            return stream(EVENTS).randint(3, self.ai_settings.event_cnt - 1)
+        # print("Warning: Not enough general events to choose from.") # Optional: Keep or remove print
+        return 0
 
     def create_location_name(self):
         name_str = self.name
-        self.name_image = self.font.render(name_str, True, self.text_color,
+        self.name_image = render_text(self.font, name_str, self.text_color,
                                             self.ai_settings.bg_color) # Assuming bg_color for transparency
         self.name_rect = self.name_image.get_rect()
         self.name_rect.centerx = self.x
         self.name_rect.top = self.y + self.radius + 10
 
-    def draw_location(self):
-        pygame.draw.circle(self.screen, self.color, (self.x, self.y),
+    def draw_location(self, surface=None):
+        """绘制地点圆点和名称，surface 为空时直接绘制到屏幕上"""
+        surface = surface or self.screen
+        pygame.draw.circle(surface, self.color, (self.x, self.y),
                             self.radius, 0)
-        self.screen.blit(self.name_image, self.name_rect)
+        surface.blit(self.name_image, self.name_rect)
         
     def get_random_qubit(self):
         """生成随机Qubit"""
         # 随机生成α和β，保证归一化
-        angle = random.uniform(0, 2 * math.pi)
-        alpha = math.cos(angle)
-        beta = math.sin(angle)
+        alpha, beta = random_qubit_amplitudes()
         return Qubit(alpha, beta)
     
     def get_random_item(self):
         """从道具池随机获取道具"""
-        return random.choice(self.item_pool) if self.item_pool else None
+        return stream(EVENTS).choice(self.item_pool) if self.item_pool else None
 
     # 问题：需要在每个地点显示说明文字吗   
     # def draw_location(self):
@@ -74,15 +79,9 @@ class Dorm(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
     
-    def trigger_event(self, player = None):
-        """触发事件"""
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        # 随机事件的编号
-        index = 0
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 0
     
     
 class ScienceBuilding(Location):
@@ -91,13 +90,9 @@ class ScienceBuilding(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
+    def general_event_index(self):
+        """没有随机事件"""
+        return None
     
 class Hall(Location):
     """大礼堂（继承地点类）"""
@@ -106,17 +101,9 @@ class Hall(Location):
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
         self.can_give_qubit = True
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        elif self.can_give_qubit:
-            return "GET_RANDOM_QUBIT"
-        index = 2
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 2
 
 class OfficePlace(Location):
     """工字厅（继承地点类）"""
@@ -126,17 +113,9 @@ class OfficePlace(Location):
         self.item_pool=[tool.StealCard()]
         self.can_give_item = True
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        elif self.can_give_item:
-            return "GET_RANDOM_ITEM"
-        index = 9
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 9
     
 class Stadium(Location):
     """体育馆（继承地点类）"""
@@ -144,15 +123,9 @@ class Stadium(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 3
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 3
     
 class MainBuilding(Location):
     """主楼（继承地点类）"""
@@ -160,15 +133,9 @@ class MainBuilding(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 4
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 4
     
 class StudyHall(Location):
     """清华学堂（继承地点类）"""
@@ -176,15 +143,9 @@ class StudyHall(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 5
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 5
     
 class Gate(Location):
     """二校门（继承地点类）"""
@@ -193,15 +154,9 @@ class Gate(Location):
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
         self.isShop = True
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 6
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 6
     
 class TechnologyBuilding(Location):
     """李兆基楼（继承地点类）"""
@@ -209,15 +164,9 @@ class TechnologyBuilding(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 7
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 7
     
 class ArtMuseum(Location):
     """艺术博物馆（继承地点类）"""
@@ -225,12 +174,6 @@ class ArtMuseum(Location):
         # 继承父类的构造方法
         super().__init__(ai_settings, screen, index, pos_x, pos_y, msg, mini_game_id)
 
-    def trigger_event(self, player):
-        """触发事件"""
-        # 随机事件的编号
-        if self.mini_game_id:
-            return "TRIGGER_MINI_GAME"
-        elif self.isShop:
-            return "TRIGGER_SHOP"
-        index = 8
-        return index
+    def general_event_index(self):
+        """随机事件的编号"""
+        return 8
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""量子迷宫的地图：随机生成连通的迷宫，并用按目标缓存的BFS距离场给出沿真实路径的下一步提示"""
+import random
+from collections import deque
+
+import numpy as np
+
+# 移动方向：(名称, 行偏移, 列偏移)
+MOVES = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1))
+# 每个方向的反方向在 MOVES 中的下标
+_OPPOSITE = (1, 0, 3, 2)
+
+
+def classic_maze(grid_size=16):
+    """原先手工设计的迷宫（1为墙，0为通路），为16×16设计"""
+    maze = np.zeros((grid_size, grid_size), dtype=np.int8)
+    for i in range(grid_size):
+        maze[i][5] = 1 if i not in [2, 3, 7, 8, 12] else 0
+        maze[i][10] = 1 if i not in [1, 6, 11, 14] else 0
+    for j in range(grid_size):
+        maze[3][j] = 1 if j not in [0, 4, 9, 15] else 0
+        maze[12][j] = 1 if j not in [2, 7, 11] else 0
+    return maze
+
+
+def generate_maze(rows, cols, loop_ratio=0.15, rng=None):
+    """
+    随机生成迷宫（1为墙，0为通路），保证所有通路格相互连通
+    先用迭代回溯法生成一棵生成树，再随机打通一部分墙形成环路，避免只有唯一一条路
+    """
+    rng = rng or random.Random()
+    maze = np.ones((rows, cols), dtype=np.int8)
+    # 通路格位于偶数行、偶数列，相邻通路格之间隔一格墙
+    cell_rows, cell_cols = (rows + 1) // 2, (cols + 1) // 2
+    visited = np.zeros((cell_rows, cell_cols), dtype=bool)
+    visited[0, 0] = True
+    maze[0, 0] = 0
+    stack = [(0, 0)]
+    while stack:
+        r, c = stack[-1]
+        neighbors = [(r + dr, c + dc) for _, dr, dc in MOVES
+                     if 0 <= r + dr < cell_rows and 0 <= c + dc < cell_cols
+                     and not visited[r + dr, c + dc]]
+        if not neighbors:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(neighbors)
+        visited[nr, nc] = True
+        maze[2 * nr, 2 * nc] = 0
+        maze[r + nr, c + nc] = 0  # 打通两格之间的墙
+        stack.append((nr, nc))
+
+    # 夹在两个通路格之间的墙，打通后仍然连通
+    candidates = [(r, c) for r in range(rows) for c in range(cols)
+                  if maze[r, c] == 1 and (r + c) % 2 == 1
+                  and ((r % 2 == 0 and c + 1 < cols) or (c % 2 == 0 and r + 1 < rows))]
+    for r, c in rng.sample(candidates, int(len(candidates) * loop_ratio)):
+        maze[r, c] = 0
+    return maze
+
+
+class MazeNavigator():
+    """迷宫寻路：每个目标只做一次BFS并缓存结果，之后任意位置的下一步提示都是O(1)查表"""
+    def __init__(self, maze):
+        self.maze = maze
+        # 目标坐标 -> (距离场, 下一步方向场)
+        self._fields = {}
+
+    def field(self, goal):
+        """返回到目标的距离场和下一步方向场（MOVES 下标，-1 表示无路可走）"""
+        goal = (int(goal[0]), int(goal[1]))
+        if goal not in self._fields:
+            self._fields[goal] = self._bfs(goal)
+        return self._fields[goal]
+
+    def _bfs(self, goal):
+        """从目标出发做BFS，记录每个通路格沿最短路走向目标的第一步"""
+        rows, cols = self.maze.shape
+        passable = (self.maze == 0).ravel().tolist()
+        distance = [-1] * (rows * cols)
+        step = [-1] * (rows * cols)
+        start = goal[0] * cols + goal[1]
+        distance[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            r, c = divmod(cell, cols)
+            d = distance[cell] + 1
+            for k, (_, dr, dc) in enumerate(MOVES):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    neighbor = nr * cols + nc
+                    if passable[neighbor] and distance[neighbor] < 0:
+                        distance[neighbor] = d
+                        # 从邻格回到当前格的方向就是邻格走向目标的第一步
+                        step[neighbor] = _OPPOSITE[k]
+                        queue.append(neighbor)
+        shape = self.maze.shape
+        return (np.array(distance, dtype=np.int32).reshape(shape),
+                np.array(step, dtype=np.int8).reshape(shape))
+
+    def distance(self, pos, goal):
+        """沿迷宫到目标的步数，不可达时为 -1"""
+        return int(self.field(goal)[0][pos[0], pos[1]])
+
+    def hint(self, pos, goal):
+        """沿真实路径走向目标的下一步方向，已到达或不可达时返回空字符串"""
+        step = self.field(goal)[1][pos[0], pos[1]]
+        if step < 0:
+            return ""
+        return MOVES[step][0]
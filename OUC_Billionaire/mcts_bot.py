@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+蒙特卡洛树搜索机器人：对当前可选的每个决策，在不绘制画面的规则引擎副本中把剩余回合模拟到底，
+用 UCB1 分配模拟次数；模拟分散到进程池的各个进程中并行执行，每步只思考限定的时间
+"""
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_sim import SampledMiniGames
+from bots import GreedyBot, LookaheadBot, MEASURE_CARD, gate_label, item_label, match_gates, prob_one
+from qubit_states import GATE_MATRICES
+from rules import GameRules, PlayerState, Tile
+
+# 决策的种类
+INVENTORY = "inventory"  # 背包：使用哪些门、测量哪个量子比特
+SHOP = "shop"            # 商店：买哪些商品
+
+# UCB1 的探索系数
+EXPLORATION = math.sqrt(2)
+# 模拟中所有玩家之后的决策都用贪心机器人，既快又不算太弱
+ROLLOUT_POLICY = GreedyBot()
+
+
+def rules_from_game(locations, players, cur_player_index, current_round, max_rounds):
+    """把界面中的对局（地点、玩家、轮到谁、第几轮）复制成规则引擎的局面"""
+    board = [Tile(location.name, location.mini_game_id) for location in locations]
+    rules = GameRules(board, [PlayerState.from_player(player) for player in players], max_rounds,
+                      mini_game_policy=SampledMiniGames())
+    rules.cur_player_index = cur_player_index
+    rules.current_round = current_round
+    return rules
+
+
+def inventory_actions(player):
+    """
+    背包阶段的候选决策：(门的使用计划 [(门名, 下标), ...], 测量的下标或 None)
+    有测量卡时每个计划只多考虑一种测量：计划执行后测得 |1> 概率最大的量子比特
+    """
+    names = [gate_label(gate) for gate in player.gates]
+    states = np.array(player.qubits.states, dtype=complex).reshape(-1, 2)
+    _, lookahead = LookaheadBot()._allocate(states, names)
+    # 向前搜索的计划放在最前面，时间不够时它最先得到模拟
+    plans = [tuple(lookahead), ()]
+    plans += [((name, index),) for name in sorted(set(names)) for index in range(len(states))]
+    has_card = len(states) and any(item_label(item) == MEASURE_CARD for item in player.items)
+    actions = {}
+    for plan in plans:
+        actions.setdefault((plan, None), None)
+        if has_card:
+            after = states.copy()
+            for name, index in plan:
+                after[index] = GATE_MATRICES[name] @ after[index]
+            actions.setdefault((plan, int(np.argmax(prob_one(after)))), None)
+    return list(actions)
+
+
+def shop_actions(player, prices):
+    """商店的候选决策：贪心机器人的购买计划（放在最前面）、不买、买得起的任意一件或两件"""
+    affordable = [name for name in prices if prices[name] <= player.money]
+    bundles = [tuple(GreedyBot().choose_purchases(player, prices)), ()]
+    bundles += [(name,) for name in affordable]
+    bundles += [pair for pair in itertools.combinations_with_replacement(affordable, 2)
+                if prices[pair[0]] + prices[pair[1]] <= player.money]
+    return list(dict.fromkeys(bundles))
+
+
+def apply_action(rules, kind, action):
+    """在局面副本中执行当前玩家的决策，并结算本回合剩下的部分"""
+    player = rules.cur_player
+    if kind == INVENTORY:
+        plan, index = action
+        rules.apply_inventory(player, plan, index)
+        rules.resolve_event(player, rules.board[player.pos])
+    else:
+        for name in action:
+            rules.buy(player, name)
+    rules.end_turn()
+
+
+def expected_scores(rules):
+    """游戏结束时每个玩家的期望得分：已有积分加上所有量子比特测得 |1> 的概率"""
+    return np.array([player.score + player.qubits.probabilities().sum() for player in rules.players])
+
+
+def rollout(rules, kind, action, seed):
+    """
+    从局面副本出发执行决策并模拟到最后一轮结束，返回当前玩家的胜负（胜 1，平 0.5，负 0）
+    最后的测量不再抽样，直接比较期望得分，减小模拟结果的方差
+    """
+    seat = rules.cur_player_index
+    rules = rules.copy(seed, [ROLLOUT_POLICY] * len(rules.players))
+    apply_action(rules, kind, action)
+    while not rules.is_game_over():
+        rules.play_turn()
+    scores = expected_scores(rules)
+    others = np.delete(scores, seat).max()
+    if abs(scores[seat] - others) < 1e-9:
+        return 0.5
+    return 1.0 if scores[seat] > others else 0.0
+
+
+def search(rules, kind, actions, deadline, seed=None):
+    """
+    在一个进程中用 UCB1 给各个决策分配模拟，直到 deadline（time.time() 的时刻）
+    每次模拟前都检查时间，候选太多时到了时间也不会把每个决策都模拟一遍；
+    返回每个决策的 (模拟次数, 累计胜负) 两个数组
+    """
+    rng = random.Random(seed)
+    visits = np.zeros(len(actions))
+    wins = np.zeros(len(actions))
+    while time.time() < deadline:
+        total = visits.sum()
+        if total < len(actions):
+            # 先按顺序把每个决策模拟一次
+            choice = int(total)
+        else:
+            ucb = wins / visits + EXPLORATION * np.sqrt(np.log(total) / visits)
+            choice = int(np.argmax(ucb))
+        wins[choice] += rollout(rules, kind, actions[choice], rng.getrandbits(32))
+        visits[choice] += 1
+    return visits, wins
+
+
+class MCTSBot(GreedyBot):
+    """
+    蒙特卡洛树搜索对手：背包和商店决策由模拟决定，其余沿用贪心机器人
+    参数:
+        budget_ms: 每步的思考时间（毫秒）
+        workers: 进程数，默认为CPU核数；0 表示在当前进程中搜索
+        seed: 各进程模拟所用随机数的种子；搜索按时间停止，每步的模拟次数不固定，决策不能保证复现
+        debug: 为 True 时每次搜索后打印统计（统计总是保存在 last_search 中）
+    """
+    name = "mcts"
+
+    def __init__(self, budget_ms=200, workers=None, seed=None, debug=False):
+        self.budget_ms = budget_ms
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.rng = random.Random(seed)
+        self.rules = None
+        self.pool = None
+        self.measurement = None
+        self.debug = debug
+        self.last_search = None  # 上一次搜索的统计，便于调试
+
+    def observe(self, rules):
+        self.rules = rules
+
+    def _executor(self):
+        """第一次搜索时才创建进程池，之后一直复用"""
+        if self.pool is None and self.workers:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def best_action(self, kind, actions):
+        """
+        把候选决策分给各个进程分别搜索（每个进程一部分），各进程中模拟次数最多的决策
+        再按平均胜负比较；没来得及模拟的决策不参与比较，一个都没模拟到时选排在最前面的启发式决策
+        """
+        if len(actions) == 1:
+            return actions[0]
+        deadline = time.time() + self.budget_ms / 1000
+        # 只把规则需要的数据传给子进程，真正的决策者留在本进程
+        rules = self.rules.copy(policies=[None] * len(self.rules.players))
+        executor = self._executor()
+        workers = min(self.workers, len(actions)) if executor is not None else 1
+        # 第 w 个进程搜索下标为 w, w + workers, ... 的决策，启发式决策都排在各进程的前面
+        groups = [list(range(w, len(actions), workers)) for w in range(workers)]
+        seeds = [self.rng.getrandbits(32) for _ in groups]
+        if executor is None:
+            parts = [search(rules, kind, actions, deadline, seeds[0])]
+        else:
+            futures = [executor.submit(search, rules, kind, [actions[i] for i in group], deadline, seed)
+                       for group, seed in zip(groups, seeds)]
+            parts = [future.result() for future in futures]
+        visits = np.zeros(len(actions))
+        wins = np.zeros(len(actions))
+        for group, (part_visits, part_wins) in zip(groups, parts):
+            visits[group] = part_visits
+            wins[group] = part_wins
+        self.last_search = {"kind": kind, "actions": actions, "visits": visits, "wins": wins}
+        if not visits.any():
+            return actions[0]
+        rates = wins / np.maximum(visits, 1)
+        # 每个进程选出模拟次数最多的决策，再在这几个中比较平均胜负
+        finalists = [max(group, key=lambda i: (visits[i], rates[i])) for group in groups]
+        best = max((i for i in finalists if visits[i]), key=lambda i: (rates[i], visits[i]))
+        if self.debug:
+            print(f"DEBUG: MCTS {kind}: {int(visits.sum())} 次模拟, 选择 {actions[best]}, "
+                  f"胜率 {rates[best]:.2f}")
+        return actions[best]
+
+    def choose_gates(self, player):
+        if self.rules is None:
+            return super().choose_gates(player)
+        plan, self.measurement = self.best_action(INVENTORY, inventory_actions(player))
+        return match_gates(player, plan)
+
+    def choose_measurement(self, player):
+        # 测量在选门时一起决定
+        index, self.measurement = self.measurement, None
+        return index
+
+    def choose_purchases(self, player, prices):
+        if self.rules is None:
+            return super().choose_purchases(player, prices)
+        return list(self.best_action(SHOP, shop_actions(player, prices)))
@@ -3,6 +3,8 @@
 import pygame
 import os
 from gate import XGate,ZGate,HGate
+from fonts import FONT_PATH, get_font, render_text
+from assets import load_image
 
 class Messageboard():
     """显示游戏相关信息的类"""
@@ -14,7 +16,7 @@ class Messageboard():
         # 设置面板字体颜色和大小
         self.text_color_1 = (0, 0, 139)
         self.text_color_2 = (0, 0, 0)
-        self.font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 18)
+        self.font = get_font(FONT_PATH, 18)
         
         # 设置各个面板块的颜色
         self.box_color_1 = self.ai_settings.board_color_1
@@ -27,11 +29,11 @@ class Messageboard():
         self.box_3 = pygame.Rect(800, 600, 400, 400)
         
         self.start_minigame_button_rect = None # 初始化为 None
-        self.button_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 20) # 用于文本按钮
+        self.button_font = get_font(FONT_PATH, 20) # 用于文本按钮
 
         # 设置结束回合图片路径
         image_path_str = "images/end_round_button.png"
-        self.end_round_button = pygame.image.load(image_path_str)
+        self.end_round_button = load_image(image_path_str)
 
         # 玩家信息列表
         self.player_rendered_msgs = []
@@ -69,8 +71,8 @@ class Messageboard():
                 print(f"Warning: Player {player.player_name} has invalid position {player.pos}")
 
             player_msg_str_2 = ("拥有金钱：" + str(player.money) + "拥有积分：" + str(player.score) +  "当前位置：" + location_name)
-            msg1_img = self.font.render(player_msg_str_1, True, self.text_color_1)
-            msg2_img = self.font.render(player_msg_str_2, True, self.text_color_1)
+            msg1_img = render_text(self.font, player_msg_str_1, self.text_color_1)
+            msg2_img = render_text(self.font, player_msg_str_2, self.text_color_1)
             self.player_rendered_msgs.append([msg1_img, msg2_img])
         
         if not self.player_rendered_msgs:
@@ -106,25 +108,25 @@ class Messageboard():
             # 创建初始化信息相关文字
             event_msg_str_list = [(player.player_name + "的游戏回合!"), ("请" + player.player_name + "掷骰子~")]
             for msg_str in event_msg_str_list:
-                msg_img = self.font.render(msg_str, True, self.text_color_2)    
+                msg_img = render_text(self.font, msg_str, self.text_color_2)    
                 self.event_msg.append(msg_img)
         elif gs.game_state == self.ai_settings.MINI_GAME_STARTING:
             intro_msg_str = f"你来到了小游戏地点: {gs.current_mini_game_id}!"
             game_name = self.ai_settings.minigame_configs.get(gs.current_mini_game_id, {}).get("name", gs.current_mini_game_id)
             intro_msg_str = f"即将开始小游戏: {game_name}!"
-            intro_img = self.font.render(intro_msg_str, True, self.text_color_2)
+            intro_img = render_text(self.font, intro_msg_str, self.text_color_2)
             self.event_msg.append(intro_img)
 
             # 创建一个文本按钮 "开始小游戏"
             start_button_text = "点击开始小游戏"
-            start_button_img = self.button_font.render(start_button_text, True, (255,255,255), (0,128,0)) #白字绿底
+            start_button_img = render_text(self.button_font, start_button_text, (255,255,255), (0,128,0)) #白字绿底
             self.event_msg.append(start_button_img)
             # 其 rect 将在下面统一处理位置时创建并赋值给 self.start_minigame_button_rect
         elif gs.game_state == self.ai_settings.MINI_GAME_ACTIVE:
             # 这个状态下，信息板可以显示 "小游戏进行中..."
             # game_name = self.ai_settings.minigame_configs.get(gs.current_mini_game_id, {}).get("name", gs.current_mini_game_id)
             active_msg_str = f"小游戏: {gs.current_mini_game_id} 进行中..."
-            active_img = self.font.render(active_msg_str, True, self.text_color_2)
+            active_img = render_text(self.font, active_msg_str, self.text_color_2)
             self.event_msg.append(active_img)
 
         elif gs.game_state == self.ai_settings.SHOW_MINI_GAME_RESULT:
@@ -133,12 +135,12 @@ class Messageboard():
                 if "胜利" in gs.mini_game_result_message: result_color = (0, 150, 0) # 绿色
                 elif "失败" in gs.mini_game_result_message: result_color = (150, 0, 0) # 红色
                 
-                result_img = self.font.render(gs.mini_game_result_message, True, result_color)
+                result_img = render_text(self.font, gs.mini_game_result_message, result_color)
 
                 self.event_msg.append(result_img)
                 # self.event_msg.append(f"当前资金：{player.money}")
             else:
-                self.event_msg.append(self.font.render("小游戏已结束。", True, self.text_color_2))
+                self.event_msg.append(render_text(self.font, "小游戏已结束。", self.text_color_2))
             # 在此状态下，也显示“结束回合”按钮，其rect在draw_messageboard中处理或者在这里设置
             # self.button_rect 的位置计算应在此处或 draw 中确保
             self.button_rect = self.end_round_button.get_rect()
@@ -147,19 +149,19 @@ class Messageboard():
         elif gs.game_state == self.ai_settings.SHOP_ENTERING:
             intro_msg_str = f"你来到了二校门，校外有清华印象文创店，快来补给吧！"
             # intro_msg_str = f"即将进入商店!"
-            intro_img = self.font.render(intro_msg_str, True, self.text_color_2)
+            intro_img = render_text(self.font, intro_msg_str, self.text_color_2)
             self.event_msg.append(intro_img)
 
             # 创建一个文本按钮 "开始小游戏"
             start_button_text = "点击进入商店"
-            start_button_img = self.button_font.render(start_button_text, True, (255,255,255), (0,128,0)) #白字绿底
+            start_button_img = render_text(self.button_font, start_button_text, (255,255,255), (0,128,0)) #白字绿底
             self.event_msg.append(start_button_img)
             # 其 rect 将在下面统一处理位置时创建并赋值给 self.start_minigame_button_rect
         elif gs.game_state == self.ai_settings.SHOP_ACTIVE:
             # 这个状态下，信息板可以显示 "小游戏进行中..."
             # game_name = self.ai_settings.minigame_configs.get(gs.current_mini_game_id, {}).get("name", gs.current_mini_game_id)
             active_msg_str = f"购买物品中..."
-            active_img = self.font.render(active_msg_str, True, self.text_color_2)
+            active_img = render_text(self.font, active_msg_str, self.text_color_2)
             self.event_msg.append(active_img)
 
         elif gs.game_state == self.ai_settings.SHOP_RESULT:
@@ -171,19 +173,19 @@ class Messageboard():
                 # elif "失败" in gs.mini_game_result_message: result_color = (150, 0, 0) # 红色
                 render_message1= gs.shop_result_message+" "+ f" 购买花费: {gs.shop_cost} 金钱"
                 render_message2= f"当前资金：{player.money} "
-                result_img1= self.font.render(render_message1, True, result_color)
-                result_img2 = self.font.render(render_message2, True, result_color)
+                result_img1= render_text(self.font, render_message1, result_color)
+                result_img2 = render_text(self.font, render_message2, result_color)
                 self.event_msg.append(result_img1)
                 self.event_msg.append(result_img2)
             else:
-                self.event_msg.append(self.font.render("小游戏已结束。", True, self.text_color_2))
+                self.event_msg.append(render_text(self.font, "小游戏已结束。", self.text_color_2))
 
         elif gs.game_state == self.ai_settings.END_ROUND:
             # 创建结束回合按钮信息
             self.button_rect = self.end_round_button.get_rect()
             self.button_rect.bottom = self.box_3.bottom - 10
             self.button_rect.right = self.box_3.right - 10
-            self.event_msg.append(self.font.render("事件处理完毕。", True, self.text_color_2))
+            self.event_msg.append(render_text(self.font, "事件处理完毕。", self.text_color_2))
 
         # --- 统一处理消息和按钮的位置 ---
         current_y = self.box_3.top + 10
@@ -228,6 +230,13 @@ class Messageboard():
         if gs.game_state == self.ai_settings.GAME_OVER:
             self._setup_game_over_buttons()
     
+    def get_box_signatures(self, gs):
+        """返回各面板块当前内容的签名（渲染缓存保证相同文字对应同一图像），用于脏矩形刷新"""
+        return {
+            "box_2": tuple(img for msgs in self.player_rendered_msgs for img in msgs),
+            "box_3": (gs.game_state, tuple(self.event_msg)),
+        }
+
     def _setup_game_over_buttons(self):
         """设置游戏结束界面的按钮区域"""
         # 重新开始按钮区域
@@ -253,16 +262,16 @@ class Messageboard():
         
         # 背包标题
         title = f"{player.player_name}的背包 (积分: {player.score})"
-        self.inventory_msgs.append(self.font.render(title, True, (30, 30, 120)))
+        self.inventory_msgs.append(render_text(self.font, title, (30, 30, 120)))
         
         # 量子比特区域标题
-        self.inventory_msgs.append(self.font.render("量子比特:", True, (60, 60, 60)))
+        self.inventory_msgs.append(render_text(self.font, "量子比特:", (60, 60, 60)))
         
         # 道具区域标题
-        self.inventory_msgs.append(self.font.render("道具:", True, (60, 60, 60)))
+        self.inventory_msgs.append(render_text(self.font, "道具:", (60, 60, 60)))
 
         # 量子门区域标题 (新增)
-        self.inventory_msgs.append(self.font.render("量子门:", True, (60, 60, 60)))
+        self.inventory_msgs.append(render_text(self.font, "量子门:", (60, 60, 60)))
         
         # 存储qubit按钮信息
         for i, qubit in enumerate(player.qubits[:4]):
@@ -283,11 +292,11 @@ class Messageboard():
         # 抢夺模式下的特殊显示
         if steal_mode == "select_player":
             prompt = "请选择要抢夺的玩家:"
-            self.inventory_msgs.append(self.font.render(prompt, True, (200, 0, 0)))
+            self.inventory_msgs.append(render_text(self.font, prompt, (200, 0, 0)))
             
         elif steal_mode == "select_qubit" and steal_target:
             prompt = f"选择从{steal_target.player_name}抢夺的量子比特:"
-            self.inventory_msgs.append(self.font.render(prompt, True, (200, 0, 0)))
+            self.inventory_msgs.append(render_text(self.font, prompt, (200, 0, 0)))
 
     def draw_inventory(self, gs, pq):
         """集中处理所有绘制逻辑"""
@@ -341,7 +350,7 @@ class Messageboard():
             beta_str = f"{qubit.beta.real:.2f}".rstrip('0').rstrip('.')
             prob_1 = abs(qubit.beta)**2 * 100
             qubit_text = f"Q{i+1}: {alpha_str}|0> + {beta_str}|1>"
-            qubit_img = self.font.render(qubit_text, True, (40, 40, 40))
+            qubit_img = render_text(self.font, qubit_text, (40, 40, 40))
             self.screen.blit(qubit_img, (qubit_rect.left + 10, qubit_rect.centery - 10))
 
         current_y += 110
@@ -377,14 +386,14 @@ class Messageboard():
             pygame.draw.rect(self.screen, (180, 120, 80), item_rect, width=1, border_radius=8)
             
             # 道具名称
-            item_img = self.font.render(f"{i+1}. {item.name}", True, (80, 50, 20))
+            item_img = render_text(self.font, f"{i+1}. {item.name}", (80, 50, 20))
             self.screen.blit(item_img, (item_rect.left + 10, item_rect.centery - 10))
             
             # 悬停提示
             mouse_pos = pygame.mouse.get_pos()
             if item_rect.collidepoint(mouse_pos):
                 # 计算文本尺寸
-                desc_surface = self.font.render(item.description, True, (100, 100, 100))
+                desc_surface = render_text(self.font, item.description, (100, 100, 100))
                 text_width, text_height = desc_surface.get_size()
                 
                 # 设置提示框的内边距
@@ -448,7 +457,7 @@ class Messageboard():
             pygame.draw.rect(self.screen, (150, 100, 150), gate_rect, width=2, border_radius=8)
             
             # 量子门名称和描述
-            gate_name = self.font.render(gate.name, True, (80, 30, 30))
+            gate_name = render_text(self.font, gate.name, (80, 30, 30))
             
             self.screen.blit(gate_name, (gate_rect.centerx - gate_name.get_width()//2, gate_rect.top + 15))
         
@@ -468,7 +477,7 @@ class Messageboard():
         elif self.selecting_gate:
             button_text = "取消选择门(X)"
             
-        button_img = self.font.render(button_text, True, (255, 255, 255))
+        button_img = render_text(self.font, button_text, (255, 255, 255))
         self.screen.blit(button_img, (
             self.button_rect.centerx - button_img.get_width()//2,
             self.button_rect.centery - button_img.get_height()//2
@@ -476,13 +485,13 @@ class Messageboard():
         
         # 选择提示
         if self.selecting_qubit:
-            hint_img = self.font.render("请点击要测量的量子比特", True, (200, 0, 0))
+            hint_img = render_text(self.font, "请点击要测量的量子比特", (200, 0, 0))
             self.screen.blit(hint_img, (
                 inventory_rect.centerx - hint_img.get_width()//2,
                 self.button_rect.top - 40
             ))
         elif self.selecting_gate:
-            hint_img = self.font.render("请点击要应用的量子门", True, (0, 0, 200))
+            hint_img = render_text(self.font, "请点击要应用的量子门", (0, 0, 200))
             self.screen.blit(hint_img, (
                 inventory_rect.centerx - hint_img.get_width()//2,
                 self.button_rect.top - 40
@@ -507,7 +516,7 @@ class Messageboard():
         pygame.draw.rect(self.screen, (50, 50, 70), popup_rect, width=3, border_radius=15)
         
         # 标题
-        title = self.font.render("选择要抢夺的玩家", True, (40, 40, 120))
+        title = render_text(self.font, "选择要抢夺的玩家", (40, 40, 120))
         self.screen.blit(title, (popup_rect.centerx - title.get_width()//2, popup_rect.top + 20))
         
         # 玩家按钮 - 固定Y坐标增量
@@ -533,7 +542,7 @@ class Messageboard():
             
             # 玩家信息
             text = f"{player.player_name} (量子比特: {len(player.qubits)})"
-            text_img = self.font.render(text, True, (60, 60, 60))
+            text_img = render_text(self.font, text, (60, 60, 60))
             self.screen.blit(text_img, (
                 btn_rect.centerx - text_img.get_width()//2,
                 btn_rect.centery - text_img.get_height()//2
@@ -549,7 +558,7 @@ class Messageboard():
             160, 40
         )
         pygame.draw.rect(self.screen, (180, 100, 100), cancel_rect, border_radius=8)
-        cancel_text = self.font.render("取消", True, (255, 255, 255))
+        cancel_text = render_text(self.font, "取消", (255, 255, 255))
         self.screen.blit(cancel_text, (
             cancel_rect.centerx - cancel_text.get_width()//2,
             cancel_rect.centery - cancel_text.get_height()//2
@@ -577,7 +586,7 @@ class Messageboard():
         pygame.draw.rect(self.screen, (50, 50, 70), popup_rect, width=3, border_radius=15)
         
         # 标题
-        title = self.font.render(f"选择要从{target_player.player_name}抢夺的量子比特", True, (40, 40, 120))
+        title = render_text(self.font, f"选择要从{target_player.player_name}抢夺的量子比特", (40, 40, 120))
         self.screen.blit(title, (popup_rect.centerx - title.get_width()//2, popup_rect.top + 20))
         
         # 绘制qubit列表
@@ -604,9 +613,9 @@ class Messageboard():
             prob_text = f"P(|0>)={prob_0:.0%} P(|1>)={prob_1:.0%}"
             
             # 创建多行文本
-            qubit_text = self.font.render(f"量子比特 {i+1}", True, (60, 60, 60))
-            state_text = self.font.render(state_str, True, (80, 80, 80))
-            prob_text = self.font.render(prob_text, True, (100, 100, 100))
+            qubit_text = render_text(self.font, f"量子比特 {i+1}", (60, 60, 60))
+            state_text = render_text(self.font, state_str, (80, 80, 80))
+            prob_text = render_text(self.font, prob_text, (100, 100, 100))
             
             # 绘制文本
             self.screen.blit(qubit_text, (
@@ -630,7 +639,7 @@ class Messageboard():
         )
         pygame.draw.rect(self.screen, (180, 100, 100), cancel_rect, border_radius=8)
         pygame.draw.rect(self.screen, (120, 60, 60), cancel_rect, width=2, border_radius=8)
-        cancel_text = self.font.render("取消", True, (255, 255, 255))
+        cancel_text = render_text(self.font, "取消", (255, 255, 255))
         self.screen.blit(cancel_text, (
             cancel_rect.centerx - cancel_text.get_width()//2,
             cancel_rect.centery - cancel_text.get_height()//2
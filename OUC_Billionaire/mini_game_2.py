@@ -1,25 +1,72 @@
 import numpy as np
 import pygame
-import random
 from pygame.locals import *
+from fonts import FONT_PATH, get_font, render_text
+from scene import push_scene, pop_scene, present_scene, get_events
+from maze import classic_maze, generate_maze, MazeNavigator
+from random_service import stream, ORACLES
 
 
+class GroverState:
+    """Grover搜索的量子态：除目标格外所有格子的振幅始终相同，只需记录两个数，Oracle和Diffusion都是O(1)"""
+    def __init__(self, shape, target):
+        self.shape = tuple(shape)
+        self.size = int(np.prod(self.shape))
+        self.target = tuple(target)
+        # 初始为均匀叠加态（取值与原先的 probs 数组一致）
+        self.target_amp = 1.0 / self.size
+        self.background_amp = 1.0 / self.size
+
+    def oracle(self):
+        """Oracle：翻转目标格振幅的符号"""
+        self.target_amp = -self.target_amp
+
+    def diffusion(self):
+        """Diffusion：关于平均振幅翻转，再归一化"""
+        n = self.size
+        mean = (self.target_amp + (n - 1) * self.background_amp) / n
+        target_amp = 2 * mean - self.target_amp
+        background_amp = 2 * mean - self.background_amp
+        norm = np.sqrt(target_amp ** 2 + (n - 1) * background_amp ** 2)
+        self.target_amp = target_amp / norm
+        self.background_amp = background_amp / norm
+
+    def target_probability(self):
+        """测量得到目标格的概率"""
+        target_weight = self.target_amp ** 2
+        return target_weight / (target_weight + (self.size - 1) * self.background_amp ** 2)
+
+    def most_likely(self):
+        """概率最大的格子坐标，与对整个网格取 np.argmax 的结果一致"""
+        if self.target_amp ** 2 > self.background_amp ** 2:
+            return self.target
+        # 概率相同或背景更大时取第一个非目标格
+        first = 0 if np.ravel_multi_index(self.target, self.shape) != 0 else 1
+        return np.unravel_index(first, self.shape)
+
+    def amplitudes(self):
+        """展开成完整的振幅网格，只在绘制时使用"""
+        grid = np.full(self.shape, self.background_amp)
+        grid[self.target] = self.target_amp
+        return grid
+
 
 def play(screen, gs, ai_settings):
-    main_size = screen.get_size()
-    main_caption = pygame.display.get_caption()[0]    
-    
     # 初始化 Pygame
     pygame.init()
     WIDTH, HEIGHT = 1200, 1000  # 保持原有分辨率不变
-    GRID_SIZE = 16
-    CELL_SIZE = 50  # 稍微减小单元格大小以适应左边布局
+    BOARD_PIXELS = 800  # 棋盘最多占800像素
+    # 每个单元格至少1像素，网格边长超过800时截断，保证棋盘不挤占右边面板
+    GRID_SIZE = min(ai_settings.grover_grid_size, BOARD_PIXELS)
+    if GRID_SIZE != ai_settings.grover_grid_size:
+        print(f"Warning: grover_grid_size={ai_settings.grover_grid_size} 超过 {BOARD_PIXELS}，已按 {GRID_SIZE} 处理")
+    CELL_SIZE = BOARD_PIXELS // GRID_SIZE  # 大网格时缩小单元格
     BOARD_WIDTH = GRID_SIZE * CELL_SIZE
     BOARD_HEIGHT = GRID_SIZE * CELL_SIZE
     RIGHT_PANEL_WIDTH = WIDTH - BOARD_WIDTH - 20  # 右边面板宽度
     
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Quantum Maze (Grover's Algorithm)")
+    # 在主窗口上进入小游戏场景，不重新创建显示窗口
+    screen = push_scene((WIDTH, HEIGHT), "Quantum Maze (Grover's Algorithm)")
 
     # 颜色定义（保持不变）
     WHITE = (255, 255, 255)
@@ -37,36 +84,30 @@ def play(screen, gs, ai_settings):
     PANEL_COLOR = (240, 240, 240)  # 右边面板背景色
 
     # 字体定义（保持不变）
-    try:
-        button_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
-        hint_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 20)
-        status_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 28)
-        title_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 32)
-    except:
-        button_font = pygame.font.SysFont(None, 24)
-        hint_font = pygame.font.SysFont(None, 20)
-        status_font = pygame.font.SysFont(None, 28)
-        title_font = pygame.font.SysFont(None, 32)
+    button_font = get_font(FONT_PATH, 24)
+    hint_font = get_font(FONT_PATH, 20)
+    status_font = get_font(FONT_PATH, 28)
+    title_font = get_font(FONT_PATH, 32)
 
-    # 初始化量子态（保持不变）
-    probs = np.ones((GRID_SIZE, GRID_SIZE)) / (GRID_SIZE ** 2)
     player_pos = [0, 0]
     
-    # 定义迷宫障碍墙（保持不变）
-    maze = np.zeros((GRID_SIZE, GRID_SIZE))
-    for i in range(GRID_SIZE):
-        maze[i][5] = 1 if i not in [2, 3, 7, 8, 12] else 0
-        maze[i][10] = 1 if i not in [1, 6, 11, 14] else 0
-    for j in range(GRID_SIZE):
-        maze[3][j] = 1 if j not in [0, 4, 9, 15] else 0
-        maze[12][j] = 1 if j not in [2, 7, 11] else 0
+    # 迷宫障碍墙：16×16默认使用原先设计的迷宫，其他尺寸随机生成（保证连通）
+    if GRID_SIZE == 16 and not ai_settings.grover_procedural_maze:
+        maze = classic_maze(GRID_SIZE)
+    else:
+        maze = generate_maze(GRID_SIZE, GRID_SIZE, rng=stream(ORACLES))
+    # 每个目标只做一次BFS，之后提示都是查表
+    navigator = MazeNavigator(maze)
     
-    # 确保起点和终点不在墙上（保持不变）
+    # 确保起点和终点不在墙上
     while True:
-        target_pos = [random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1)]
+        target_pos = [stream(ORACLES).randint(0, GRID_SIZE - 1), stream(ORACLES).randint(0, GRID_SIZE - 1)]
         if maze[target_pos[0]][target_pos[1]] == 0 and target_pos != [0, 0]:
             break
 
+    # 初始化量子态（均匀叠加态）
+    state = GroverState((GRID_SIZE, GRID_SIZE), target_pos)
+
     # 操作反馈变量（保持不变）
     action_text = ""
     show_action_text = False
@@ -77,7 +118,7 @@ def play(screen, gs, ai_settings):
     # 提示信息（保持不变）
     show_rules = True
     show_strategy = False
-    rules_text = "游戏规则：使用WASD移动，点击按钮应用量子操作寻找目标位置"
+    rules_text = "游戏规则：使用WASD移动，点击按钮应用量子操作寻找目标位置，按H键显示/隐藏概率热力图"
     strategy_text = "策略提示：交替使用Oracle和Diffusion操作来放大目标概率"
 
     # 重新定义按钮位置 - 现在放在右边面板
@@ -90,57 +131,110 @@ def play(screen, gs, ai_settings):
     check_button = pygame.Rect(BOARD_WIDTH + 20, button_start_y + 140, button_width, button_height)
     exit_button = pygame.Rect(BOARD_WIDTH + 20, button_start_y + 210, button_width, button_height)
 
-    # Grover 操作（保持不变）
-    def grover_oracle(amplitudes, target):
-        new_amp = amplitudes.copy()
-        new_amp[target[0]][target[1]] *= -1
-        return new_amp
+    def get_hint(player_pos, state):
+        # 沿迷宫中的真实路径走向概率最大的格子
+        return navigator.hint(player_pos, state.most_likely())
 
-    def diffusion_operator(amplitudes):
-        mean_amplitude = np.mean(amplitudes)
-        amplitudes = (2 * mean_amplitude) - amplitudes
-        amplitudes=amplitudes / np.linalg.norm(amplitudes)
-        return amplitudes
+    board_start_x = 20
+    board_start_y = (HEIGHT - BOARD_HEIGHT) // 2  # 垂直居中
+    rules_button = pygame.Rect(BOARD_WIDTH + 20, 100, RIGHT_PANEL_WIDTH - 40, 30)
+    strategy_button = pygame.Rect(BOARD_WIDTH + 20, 140, RIGHT_PANEL_WIDTH - 40, 30)
 
-    def get_hint(player_pos, amplitudes):
-        probabilities = np.abs(amplitudes) ** 2
-        max_prob_pos = np.unravel_index(np.argmax(probabilities), probabilities.shape)
+    def build_board_surface():
+        """绘制静态迷宫（网格线和障碍墙），每局只绘制一次"""
+        board = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT))
+        board.fill(WHITE)
+        if CELL_SIZE >= 4:
+            # 每个格子都有1像素的黑色边框，相邻格子的边框并排
+            for k in range(GRID_SIZE + 1):
+                for offset in (k * CELL_SIZE - 1, k * CELL_SIZE):
+                    if 0 <= offset < BOARD_WIDTH:
+                        pygame.draw.line(board, BLACK, (offset, 0), (offset, BOARD_HEIGHT - 1))
+                        pygame.draw.line(board, BLACK, (0, offset), (BOARD_WIDTH - 1, offset))
+        # 障碍墙：每格一个像素生成小图后整体放大，一次贴图
+        walls = np.zeros((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        walls[maze == 1] = GRAY
+        wall_surface = pygame.surfarray.make_surface(walls.transpose(1, 0, 2))
+        wall_surface = pygame.transform.scale(wall_surface, (BOARD_WIDTH, BOARD_HEIGHT))
+        wall_surface.set_colorkey(BLACK)
+        board.blit(wall_surface, (0, 0))
+        return board
 
-        dr = max_prob_pos[0] - player_pos[0]
-        dc = max_prob_pos[1] - player_pos[1]
+    def blit_centered(surface, text_surface, rect):
+        surface.blit(text_surface, (rect.x + (rect.width - text_surface.get_width()) // 2,
+                                    rect.y + (rect.height - text_surface.get_height()) // 2))
+
+    def build_background():
+        """绘制每帧都不变的画面：迷宫、右边面板、标题和按钮"""
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(WHITE)
         
-        if abs(dr) > abs(dc):
-            return "up" if dr < 0 else "down"
-        else:
-            return "left" if dc < 0 else "right"
+        # 右边面板背景
+        pygame.draw.rect(background, PANEL_COLOR, (BOARD_WIDTH, 0, RIGHT_PANEL_WIDTH, HEIGHT))
+        background.blit(build_board_surface(), (board_start_x, board_start_y))
+        
+        # 1. 游戏标题
+        title_surface = render_text(title_font, "量子迷宫", BLACK)
+        background.blit(title_surface, (BOARD_WIDTH + (RIGHT_PANEL_WIDTH - title_surface.get_width()) // 2, 30))
+        
+        # 2. 规则和策略按钮
+        pygame.draw.rect(background, BUTTON_COLOR, rules_button)
+        pygame.draw.rect(background, BUTTON_COLOR, strategy_button)
+        blit_centered(background, render_text(button_font, "游戏规则", BLACK), rules_button)
+        blit_centered(background, render_text(button_font, "策略查询", BLACK), strategy_button)
+        
+        # 3. 操作按钮
+        for rect, color, text in ((oracle_button, ORACLE_COLOR, "Oracle"),
+                                  (diffusion_button, DIFFUSION_COLOR, "Diffusion"),
+                                  (check_button, CHECK_COLOR, "Check"),
+                                  (exit_button, EXIT_COLOR, "Exit")):
+            pygame.draw.rect(background, color, rect)
+            blit_centered(background, render_text(button_font, text, BLACK), rect)
+        return background
+
+    background = build_background()
+
+    # 概率热力图，量子态变化时才重新生成
+    heatmap_key = None
+    heatmap_surface = None
+
+    def build_heatmap():
+        """由振幅数组直接生成概率热力图（一次 surfarray 转换和一次缩放，没有逐格绘制）"""
+        probabilities = state.amplitudes() ** 2
+        probabilities /= probabilities.sum()
+        # 开四次方拉开小概率之间的差别，概率越大颜色越红
+        fade = (255 * (1 - probabilities ** 0.25)).astype(np.uint8)
+        rgb = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        rgb[..., 0] = 255
+        rgb[..., 1] = fade
+        rgb[..., 2] = fade
+        surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+        surface = pygame.transform.scale(surface, (BOARD_WIDTH, BOARD_HEIGHT))
+        surface.set_alpha(150)
+        return surface
 
     # 游戏主循环
     running = True
     hint_text = ""
     game_status = "Playing"
+    show_heatmap = ai_settings.grover_heatmap
 
     while running:
-        screen.fill(WHITE)
-        
-        # 绘制右边面板背景
-        pygame.draw.rect(screen, PANEL_COLOR, (BOARD_WIDTH, 0, RIGHT_PANEL_WIDTH, HEIGHT))
+        # 静态画面整体贴图
+        screen.blit(background, (0, 0))
         
         # 检查操作反馈是否超时
         current_time = pygame.time.get_ticks()
         if show_action_text and (current_time - action_text_time > ACTION_DISPLAY_TIME):
             show_action_text = False
         
-        # 绘制棋盘
-        board_start_x = 20
-        board_start_y = (HEIGHT - BOARD_HEIGHT) // 2  # 垂直居中
-        
-        # 绘制网格和障碍墙
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                rect = pygame.Rect(board_start_x + c * CELL_SIZE, board_start_y + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(screen, BLACK, rect, 1)
-                if maze[r][c] == 1:  # 绘制障碍墙
-                    pygame.draw.rect(screen, GRAY, rect)
+        # 概率热力图
+        if show_heatmap:
+            key = (state.target_amp, state.background_amp)
+            if key != heatmap_key:
+                heatmap_key = key
+                heatmap_surface = build_heatmap()
+            screen.blit(heatmap_surface, (board_start_x, board_start_y))
         
         # 绘制玩家（蓝色）
         pygame.draw.rect(
@@ -155,89 +249,47 @@ def play(screen, gs, ai_settings):
                 (board_start_x + target_pos[1] * CELL_SIZE, board_start_y + target_pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
             )
         
-        # 绘制右边面板内容
-        # 1. 游戏标题
-        title_surface = title_font.render("量子迷宫", True, BLACK)
-        screen.blit(title_surface, (BOARD_WIDTH + (RIGHT_PANEL_WIDTH - title_surface.get_width()) // 2, 30))
-        
-        # 2. 规则和策略提示
-        rules_button = pygame.Rect(BOARD_WIDTH + 20, 100, RIGHT_PANEL_WIDTH - 40, 30)
-        strategy_button = pygame.Rect(BOARD_WIDTH + 20, 140, RIGHT_PANEL_WIDTH - 40, 30)
-        
-        pygame.draw.rect(screen, BUTTON_COLOR, rules_button)
-        pygame.draw.rect(screen, BUTTON_COLOR, strategy_button)
-        
-        rules_btn_text = button_font.render("游戏规则", True, BLACK)
-        strategy_btn_text = button_font.render("策略查询", True, BLACK)
-        
-        screen.blit(rules_btn_text, (rules_button.x + (rules_button.width - rules_btn_text.get_width()) // 2, 
-                                    rules_button.y + (rules_button.height - rules_btn_text.get_height()) // 2))
-        screen.blit(strategy_btn_text, (strategy_button.x + (strategy_button.width - strategy_btn_text.get_width()) // 2, 
-                                      strategy_button.y + (strategy_button.height - strategy_btn_text.get_height()) // 2))
-        
         # 显示提示信息
         if show_rules:
             rules_lines = [rules_text[i:i+30] for i in range(0, len(rules_text), 30)]
             for i, line in enumerate(rules_lines):
-                rules_surface = hint_font.render(line, True, BLACK)
+                rules_surface = render_text(hint_font, line, BLACK)
                 screen.blit(rules_surface, (BOARD_WIDTH + 20, 180 + i * 25))
         
         if show_strategy:
             strategy_lines = [strategy_text[i:i+30] for i in range(0, len(strategy_text), 30)]
             for i, line in enumerate(strategy_lines):
-                strategy_surface = hint_font.render(line, True, BLACK)
+                strategy_surface = render_text(hint_font, line, BLACK)
                 screen.blit(strategy_surface, (BOARD_WIDTH + 20, 180 + i * 25))
         
-        # 3. 绘制操作按钮
-        pygame.draw.rect(screen, ORACLE_COLOR, oracle_button)
-        pygame.draw.rect(screen, DIFFUSION_COLOR, diffusion_button)
-        pygame.draw.rect(screen, CHECK_COLOR, check_button)
-        pygame.draw.rect(screen, EXIT_COLOR, exit_button)
-        
-        # 按钮文字
-        oracle_text = button_font.render("Oracle", True, BLACK)
-        diffusion_text = button_font.render("Diffusion", True, BLACK)
-        check_text = button_font.render("Check", True, BLACK)
-        exit_text = button_font.render("Exit", True, BLACK)
-        
-        # 居中按钮文字
-        screen.blit(oracle_text, (oracle_button.x + (button_width - oracle_text.get_width()) // 2, 
-                                oracle_button.y + (button_height - oracle_text.get_height()) // 2))
-        screen.blit(diffusion_text, (diffusion_button.x + (button_width - diffusion_text.get_width()) // 2, 
-                                    diffusion_button.y + (button_height - diffusion_text.get_height()) // 2))
-        screen.blit(check_text, (check_button.x + (button_width - check_text.get_width()) // 2, 
-                                check_button.y + (button_height - check_text.get_height()) // 2))
-        screen.blit(exit_text, (exit_button.x + (button_width - exit_text.get_width()) // 2, 
-                                exit_button.y + (button_height - exit_text.get_height()) // 2))
-        
         # 4. 显示操作反馈
         if show_action_text:
-            action_surface = hint_font.render(action_text, True, BLACK)
+            action_surface = render_text(hint_font, action_text, BLACK)
             screen.blit(action_surface, (BOARD_WIDTH + 20, button_start_y + 280))
         
         # 5. 显示游戏状态
         if game_status == "Win":
-            result_surface = status_font.render("恭喜！你找到了目标！", True, GREEN)
+            result_surface = render_text(status_font, "恭喜！你找到了目标！", GREEN)
         elif game_status == "Lose":
-            result_surface = status_font.render("游戏失败！", True, RED)
+            result_surface = render_text(status_font, "游戏失败！", RED)
         else:
-            result_surface = status_font.render("游戏中...", True, BLACK)
+            result_surface = render_text(status_font, "游戏中...", BLACK)
         screen.blit(result_surface, (BOARD_WIDTH + 20, button_start_y + 320))
         
         # 6. 显示当前提示
         if hint_text:
-            hint_surface = hint_font.render(f"提示: 向 {hint_text} 方向移动", True, BLACK)
+            hint_surface = render_text(hint_font, f"提示: 向 {hint_text} 方向移动", BLACK)
             screen.blit(hint_surface, (BOARD_WIDTH + 20, button_start_y + 360))
         
-        pygame.display.flip()
+        present_scene()
         
         # 事件处理（保持不变）
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 running = False
             
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = event.pos
                 
                 # 检查是否点击规则/策略按钮
                 if rules_button.collidepoint(mouse_pos):
@@ -250,22 +302,19 @@ def play(screen, gs, ai_settings):
                 # 检查是否点击Exit按钮
                 elif exit_button.collidepoint(mouse_pos):
                     if game_status == "Win":
-                        pygame.display.set_mode(main_size)
-                        pygame.display.set_caption(main_caption)
+                        pop_scene()
                         return {
                             "message": "量子迷宫挑战成功！找到了目标！获得资金100元",
                             "effect": 100
                         }
                     elif game_status == "Lose":
-                        pygame.display.set_mode(main_size)
-                        pygame.display.set_caption(main_caption)
+                        pop_scene()
                         return {
                             "message": "量子迷宫挑战失败，但获得了经验。获得资金10元",
                             "effect": 10
                         }
                     else:
-                        pygame.display.set_mode(main_size)
-                        pygame.display.set_caption(main_caption)
+                        pop_scene()
                         return {
                             "message": "量子迷宫游戏退出。未获得资金",
                             "effect": 0
@@ -274,18 +323,18 @@ def play(screen, gs, ai_settings):
                 # 游戏进行中时的按钮处理
                 elif game_status == "Playing":
                     if oracle_button.collidepoint(mouse_pos):
-                        probs = grover_oracle(probs, target_pos)
+                        state.oracle()
                         action_text = "执行Oracle操作！"
                         show_action_text = True
                         action_text_time = pygame.time.get_ticks()
-                        hint_text = get_hint(player_pos, probs)
+                        hint_text = get_hint(player_pos, state)
                     
                     elif diffusion_button.collidepoint(mouse_pos):
-                        probs = diffusion_operator(probs)
+                        state.diffusion()
                         action_text = "执行Diffusion操作！"
                         show_action_text = True
                         action_text_time = pygame.time.get_ticks()
-                        hint_text = get_hint(player_pos, probs)
+                        hint_text = get_hint(player_pos, state)
                     
                     elif check_button.collidepoint(mouse_pos):
                         show_target = True
@@ -294,6 +343,10 @@ def play(screen, gs, ai_settings):
                         else:
                             game_status = "Lose"
             
+            # H键切换概率热力图
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                show_heatmap = not show_heatmap
+            
             # 玩家移动控制（保持不变）
             if game_status == "Playing" and event.type == pygame.KEYDOWN:
                 new_pos = player_pos.copy()
@@ -309,4 +362,11 @@ def play(screen, gs, ai_settings):
                 
                 if maze[new_pos[0]][new_pos[1]] == 0:
                     player_pos = new_pos
-                    hint_text = ""
\ No newline at end of file
+                    hint_text = ""
+
+    # 关闭窗口退出
+    pop_scene()
+    return {
+        "message": "量子迷宫游戏退出。未获得资金",
+        "effect": 0
+    }
@@ -1,41 +1,94 @@
 import pygame
-import random
 import numpy as np
 from pygame.locals import *
+from fonts import FONT_PATH, get_font, render_text
+from scene import push_scene, pop_scene, present_scene, get_events
+from gate import XGate, ZGate
+from random_service import stream, MEASUREMENT
+
+# 三个量子比特：q0 为被抢夺的量子比特，q1 为目标玩家持有的EPR半边，q2 为抢夺者持有的EPR半边
+# 8维态矢量的下标为 4*q0 + 2*q1 + q2
+EPR_PAIR = np.array([1, 0, 0, 1], dtype=complex) / np.sqrt(2)  # (|00> + |11>)/√2
+
+BELL_LABELS = ("Φ+", "Φ-", "Ψ+", "Ψ-")
+# q0, q1 上的贝尔基，每行一个基矢
+BELL_BASIS = np.array([
+    [1, 0, 0, 1],
+    [1, 0, 0, -1],
+    [0, 1, 1, 0],
+    [0, 1, -1, 0],
+], dtype=complex) / np.sqrt(2)
+# 贝尔测量的投影算符 |β><β| ⊗ I，形状 (4, 8, 8)，只在导入时计算一次
+BELL_PROJECTORS = np.einsum('ki,kj,ab->kiajb', BELL_BASIS, BELL_BASIS.conj(),
+                            np.eye(2)).reshape(4, 8, 8)
+
+# 每个测量结果需要按顺序作用的修正门
+BELL_CORRECTIONS = {
+    "Φ+": [],
+    "Φ-": ["Z"],
+    "Ψ+": ["X"],
+    "Ψ-": ["X", "Z"]
+}
+GATE_MATRICES = {"X": XGate().matrix, "Z": ZGate().matrix}
+
+
+def correction_matrix(gates):
+    """按顺序作用一串泡利门对应的 2x2 矩阵"""
+    matrix = np.eye(2, dtype=complex)
+    for gate in gates:
+        matrix = GATE_MATRICES[gate] @ matrix
+    return matrix
+
+
+def teleport_state(state, rng=None):
+    """
+    对 8 个振幅的态矢量模拟隐形传态中的贝尔测量
+    参数:
+        state: 被抢夺量子比特的振幅 [α, β]
+    返回:
+        (测量结果下标, 四个结果的概率, 抢夺者手中尚未修正的量子态)
+    """
+    rng = rng or stream(MEASUREMENT).generator
+    psi = np.kron(state, EPR_PAIR)
+    projected = BELL_PROJECTORS @ psi
+    probabilities = np.einsum('ki,ki->k', projected.conj(), projected).real
+    outcome = rng.choice(4, p=probabilities / probabilities.sum())
+    collapsed = projected[outcome] / np.sqrt(probabilities[outcome])
+    # 测量后 q0, q1 处于贝尔态，剩下的因子就是 q2 的量子态
+    received = BELL_BASIS[outcome].conj() @ collapsed.reshape(4, 2)
+    return outcome, probabilities, received
+
+
+def fidelity(expected, actual):
+    """两个纯态的保真度 |<expected|actual>|^2"""
+    return float(abs(np.vdot(expected, actual)) ** 2)
 
 def play(screen, gs, ai_settings, qubit_to_steal):
     """主游戏接口，与其他小游戏一致"""
-    # 保存主游戏状态
-    main_size = screen.get_size()
-    main_caption = pygame.display.get_caption()[0]
-    
     # 初始化游戏
     game = QuantumTeleportationGame(
         qubit_to_steal=qubit_to_steal,
         screen_size=(1200, 1000)  # 与其他小游戏一致的分辨率
     )
     
-    # 运行游戏
+    # 运行游戏（结束时自动离开小游戏场景）
     result = game.run()
     
-    # 恢复主游戏显示
-    screen = pygame.display.set_mode(ai_settings.screen_size)
-    pygame.display.set_caption(main_caption)
-    
     return {
         "message": result["message"],
         "effect": 100 if result["success"] else 0,
-        "success": result["success"]
+        "success": result["success"],
+        "qubit_state": result["qubit_state"]
     }
 
 class QuantumTeleportationGame:
     def __init__(self, qubit_to_steal, screen_size=(1200, 1000)):
         pygame.init()
         self.WIDTH, self.HEIGHT = screen_size
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        # 在主窗口上进入小游戏场景，不重新创建显示窗口
+        self.screen = push_scene((self.WIDTH, self.HEIGHT), "量子隐形传态协议")
         self.measure_progress = 0  # 0~100
         self.measuring_auto = False  # 是否自动进度
-        pygame.display.set_caption("量子隐形传态协议")
         
         # 颜色和字体定义
         self.COLORS = {
@@ -49,12 +102,8 @@ class QuantumTeleportationGame:
             "CHECK": (200, 100, 100)
         }
         
-        try:
-            self.font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
-            self.small_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 20)
-        except:
-            self.font = pygame.font.SysFont(None, 24)
-            self.small_font = pygame.font.SysFont(None, 20)
+        self.font = get_font(FONT_PATH, 24)
+        self.small_font = get_font(FONT_PATH, 20)
         
         # 游戏状态
         self.state = "intro"  # intro, measuring, gate_selection, result
@@ -63,12 +112,13 @@ class QuantumTeleportationGame:
         self.player_choices = []
         
         
-        # 量子数据
-        self.qubit_to_steal = {
-            'alpha': qubit_to_steal.alpha,
-            'beta': qubit_to_steal.beta
-        }
-        self.initialize_epr_pair()
+        # 量子数据：被抢夺量子比特的振幅，与EPR对一起组成 8 个振幅的态矢量
+        self.source_state = np.array([qubit_to_steal.alpha, qubit_to_steal.beta], dtype=complex)
+        self.source_state /= np.linalg.norm(self.source_state)
+        self.outcome_probabilities = None
+        self.received_state = None  # 贝尔测量后抢夺者手中的量子态
+        self.final_state = None     # 应用玩家选择的门之后的量子态
+        self.fidelity = 0.0
         
         # 初始化UI
         self.init_ui()
@@ -92,12 +142,13 @@ class QuantumTeleportationGame:
         self.result = {
             "success": False,
             "effect":0,
-            "message": "游戏未完成"
+            "message": "游戏未完成",
+            "qubit_state": None
         }
         # print("333333\n")
         self.running = True
         while self.running:
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == QUIT:
                     # print("666666\n")
                     running = False
@@ -116,9 +167,10 @@ class QuantumTeleportationGame:
                     self.perform_measurement()
             
             self.draw()
-            pygame.display.flip()
+            present_scene()
             clock.tick(30)
         # print("55555\n")
+        pop_scene()
         return self.result
     
     def handle_click(self, mouse_pos):
@@ -135,27 +187,34 @@ class QuantumTeleportationGame:
             self.handle_gate_selection(mouse_pos)
             
         elif self.state == "result" and self.buttons["continue"].collidepoint(mouse_pos):
-            success = set(self.player_choices) == set(self.correct_gates)
+            success = self.is_success()
             self.result["success"] = success
             self.result["effect"] = 100 if success else 0
             self.result["message"] = "成功抢夺量子比特！" if success else "抢夺失败！"
+            if success:
+                # 抢夺者得到的是传输后的量子态，去掉全局相位后与原量子比特的振幅一致
+                overlap = np.vdot(self.source_state, self.final_state)
+                state = self.final_state * np.exp(-1j * np.angle(overlap))
+                self.result["qubit_state"] = state
             self.state = "exit"  # 标记游戏结束
             self.running = False  # 退出主循环
     
     def perform_measurement(self):
-        """执行贝尔测量"""
-        bell_states = {
-            "Φ+": [],
-            "Φ-": ["Z"],
-            "Ψ+": ["X"],
-            "Ψ-": ["X", "Z"]
-        }
-        
-        # 简化的贝尔测量模拟
-        self.measurement_result = random.choice(list(bell_states.keys()))
-        self.correct_gates = bell_states[self.measurement_result]
+        """执行贝尔测量，按真实概率抽取测量结果"""
+        outcome, self.outcome_probabilities, self.received_state = teleport_state(self.source_state)
+        self.measurement_result = BELL_LABELS[outcome]
+        self.correct_gates = BELL_CORRECTIONS[self.measurement_result]
         self.state = "gate_selection"
     
+    def apply_corrections(self):
+        """对抢夺者手中的量子态应用玩家选择的门，并计算与原量子态的保真度"""
+        self.final_state = correction_matrix(self.player_choices) @ self.received_state
+        self.fidelity = fidelity(self.source_state, self.final_state)
+    
+    def is_success(self):
+        """传输后的量子态与原量子态一致（保真度为1）即为成功"""
+        return self.fidelity > 1 - 1e-9
+    
     def handle_gate_selection(self, mouse_pos):
         """处理量子门选择"""
         if self.buttons["X"].collidepoint(mouse_pos):
@@ -171,6 +230,7 @@ class QuantumTeleportationGame:
             self.buttons["X"], self.buttons["Z"], 
             self.buttons["XZ"], self.buttons["none"]
         ]):
+            self.apply_corrections()
             self.state = "result"
     
     def draw(self):
@@ -188,7 +248,7 @@ class QuantumTeleportationGame:
     
     def draw_intro(self):
         """绘制介绍界面"""
-        title = self.font.render("量子隐形传态协议", True, self.COLORS["BLUE"])
+        title = render_text(self.font, "量子隐形传态协议", self.COLORS["BLUE"])
         self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 100))
         
         lines = [
@@ -200,14 +260,14 @@ class QuantumTeleportationGame:
         ]
         
         for i, line in enumerate(lines):
-            text = self.small_font.render(line, True, self.COLORS["BLACK"])
+            text = render_text(self.small_font, line, self.COLORS["BLACK"])
             self.screen.blit(text, (400, 180 + i * 30))
         
         self.draw_button("start", "开始协议", self.COLORS["ORACLE"])
     
     def draw_measuring(self):
         """绘制测量界面"""
-        title = self.font.render("贝尔测量阶段", True, self.COLORS["BLUE"])
+        title = render_text(self.font, "贝尔测量阶段", self.COLORS["BLUE"])
         self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 100))
         # 绘制量子电路图示
         # pygame.draw.rect(self.screen, self.COLORS["DIFFUSION"], (400, 200, 50, 100))
@@ -219,7 +279,7 @@ class QuantumTeleportationGame:
         pygame.draw.rect(self.screen, self.COLORS["BLACK"], (bar_x, bar_y, bar_w, bar_h), 2)
         fill_w = int(bar_w * self.measure_progress / 100)
         pygame.draw.rect(self.screen, self.COLORS["GREEN"], (bar_x, bar_y, fill_w, bar_h))
-        progress_text = self.small_font.render(f"测量进度: {self.measure_progress:.0f}%", True, self.COLORS["BLACK"])
+        progress_text = render_text(self.small_font, f"测量进度: {self.measure_progress:.0f}%", self.COLORS["BLACK"])
         self.screen.blit(progress_text, (bar_x + bar_w // 2 - progress_text.get_width() // 2, bar_y + bar_h + 5))
         
         # if self.measure_progress >= 100:
@@ -229,13 +289,16 @@ class QuantumTeleportationGame:
     
     def draw_gate_selection(self):
         """绘制门选择界面"""
-        title = self.font.render("选择量子门", True, self.COLORS["BLUE"])
+        title = render_text(self.font, "选择量子门", self.COLORS["BLUE"])
         self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 100))
         
-        result_text = self.font.render(f"贝尔测量结果: {self.measurement_result}", 
-                                     True, self.COLORS["BLACK"])
+        result_text = render_text(self.font, f"贝尔测量结果: {self.measurement_result}", self.COLORS["BLACK"])
         self.screen.blit(result_text, (self.WIDTH//2 - result_text.get_width()//2, 180))
         
+        probability_line = "  ".join(f"{label}: {p:.0%}" for label, p in zip(BELL_LABELS, self.outcome_probabilities))
+        probability_text = render_text(self.small_font, f"测量前各结果的概率  {probability_line}", self.COLORS["BLACK"])
+        self.screen.blit(probability_text, (self.WIDTH//2 - probability_text.get_width()//2, 230))
+        
         self.draw_button("X", "X门", self.COLORS["ORACLE"])
         self.draw_button("Z", "Z门", self.COLORS["DIFFUSION"])
         self.draw_button("XZ", "X和Z门", self.COLORS["CHECK"])
@@ -243,16 +306,19 @@ class QuantumTeleportationGame:
     
     def draw_result(self):
         """绘制结果界面"""
-        success = set(self.player_choices) == set(self.correct_gates)
+        success = self.is_success()
         color = self.COLORS["GREEN"] if success else self.COLORS["RED"]
         message = "成功! 你正确恢复了量子态!" if success else "失败! 量子态恢复不正确!"
         
-        title = self.font.render("协议结果", True, self.COLORS["BLUE"])
+        title = render_text(self.font, "协议结果", self.COLORS["BLUE"])
         self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, 100))
         
-        result_text = self.font.render(message, True, color)
+        result_text = render_text(self.font, message, color)
         self.screen.blit(result_text, (self.WIDTH//2 - result_text.get_width()//2, 180))
         
+        fidelity_text = render_text(self.small_font, f"传输保真度: {self.fidelity:.3f}", self.COLORS["BLACK"])
+        self.screen.blit(fidelity_text, (self.WIDTH//2 - fidelity_text.get_width()//2, 230))
+        
         self.draw_button("continue", "继续", self.COLORS["ORACLE"])
     
     def draw_button(self, btn_id, text, color):
@@ -261,13 +327,6 @@ class QuantumTeleportationGame:
         pygame.draw.rect(self.screen, color, btn)
         pygame.draw.rect(self.screen, self.COLORS["BLACK"], btn, 2)
         
-        text_surf = self.font.render(text, True, self.COLORS["BLACK"])
+        text_surf = render_text(self.font, text, self.COLORS["BLACK"])
         text_rect = text_surf.get_rect(center=btn.center)
         self.screen.blit(text_surf, text_rect)
-    
-    def initialize_epr_pair(self):
-        """初始化EPR对"""
-        self.epr_qubit = {
-            'alpha': 1/np.sqrt(2),
-            'beta': 1/np.sqrt(2)
-        }
\ No newline at end of file
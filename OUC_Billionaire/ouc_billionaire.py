@@ -8,6 +8,9 @@ from dice import Dice
 from messageboard import Messageboard
 from game_state import GameState
 from player_queue import PlayerQueue
+from board import Board
+from renderer import Renderer
+import random_service
 import os
 
 def run_game():
@@ -16,6 +19,9 @@ def run_game():
     pygame.init()
     # 导入设置文件中对窗口的设置
     ai_settings = Settings()
+    # 所有随机数由同一个种子派生，打印出来以便复现这一局
+    service = random_service.seed(ai_settings.random_seed)
+    print(f"随机数种子: {service.entropy}")
     screen = pygame.display.set_mode(
             (ai_settings.screen_width, ai_settings.screen_height))
     
@@ -30,6 +36,8 @@ def run_game():
     location_points = []
     # 创建所有地点格子
     gf.create_all_locations(ai_settings, screen, locations, location_points)
+    # 预先绘制静态棋盘图层（地图、地点和连线在游戏过程中不会变化）
+    board = Board(ai_settings, screen, locations, location_points)
     
     # 创建游戏玩家游戏回合顺序队列
     player_que = PlayerQueue()
@@ -42,6 +50,10 @@ def run_game():
     
     # 绘制骰子初始状态
     dice.draw_dice(dice.cur_dice)
+
+    # 脏矩形渲染器，只把发生变化的区域推送到显示器
+    renderer = Renderer(ai_settings)
+    gf.register_screen_regions(ai_settings, renderer, messageboard, dice)
     
     # 游戏当前的状态
     gs = GameState(ai_settings)
@@ -57,15 +69,22 @@ def run_game():
             # run_specific_mini_game 会在内部处理自己的事件循环和屏幕更新，
             # 并在结束后改变 gs.game_state
         else:
+            # 没有待处理的事件和动画时阻塞等待，空闲时几乎不占用CPU
+            gf.wait_for_events(ai_settings, gs, dice)
             # 正常游戏流程的事件处理
             gf.check_events(ai_settings, gs, play_button, locations, messageboard, dice, player_que, screen)
+            # 轮到机器人时替它操作
+            gf.update_bot(ai_settings, gs, play_button, locations, messageboard, dice, player_que, screen)
+            # 推进掷骰子动画，骰子停下后移动玩家
+            gf.update_dice(ai_settings, gs, locations, dice, player_que)
 
         # 2. 屏幕更新 (只有在非小游戏活动状态下，主游戏才更新屏幕)
         if gs.game_state != ai_settings.MINI_GAME_ACTIVE:
-            gf.update_screen(ai_settings, screen, gs, play_button, locations,
-                             location_points,
-                             messageboard, dice, player_que)
+            gf.update_screen(ai_settings, screen, gs, play_button, board,
+                             messageboard, dice, player_que, renderer)
 
-        game_clock.tick(30) # 例如，每秒30帧
+        game_clock.tick(ai_settings.fps) # 有事件或动画时最多每秒30帧
 
-run_game()
+# MCTS 机器人使用进程池，子进程导入本模块时不能再启动游戏
+if __name__ == "__main__":
+    run_game()
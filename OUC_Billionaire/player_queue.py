@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from rules import next_player_index
+
+
 class PlayerQueue():
     """玩家队列类，用于管理玩家的轮流游戏"""
     def __init__(self):
@@ -29,13 +32,9 @@ class PlayerQueue():
     
     def next_round(self):
         """实现游戏中玩家回合的更替"""
-        # 获得下一轮游戏的玩家的下标
-        self.cur_player_index = (self.cur_player_index + 1) % self.size
+        # 获得下一轮游戏的玩家的下标，规则见 rules.next_player_index
+        self.cur_player_index, self.round_completed = next_player_index(self.cur_player_index, self.size)
         self.cur_player = self.queue[self.cur_player_index]
-        if self.cur_player_index == 0:
-            self.round_completed = True
-        else:
-            self.round_completed = False
 
     def is_round_completed(self):
         """检查当前轮次是否完成"""
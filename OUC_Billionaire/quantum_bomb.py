@@ -1,15 +1,18 @@
 import numpy as np
-import random
 import pygame
 import math
 from player import Player, Qubit
+from fonts import FONT_PATH, get_font, render_text
+from scene import push_scene, pop_scene, present_scene, get_events
+from bomb_simulator import ROTATION_CARDS, STANDARD_MEASURE_COST, PM_MEASURE_COST, STRATEGY_COST, BOMB_PROBABILITY, zeno_prediction
+from random_service import stream, ORACLES
 
 class QuantumBombGame:
     def __init__(self, screen, player):
         self.screen = screen
         self.player = player
-        self.font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
-        self.small_font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 18)
+        self.font = get_font(FONT_PATH, 24)
+        self.small_font = get_font(FONT_PATH, 18)
         
         # 颜色
         self.colors = {
@@ -22,9 +25,9 @@ class QuantumBombGame:
         self.phase = 'select'  # select, operate, judge, result
         self.selected_idx = None
         self.qubit = None
-        self.has_bomb = random.choice([True, False])
+        self.has_bomb = stream(ORACLES).bernoulli(BOMB_PROBABILITY)
         self.operations = []
-        self.rotation_cards = 15
+        self.rotation_cards = ROTATION_CARDS
         self.exploded = False
         self.judgment = None
         self.angle_input = ""
@@ -70,8 +73,8 @@ class QuantumBombGame:
             self.show_tutorial = True
             self.tutorial_type = 'rules'
         elif self.get_rect(90, 20, 100, 25).collidepoint(pos):
-            if self.player.money >= 50:
-                self.player.money -= 50
+            if self.player.money >= STRATEGY_COST:
+                self.player.money -= STRATEGY_COST
                 self.show_tutorial = True
                 self.tutorial_type = 'strategy'
         
@@ -92,15 +95,15 @@ class QuantumBombGame:
             if buttons['rotate'].collidepoint(pos) and self.rotation_cards > 0:
                 self.inputting_angle = True
                 self.angle_input = ""
-            elif buttons['std_measure'].collidepoint(pos) and self.player.money >= 20:
-                self.player.money -= 20
+            elif buttons['std_measure'].collidepoint(pos) and self.player.money >= STANDARD_MEASURE_COST:
+                self.player.money -= STANDARD_MEASURE_COST
                 result = self.qubit.measure_standard()
                 self.operations.append(f"标准基测量 → {result}")
                 self.last_measured = True
                 self.display_state = f"|{result}>"
                 print(f"Debug: 标准基测量结果={result}, 量子态={self.qubit}")
-            elif buttons['pm_measure'].collidepoint(pos) and self.player.money >= 10:
-                self.player.money -= 10
+            elif buttons['pm_measure'].collidepoint(pos) and self.player.money >= PM_MEASURE_COST:
+                self.player.money -= PM_MEASURE_COST
                 result = self.qubit.measure_pm()
                 basis_result = "|+>" if result == 0 else "|->"
                 self.operations.append(f"±基测量 → {basis_result}")
@@ -182,7 +185,7 @@ class QuantumBombGame:
         color = color or (self.colors['gray'] if not enabled else self.colors['blue'])
         pygame.draw.rect(self.screen, color, rect)
         pygame.draw.rect(self.screen, self.colors['black'], rect, 2)
-        text_surf = self.font.render(text, True, self.colors['white'])
+        text_surf = render_text(self.font, text, self.colors['white'])
         text_rect = text_surf.get_rect(center=rect.center)
         self.screen.blit(text_surf, text_rect)
     
@@ -190,15 +193,15 @@ class QuantumBombGame:
         self.screen.fill(self.colors['white'])
         
         # 标题和信息
-        title = self.font.render("量子炸弹检测游戏", True, self.colors['black'])
+        title = render_text(self.font, "量子炸弹检测游戏", self.colors['black'])
         self.screen.blit(title, (20, 60))
         
-        info = self.small_font.render(f"积分: {self.player.money} | 旋转机会: {self.rotation_cards}", True, self.colors['black'])
+        info = render_text(self.small_font, f"积分: {self.player.money} | 旋转机会: {self.rotation_cards}", self.colors['black'])
         self.screen.blit(info, (400, 65))
         
         # 工具栏
         self.draw_button(self.get_rect(20, 20, 60, 25), "规则", self.colors['green'])
-        self.draw_button(self.get_rect(90, 20, 100, 25), "策略(-50分)", self.colors['orange'])
+        self.draw_button(self.get_rect(90, 20, 100, 25), f"策略(-{STRATEGY_COST}分)", self.colors['orange'])
         
         if self.phase == 'select':
             self.draw_select_phase()
@@ -213,7 +216,7 @@ class QuantumBombGame:
             self.draw_tutorial()
     
     def draw_select_phase(self):
-        prompt = self.font.render("选择一个量子比特进行检测:", True, self.colors['black'])
+        prompt = render_text(self.font, "选择一个量子比特进行检测:", self.colors['black'])
         self.screen.blit(prompt, (50, 150))
         
         for i, (qubit, rect) in enumerate(zip(self.player.qubits, self.get_qubit_rects())):
@@ -223,9 +226,9 @@ class QuantumBombGame:
             pygame.draw.rect(self.screen, color, rect)
             pygame.draw.rect(self.screen, self.colors['black'], rect, 2)
             
-            text1 = self.small_font.render(f"量子比特 #{i}", True, self.colors['white'])
-            text2 = self.small_font.render(f"测出 1 概率:", True, self.colors['white'])
-            text3 = self.small_font.render(f"{prob_1:.1%}", True, self.colors['white'])
+            text1 = render_text(self.small_font, f"量子比特 #{i}", self.colors['white'])
+            text2 = render_text(self.small_font, f"测出 1 概率:", self.colors['white'])
+            text3 = render_text(self.small_font, f"{prob_1:.1%}", self.colors['white'])
             
             # 垂直居中的文字布局
             y_start = rect.y + 10
@@ -237,14 +240,14 @@ class QuantumBombGame:
     
     def draw_operate_phase(self):
         state_text = f"当前状态: {self.display_state}"
-        state_surf = self.small_font.render(state_text, True, self.colors['black'])
+        state_surf = render_text(self.small_font, state_text, self.colors['black'])
         self.screen.blit(state_surf, (50, 290))
         
         # 操作按钮
         buttons = self.get_operation_buttons()
         self.draw_button(buttons['rotate'], f"旋转({self.rotation_cards})", enabled=self.rotation_cards > 0)
-        self.draw_button(buttons['std_measure'], "标准基(-20)", enabled=self.player.money >= 20)
-        self.draw_button(buttons['pm_measure'], "±基(-10)", enabled=self.player.money >= 10)
+        self.draw_button(buttons['std_measure'], f"标准基(-{STANDARD_MEASURE_COST})", enabled=self.player.money >= STANDARD_MEASURE_COST)
+        self.draw_button(buttons['pm_measure'], f"±基(-{PM_MEASURE_COST})", enabled=self.player.money >= PM_MEASURE_COST)
         self.draw_button(buttons['blackbox'], "黑箱检测", self.colors['red'])
         self.draw_button(buttons['judge'], "进行判断", enabled=len(self.operations) > 0)
         self.draw_button(buttons['reselect'], "重新选择", self.colors['gray'])
@@ -254,24 +257,24 @@ class QuantumBombGame:
             input_rect = pygame.Rect(50, 420, 200, 30)
             pygame.draw.rect(self.screen, self.colors['white'], input_rect)
             pygame.draw.rect(self.screen, self.colors['blue'], input_rect, 2)
-            angle_text = self.font.render(f"角度: {self.angle_input}°", True, self.colors['black'])
+            angle_text = render_text(self.font, f"角度: {self.angle_input}°", self.colors['black'])
             self.screen.blit(angle_text, (input_rect.x + 5, input_rect.y + 5))
         
         # 操作历史 - 调整位置
         if self.operations:
-            history_title = self.font.render("操作历史:", True, self.colors['black'])
+            history_title = render_text(self.font, "操作历史:", self.colors['black'])
             self.screen.blit(history_title, (50, 460))
             for i, op in enumerate(self.operations[-5:]):
-                op_text = self.small_font.render(f"{i+1}. {op}", True, self.colors['black'])
+                op_text = render_text(self.small_font, f"{i+1}. {op}", self.colors['black'])
                 self.screen.blit(op_text, (50, 485 + i * 20))
     
     def draw_judge_phase(self):
-        prompt = self.font.render("根据操作结果，判断是否有炸弹:", True, self.colors['black'])
+        prompt = render_text(self.font, "根据操作结果，判断是否有炸弹:", self.colors['black'])
         self.screen.blit(prompt, (200, 300))
         
         # 操作摘要
         summary = f"进行了 {len(self.operations)} 次操作"
-        summary_surf = self.small_font.render(summary, True, self.colors['black'])
+        summary_surf = render_text(self.small_font, summary, self.colors['black'])
         self.screen.blit(summary_surf, (200, 330))
         
         # 判断按钮
@@ -294,11 +297,11 @@ class QuantumBombGame:
                 color = self.colors['red']
                 message = f"你的判断: {'有炸弹' if self.judgment else '无炸弹'}\n实际状态: {'有炸弹' if self.has_bomb else '无炸弹'}\n 积分 - 2"
         
-        title_surf = self.font.render(result_text, True, color)
+        title_surf = render_text(self.font, result_text, color)
         self.screen.blit(title_surf, (300, 200))
         
         for i, line in enumerate(message.split('\n')):
-            line_surf = self.small_font.render(line, True, self.colors['black'])
+            line_surf = render_text(self.small_font, line, self.colors['black'])
             self.screen.blit(line_surf, (200, 250 + i * 25))
         
         self.draw_button(self.get_rect(360, 500, 80, 30), "确认", self.colors['blue'])
@@ -316,7 +319,7 @@ class QuantumBombGame:
         pygame.draw.rect(self.screen, self.colors['blue'], tutorial_rect, 3)
         
         title = "游戏规则" if self.tutorial_type == 'rules' else "策略指南"
-        title_surf = self.font.render(title, True, self.colors['blue'])
+        title_surf = render_text(self.font, title, self.colors['blue'])
         self.screen.blit(title_surf, (tutorial_rect.x + 20, tutorial_rect.y + 10))
         
         if self.tutorial_type == 'rules':
@@ -327,8 +330,8 @@ class QuantumBombGame:
                 "   • 无炸弹: 量子比特保持原状态通过",
                 "2. 操作说明:",
                 "   • 旋转: 绕Y轴旋转改变|0>和|1>的概率幅",
-                "   • 标准基测量: 强制坍缩到|0>或|1>(-20分)并得知测量结果",
-                "   • ±基测量: 在叠加基(|+>, |->)下测量(-10分)",
+                f"   • 标准基测量: 强制坍缩到|0>或|1>(-{STANDARD_MEASURE_COST}分)并得知测量结果",
+                f"   • ±基测量: 在叠加基(|+>, |->)下测量(-{PM_MEASURE_COST}分)",
                 "   • 黑箱检测: 炸弹检测, 有风险, 免费",
                 "3. 目标: 在不引爆炸弹前提下判断其存在性"
             ]
@@ -343,12 +346,14 @@ class QuantumBombGame:
                 "• 重复N=π/ε次,爆炸概率仅为O(ε)",
                 "• 哑弹: 最终旋转至|1>可检测到",
                 "• 真炸弹: 量子Zeno效应锁定在|0>态",
-                "• 数学证明: P(爆炸)≤N·sin²(ε/2)=O(ε)"
+                "• 数学证明: P(爆炸)≤N·sin²(ε/2)=O(ε)",
+                "• 有炸弹时不爆炸的概率: " + ", ".join(
+                    f"N={n} {zeno_prediction(n)['survival']:.0%}" for n in (5, 10, ROTATION_CARDS))
             ]
         
         for i, line in enumerate(content):
             if line:
-                line_surf = self.small_font.render(line, True, self.colors['black'])
+                line_surf = render_text(self.small_font, line, self.colors['black'])
                 self.screen.blit(line_surf, (tutorial_rect.x + 20, tutorial_rect.y + 50 + i * 25))
         
         self.draw_button(self.get_rect(400, 50, 80, 30), "关闭", self.colors['red'])
@@ -384,14 +389,9 @@ def play(screen, ai_settings, current_player):
     if not hasattr(current_player, 'money'):
         current_player.money = 100
     
-    # 保存原窗口信息
-    original_size = screen.get_size()
-    original_caption = pygame.display.get_caption()[0]
-    
     try:
-        # 创建独立的游戏窗口
-        game_screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("量子炸弹检测游戏")
+        # 在主窗口上进入小游戏场景，不重新创建显示窗口
+        game_screen = push_scene((800, 600), "量子炸弹检测游戏")
         
         # 创建游戏实例
         game = QuantumBombGame(game_screen, current_player)
@@ -399,7 +399,7 @@ def play(screen, ai_settings, current_player):
         
         running = True
         while running:
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == pygame.QUIT:
                     # 用户关闭游戏窗口时，返回默认结果
                     result = {"message": "游戏被关闭", "effect": 0}
@@ -409,7 +409,7 @@ def play(screen, ai_settings, current_player):
             
             if running:  # 只有在游戏还在运行时才绘制
                 game.draw()
-                pygame.display.flip()
+                present_scene()
                 clock.tick(60)
         
         # 获取游戏结果
@@ -420,9 +420,8 @@ def play(screen, ai_settings, current_player):
         result = {"message": "游戏异常退出", "effect": 0}
     
     finally:
-        # 恢复原窗口
-        pygame.display.set_mode(original_size)
-        pygame.display.set_caption(original_caption)
+        # 离开小游戏场景，回到主画面
+        pop_scene()
         
         # 清空事件队列，避免影响主程序
         pygame.event.clear()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""量子比特和玩家的量子比特寄存器，只依赖 NumPy，规则引擎和界面共用"""
+import numpy as np
+from random_service import stream, MEASUREMENT
+from qubit_states import (FLOAT_STATE, ZERO, ONE, PLUS, MINUS, STATE_AMPLITUDES, TRANSITIONS,
+                          TRANSITION_LISTS, intern_state, gate_name, gate_matrix)
+
+
+class QubitRegister():
+    """玩家的量子比特寄存器：所有振幅存放在一个连续的 (N, 2) 复数数组中，按列表方式访问得到 Qubit 视图"""
+    def __init__(self, qubits=None, capacity=8):
+        self._data = np.zeros((max(capacity, 1), 2), dtype=complex)
+        # 每一行的驻留态编号（见 qubit_states），FLOAT_STATE 表示只能用振幅表示
+        self._ids = np.full(max(capacity, 1), FLOAT_STATE, dtype=np.int8)
+        # 与数组每一行对应的 Qubit 视图对象
+        self._views = []
+        for qubit in qubits or []:
+            self.append(qubit)
+
+    def __len__(self):
+        return len(self._views)
+
+    def __getitem__(self, index):
+        # 支持整数索引和切片，切片返回 Qubit 视图列表
+        return self._views[index]
+
+    def __iter__(self):
+        # 迭代时返回快照，遍历过程中增删不会出错
+        return iter(list(self._views))
+
+    def __contains__(self, qubit):
+        return qubit in self._views
+
+    def __repr__(self):
+        return f"QubitRegister({[str(qubit) for qubit in self._views]})"
+
+    @property
+    def states(self):
+        """所有量子比特的振幅，(N, 2) 数组视图"""
+        return self._data[:len(self._views)]
+
+    @property
+    def state_ids(self):
+        """所有量子比特的驻留态编号，(N,) 数组视图"""
+        return self._ids[:len(self._views)]
+
+    def _index(self, index):
+        """把负数索引换算成行号，越界时抛出 IndexError"""
+        n = len(self._views)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("量子比特索引越界")
+        return index
+
+    def _rows(self, indices):
+        """把索引参数换算成行号数组，None 表示全部量子比特"""
+        if indices is None:
+            return slice(0, len(self._views))
+        return np.asarray(indices, dtype=int)
+
+    def append(self, qubit=None):
+        """添加一个量子比特，数组容量不足时成倍扩容；已属于其他寄存器的量子比特会被复制"""
+        if qubit is None:
+            qubit = Qubit()
+        elif qubit._register is not None:
+            qubit = qubit.copy()
+        n = len(self._views)
+        if n == len(self._data):
+            data = np.zeros((2 * len(self._data), 2), dtype=complex)
+            data[:n] = self._data[:n]
+            self._data = data
+            ids = np.full(2 * len(self._ids), FLOAT_STATE, dtype=np.int8)
+            ids[:n] = self._ids[:n]
+            self._ids = ids
+        self._data[n] = qubit._state[0]
+        self._ids[n] = qubit._id
+        qubit._attach(self, n)
+        self._views.append(qubit)
+        return qubit
+
+    def pop(self, index=-1):
+        """移除并返回一个量子比特，保持其余量子比特的顺序"""
+        index = self._index(index)
+        n = len(self._views)
+        qubit = self._views.pop(index)
+        qubit._detach()
+        self._data[index:n - 1] = self._data[index + 1:n]
+        self._ids[index:n - 1] = self._ids[index + 1:n]
+        for i in range(index, n - 1):
+            self._views[i]._index = i
+        return qubit
+
+    def swap_remove(self, index):
+        """O(1) 移除一个量子比特：最后一个量子比特移到被删除的位置"""
+        index = self._index(index)
+        last = len(self._views) - 1
+        qubit = self._views[index]
+        qubit._detach()
+        if index != last:
+            self._data[index] = self._data[last]
+            self._ids[index] = self._ids[last]
+            moved = self._views[last]
+            moved._index = index
+            self._views[index] = moved
+        self._views.pop()
+        return qubit
+
+    def copy(self):
+        """复制整个寄存器，新寄存器中的量子比特与原来的互不影响"""
+        return QubitRegister(self._views, capacity=len(self._data))
+
+    def remove(self, qubit):
+        """移除指定的量子比特"""
+        self.pop(self._views.index(qubit))
+
+    def clear(self):
+        """移除全部量子比特"""
+        for qubit in self._views:
+            qubit._detach()
+        self._views = []
+
+    def apply_gate(self, gate, indices=None):
+        """
+        对指定的量子比特（默认全部）批量作用同一个门，驻留态直接查转移表
+        gate 为门名或矩阵，X、Z、H 按门名或门对象的矩阵识别（见 qubit_states.gate_name）
+        """
+        rows = self._rows(indices)
+        name = gate_name(gate)
+        matrix = np.asarray(gate_matrix(gate))
+        if name is None:
+            # 表外的门：全部按浮点振幅计算
+            self._data[rows] = self._data[rows] @ matrix.T
+            self._ids[rows] = FLOAT_STATE
+            self.normalize(indices)
+            return
+        ids = self._ids[rows]
+        interned = ids >= 0
+        new_ids = np.where(interned, TRANSITIONS[name][ids], FLOAT_STATE).astype(np.int8)
+        states = self._data[rows]
+        states[interned] = STATE_AMPLITUDES[new_ids[interned]]
+        if not interned.all():
+            floating = states[~interned] @ matrix.T
+            states[~interned] = floating / np.sqrt((np.abs(floating) ** 2).sum(axis=1))[:, None]
+        self._data[rows] = states
+        self._ids[rows] = new_ids
+
+    def normalize(self, indices=None):
+        """批量标准化(|α|² + |β|² = 1)，驻留态本来就是归一化的，保持不变"""
+        rows = self._rows(indices)
+        states = self._data[rows]
+        norms = np.sqrt((np.abs(states) ** 2).sum(axis=1))
+        if np.any(norms == 0):
+            raise ValueError("Zero-norm state vector")
+        norms[self._ids[rows] >= 0] = 1
+        self._data[rows] = states / norms[:, None]
+
+    def probabilities(self, indices=None):
+        """每个量子比特测得 |1> 的概率"""
+        return np.abs(self._data[self._rows(indices), 1]) ** 2
+
+    def collapse(self, indices, outcomes):
+        """把指定的量子比特坍缩到测量结果对应的经典态"""
+        rows = self._rows(indices)
+        outcomes = np.asarray(outcomes, dtype=bool)
+        self._data[rows] = np.where(outcomes[:, None], [0, 1], [1, 0])
+        self._ids[rows] = np.where(outcomes, ONE, ZERO)
+
+    def measure(self, indices=None, rng=None):
+        """|0>, |1>为基批量测量，返回 0/1 结果数组，测量后量子比特坍缩；rng 默认为全局的测量随机数流"""
+        prob_1 = self.probabilities(indices)
+        outcomes = (rng or stream(MEASUREMENT)).random(len(prob_1)) < prob_1
+        self.collapse(indices, outcomes)
+        return outcomes.astype(int)
+
+
+class Qubit:
+    """|0>,|1>为基底"""
+    def __init__(self, alpha=None, beta=None):
+        """
+        初始化为 α|0> + β|1>
+        """
+        # 不属于任何寄存器时振幅和驻留态编号存放在自己身上，否则由寄存器中的某一行保存
+        self._state = np.array([[1, 0]], dtype=complex)
+        self._id = ZERO
+        self._register = None
+        self._index = 0
+        if alpha is not None or beta is not None:
+            self.alpha = complex(alpha)
+            self.beta = complex(beta)
+            self._normalize()
+            # 商店出售的量子态能在表中找到，随机生成的量子态仍用浮点振幅表示
+            self._set_state_id(intern_state(self._amps))
+
+    def _attach(self, register, index):
+        """加入寄存器，之后振幅由寄存器保存"""
+        self._register = register
+        self._index = index
+
+    def _detach(self):
+        """离开寄存器，把当前振幅复制回自己的数组"""
+        if self._register is not None:
+            self._state[0] = self._register._data[self._index]
+            self._id = int(self._register._ids[self._index])
+            self._register = None
+            self._index = 0
+
+    @property
+    def _amps(self):
+        """长度为 2 的振幅数组视图"""
+        if self._register is None:
+            return self._state[0]
+        return self._register._data[self._index]
+
+    @property
+    def _state_id(self):
+        """驻留态编号，FLOAT_STATE 表示只能用振幅表示"""
+        if self._register is None:
+            return self._id
+        return int(self._register._ids[self._index])
+
+    def _set_state_id(self, state_id):
+        """设置驻留态编号，在表中时同时写入对应的振幅"""
+        if self._register is None:
+            self._id = state_id
+        else:
+            self._register._ids[self._index] = state_id
+        if state_id != FLOAT_STATE:
+            self._amps[:] = STATE_AMPLITUDES[state_id]
+
+    @property
+    def alpha(self):
+        return complex(self._amps[0])
+
+    @alpha.setter
+    def alpha(self, value):
+        self._amps[0] = value
+        self._set_state_id(FLOAT_STATE)
+
+    @property
+    def beta(self):
+        return complex(self._amps[1])
+
+    @beta.setter
+    def beta(self, value):
+        self._amps[1] = value
+        self._set_state_id(FLOAT_STATE)
+    
+    def _normalize(self):
+        """标准化(|α|² + |β|² = 1)"""
+        amps = self._amps
+        norm = np.sqrt((np.abs(amps) ** 2).sum())
+        if norm == 0:
+            raise ValueError("Zero-norm state vector")
+        amps /= norm
+    
+    def copy(self):
+        return Qubit(self.alpha, self.beta)
+    
+    def measure(self, rng=None):
+        """
+        |0>, |1>为基测量，rng 默认为全局的测量随机数流
+        返回:
+            元组: (0/1结果, 积分变化)
+        """
+        prob_0 = abs(self.alpha)**2
+        outcome = 0 if (rng or stream(MEASUREMENT)).random() < prob_0 else 1
+        score_change = -1 if outcome == 0 else 1
+        
+        # qubit坍缩到经典态
+        self._set_state_id(ZERO if outcome == 0 else ONE)
+            
+        return outcome, score_change
+
+    def apply_gate(self, gate):
+        """作用一个门，gate 为门名或矩阵（同 QubitRegister.apply_gate）"""
+        name = gate_name(gate)
+        state_id = self._state_id
+        if name is not None and state_id != FLOAT_STATE:
+            # 驻留态直接查转移表
+            self._set_state_id(TRANSITION_LISTS[name][state_id])
+            return
+        amps = self._amps
+        amps[:] = np.asarray(gate_matrix(gate)) @ amps
+        self._set_state_id(FLOAT_STATE)
+        self._normalize()
+    
+    def __str__(self):
+        return f"{self.alpha}|0> + {self.beta}|1>"
+    
+    # 以下是和量子炸弹游戏相关的属性
+    def apply_rotation(self, angle):
+        cos_half = np.cos(angle/2)
+        sin_half = np.sin(angle/2)
+        gate = np.array([[cos_half, -sin_half], [sin_half, cos_half]])
+        state = np.array([self.alpha, self.beta])
+        self._amps[:] = gate @ state
+        self._set_state_id(FLOAT_STATE)
+        self._normalize()
+    
+    def measure_standard(self):
+        """标准基测量"""
+        prob_0 = abs(self.alpha)**2
+        result = 0 if stream(MEASUREMENT).random() < prob_0 else 1
+        self._set_state_id(ZERO if result == 0 else ONE)
+        return result
+    
+    def measure_pm(self):
+        """±基测量"""
+        plus_amp = (self.alpha + self.beta) / np.sqrt(2)
+        prob_plus = abs(plus_amp)**2
+        result = 0 if stream(MEASUREMENT).random() < prob_plus else 1
+        self._set_state_id(PLUS if result == 0 else MINUS)  # |+> 或 |->
+        return result
+    
+    def blackbox_test(self, has_bomb):
+        if not has_bomb:
+            # 没有炸弹：量子比特保持原状态通过
+            return False
+        else:
+            # 有炸弹：炸弹对量子比特进行标准基测量
+            prob_0 = abs(self.alpha)**2
+            result = 0 if stream(MEASUREMENT).random() < prob_0 else 1
+            
+            # 量子比特状态坍缩
+            if result == 0:
+                self._set_state_id(ZERO)  # 坍缩到|0>
+                return False
+            else:
+                self._set_state_id(ONE)  # 坍缩到|1>
+                return True
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+驻留量子态表：商店出售的 X、Z、H 门作用在 |0>、|1>、|+> 上只能得到有限个量子态
+这些态用一个小整数编号表示，作用门变成查转移表；其他来源的量子态仍用浮点振幅表示
+编号是振幅数组之外附加的缓存（每个量子比特多 1 字节），只用来加速作用门，不节省内存
+"""
+import numpy as np
+from gate import X_MATRIX, Z_MATRIX, H_MATRIX
+
+# 不在表中的量子态的编号
+FLOAT_STATE = -1
+
+# 商店出售的量子比特的初始态
+_SEEDS = ((1, 0), (0, 1), (1 / np.sqrt(2), 1 / np.sqrt(2)))
+GATE_MATRICES = {"X": X_MATRIX, "Z": Z_MATRIX, "H": H_MATRIX}
+# 按矩阵对象识别门（门对象共用 gate 模块中的矩阵），不做数值比较
+_NAMES_BY_MATRIX = {id(matrix): name for name, matrix in GATE_MATRICES.items()}
+
+
+def _key(amplitudes):
+    """振幅取整后作为字典的键（+0.0 消除 -0.0）"""
+    amplitudes = np.round(np.asarray(amplitudes, dtype=complex), 9)
+    return tuple(float(x) + 0.0 for x in (amplitudes.real[0], amplitudes.imag[0],
+                                          amplitudes.real[1], amplitudes.imag[1]))
+
+
+def _build_table():
+    """从初始态出发反复作用 X、Z、H，直到不再出现新的量子态"""
+    states = []
+    index = {}
+    queue = [np.array(seed, dtype=complex) for seed in _SEEDS]
+    while queue:
+        state = queue.pop(0)
+        key = _key(state)
+        if key in index:
+            continue
+        index[key] = len(states)
+        states.append(state)
+        for matrix in GATE_MATRICES.values():
+            queue.append(matrix @ state)
+    amplitudes = np.array(states)
+    transitions = {}
+    for name, matrix in GATE_MATRICES.items():
+        transitions[name] = np.array([index[_key(matrix @ state)] for state in states], dtype=np.int8)
+    return amplitudes, transitions, index
+
+
+# 每个编号对应的振幅 (K, 2)、每个门的转移表 {门名: (K,) 编号数组} 和振幅到编号的查找表
+STATE_AMPLITUDES, TRANSITIONS, _INDEX = _build_table()
+# 每个驻留态测得 |1> 的概率
+STATE_PROB_ONE = np.abs(STATE_AMPLITUDES[:, 1]) ** 2
+# 单个量子比特查表用的 Python 版本，避免 NumPy 标量索引的开销
+TRANSITION_LISTS = {name: table.tolist() for name, table in TRANSITIONS.items()}
+
+ZERO = _INDEX[_key((1, 0))]
+ONE = _INDEX[_key((0, 1))]
+PLUS = _INDEX[_key((1 / np.sqrt(2), 1 / np.sqrt(2)))]
+MINUS = _INDEX[_key((1 / np.sqrt(2), -1 / np.sqrt(2)))]
+
+
+def intern_state(amplitudes):
+    """返回与振幅相同的驻留态编号，不在表中时返回 FLOAT_STATE"""
+    return _INDEX.get(_key(amplitudes), FLOAT_STATE)
+
+
+def gate_name(gate):
+    """
+    识别 X、Z、H 门，返回门名，其他门返回 None
+    gate 可以是门名 "X"/"Z"/"H"、GATE_MATRICES 中的矩阵对象（门对象的 matrix）或其他矩阵；
+    只按对象识别，数值相同但另外创建的矩阵按普通矩阵处理
+    """
+    if isinstance(gate, str):
+        return gate if gate in GATE_MATRICES else None
+    return _NAMES_BY_MATRIX.get(id(gate))
+
+
+def gate_matrix(gate):
+    """门名换成矩阵，矩阵原样返回"""
+    return GATE_MATRICES[gate] if isinstance(gate, str) else gate
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+随机数服务：每个子系统（骰子、地点事件、量子测量、Oracle/炸弹、机器人）各用一条独立的 numpy.random.Generator，
+都由同一个 SeedSequence 派生。给定种子后整局游戏可以复现，而且子系统之间互不影响
+（例如多测量一次不会改变之后的骰子点数）
+单个随机数从预先生成的随机数块中取，用完再整块生成，避免每次调用 Generator 的开销
+"""
+import numpy as np
+
+# 子系统的名称
+DICE = "dice"
+EVENTS = "events"
+MEASUREMENT = "measurement"
+ORACLES = "oracles"
+POLICIES = "policies"  # 机器人玩家的决策
+# 新的子系统加在最后，已有子系统派生出的随机数不变
+STREAMS = (DICE, EVENTS, MEASUREMENT, ORACLES, POLICIES)
+
+# 每次预先生成的随机数个数
+BLOCK_SIZE = 4096
+
+
+class RandomStream():
+    """
+    一个子系统的随机数流
+    random、integers 传入 size 时直接由 Generator 批量生成数组；不传时从随机数块中取一个 Python 数
+    另外提供与 random 模块同名的 randint、randrange、uniform、choice，可以直接替换原来的调用
+    """
+    def __init__(self, generator, block_size=BLOCK_SIZE):
+        self.generator = generator
+        self.block_size = block_size
+        self._floats = []
+        self._ints = {}  # {(low, high): 随机整数块}
+
+    def random(self, size=None):
+        """[0, 1) 上的均匀随机数"""
+        if size is not None:
+            return self.generator.random(size)
+        if not self._floats:
+            self._floats = self.generator.random(self.block_size).tolist()
+        return self._floats.pop()
+
+    def integers(self, low, high, size=None):
+        """[low, high) 上的随机整数，每个取值范围单独预先生成"""
+        if size is not None:
+            return self.generator.integers(low, high, size)
+        block = self._ints.get((low, high))
+        if not block:
+            block = self._ints[(low, high)] = self.generator.integers(low, high, self.block_size).tolist()
+        return block.pop()
+
+    def bernoulli(self, p, size=None):
+        """以概率 p 为 True"""
+        return self.random(size) < p
+
+    def randint(self, a, b):
+        """[a, b] 上的随机整数"""
+        return self.integers(a, b + 1)
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        return self.integers(start, stop)
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[self.integers(0, len(seq))]
+
+    def sample(self, population, k):
+        """不放回地取 k 个元素"""
+        return [population[i] for i in self.generator.choice(len(population), k, replace=False)]
+
+
+class RandomService():
+    """由一个种子派生出所有子系统的随机数流，seed 为 None 时使用系统熵"""
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.block_size = block_size
+        self.streams = {}
+
+    @property
+    def entropy(self):
+        """实际使用的种子，用它可以复现没有指定种子的一局"""
+        return self.seed_sequence.entropy
+
+    def __getitem__(self, name):
+        random_stream = self.streams.get(name)
+        if random_stream is None:
+            # 与 seed_sequence.spawn 得到的第 i 个子种子相同，只在第一次使用时创建
+            child = np.random.SeedSequence(self.seed_sequence.entropy,
+                                           spawn_key=self.seed_sequence.spawn_key + (STREAMS.index(name),),
+                                           pool_size=self.seed_sequence.pool_size)
+            generator = np.random.default_rng(child)
+            random_stream = self.streams[name] = RandomStream(generator, self.block_size)
+        return random_stream
+
+
+# 游戏界面共用的随机数服务
+_service = RandomService()
+
+
+def seed(value=None):
+    """重新设定全局随机数服务的种子，返回新的服务"""
+    global _service
+    _service = RandomService(value)
+    return _service
+
+
+def stream(name):
+    """全局随机数服务中某个子系统的随机数流（每次使用时获取，重新设定种子后才能生效）"""
+    return _service[name]
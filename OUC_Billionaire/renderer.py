@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import pygame
+
+
+class DirtyRegion():
+    """屏幕上一块可以单独刷新的矩形区域"""
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        # 区域内容的签名，签名变化说明区域需要重新推送到显示器
+        self.signature = None
+        self.dirty = True
+
+    def update(self, signature):
+        """记录区域的最新签名，内容变化时标记为脏"""
+        if signature != self.signature:
+            self.signature = signature
+            self.dirty = True
+
+
+class Renderer():
+    """脏矩形渲染器：只把内容发生变化的区域推送到显示器"""
+    def __init__(self, ai_settings):
+        self.ai_settings = ai_settings
+        # 关闭时退回到每帧整屏 flip
+        self.enabled = ai_settings.dirty_rect_rendering
+        self.regions = {}
+        # 当前画面（场景）标识，场景切换时需要整屏刷新
+        self.scene = None
+        self.full_redraw = True
+
+    def add_region(self, name, rect):
+        """注册一个需要跟踪的区域"""
+        self.regions[name] = DirtyRegion(rect)
+
+    def set_scene(self, scene):
+        """设置当前画面，画面切换时整屏刷新一次"""
+        if scene != self.scene:
+            self.scene = scene
+            self.full_redraw = True
+
+    def mark(self, name, signature):
+        """更新某个区域的内容签名"""
+        self.regions[name].update(signature)
+
+    def invalidate(self):
+        """要求下一次推送整屏刷新"""
+        self.full_redraw = True
+
+    def present(self):
+        """把本帧的变化推送到显示器"""
+        if not self.enabled or self.full_redraw:
+            pygame.display.flip()
+        else:
+            dirty_rects = [region.rect for region in self.regions.values()
+                           if region.dirty]
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+        for region in self.regions.values():
+            region.dirty = False
+        self.full_redraw = False
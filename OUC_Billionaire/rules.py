@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+无界面的规则引擎：不导入 pygame，一回合按数据依次结算 掷骰子 → 移动 → 地点事件 → 奖励 → 下一位玩家
+pygame 界面（Player、PlayerQueue、Location）只是调用这里的规则
+"""
+import math
+
+from qubit import Qubit, QubitRegister
+from scoring import score_players
+from random_service import RandomService, stream, DICE, EVENTS, MEASUREMENT
+
+# 地点事件，与 Location.trigger_event 的返回值一致
+EVENT_MINI_GAME = "TRIGGER_MINI_GAME"
+EVENT_SHOP = "TRIGGER_SHOP"
+EVENT_QUBIT = "GET_RANDOM_QUBIT"
+EVENT_ITEM = "GET_RANDOM_ITEM"
+
+DICE_FACES = 6
+# 一局只用到几十个随机数，引擎中的随机数块取小一些
+RULES_BLOCK_SIZE = 64
+
+# 特殊地点（与 location.py 中各地点类的设定一致）
+SHOP_LOCATIONS = ("二校门",)
+QUBIT_LOCATIONS = ("大礼堂",)
+ITEM_POOLS = {"工字厅": ["抢夺卡"]}
+
+# 商店的商品和价格
+SHOP_PRICES = {
+    "X门": 200,
+    "Z门": 200,
+    "H门": 200,
+    "测量卡": 250,
+    "抢夺卡": 250,
+    "正向量子位": 520,
+    "负向量子位": 520,
+    "量子位0": 320,
+    "量子位1": 320,
+}
+SHOP_GATES = {"X门": "X", "Z门": "Z", "H门": "H"}
+SHOP_ITEMS = {"测量卡": "不限回合测量卡", "抢夺卡": "抢夺卡"}
+SHOP_QUBITS = {
+    "量子位0": (1, 0),
+    "量子位1": (0, 1),
+    "正向量子位": (1, 1),
+    "负向量子位": (1, -1),
+}
+
+
+def move_position(pos, step, board_size):
+    """沿环形地图前进 step 格后的位置"""
+    return (pos + step) % board_size
+
+
+def next_player_index(index, count):
+    """轮到下一位玩家，返回 (下标, 是否完成了一轮)"""
+    index = (index + 1) % count
+    return index, index == 0
+
+
+def tile_event(mini_game_id=None, is_shop=False, gives_qubit=False, gives_item=False):
+    """地点触发的事件，普通地点返回 None"""
+    if mini_game_id:
+        return EVENT_MINI_GAME
+    if is_shop:
+        return EVENT_SHOP
+    if gives_qubit:
+        return EVENT_QUBIT
+    if gives_item:
+        return EVENT_ITEM
+    return None
+
+
+def random_qubit_amplitudes(rng=None):
+    """随机实振幅的量子比特 (cos θ, sin θ)，rng 默认为全局的地点事件随机数流"""
+    angle = (rng or stream(EVENTS)).uniform(0, 2 * math.pi)
+    return math.cos(angle), math.sin(angle)
+
+
+def read_board(path):
+    """从地点文件中读取每个地点的 [x, y, 名称, 小游戏ID]"""
+    data = []
+    with open(path, encoding='utf-8') as file_data:
+        for line in file_data:
+            line = line.rstrip()
+            parts = line.split(' ')
+            x, y, name = parts[0], parts[1], parts[2]
+            mini_game_id = parts[3] if len(parts) > 3 and parts[3].lower() != 'none' else None
+            data.append([x, y, name, mini_game_id])
+    return data
+
+
+class Tile():
+    """地图上的一个地点，只保存规则需要的数据"""
+    def __init__(self, name, mini_game_id=None):
+        self.name = name
+        self.mini_game_id = mini_game_id
+        self.is_shop = name in SHOP_LOCATIONS
+        self.gives_qubit = name in QUBIT_LOCATIONS
+        self.item_pool = ITEM_POOLS.get(name, [])
+        self.event = tile_event(mini_game_id, self.is_shop, self.gives_qubit, bool(self.item_pool))
+
+
+def build_board(data):
+    """由 read_board 的结果创建地点列表"""
+    return [Tile(name, mini_game_id) for _, _, name, mini_game_id in data]
+
+
+class PlayerState():
+    """规则引擎中的玩家，属性名与 Player 一致，计分等函数可以通用"""
+    def __init__(self, name, money=1000, player_id=0):
+        self.player_name = name
+        self.player_id = player_id
+        self.money = money
+        self.pos = 0
+        self.score = 0
+        self.items = []  # 道具名称
+        self.gates = []  # 门的名称 "X"/"Z"/"H"
+        self.qubits = QubitRegister()
+
+    @classmethod
+    def from_player(cls, player):
+        """复制界面中的 Player（道具和门换成名称）"""
+        state = cls(player.player_name, player.money, player.player_id)
+        state.pos = player.pos
+        state.score = player.score
+        state.items = [getattr(item, "name", item) for item in player.items]
+        state.gates = [getattr(gate, "name", gate) for gate in player.gates]
+        state.qubits = player.qubits.copy()
+        return state
+
+    def copy(self):
+        return PlayerState.from_player(self)
+
+
+def no_mini_game_reward(rules, player, mini_game_id):
+    """默认的小游戏结果：没有任何收益"""
+    return None
+
+
+def buy_nothing(rules, player):
+    """默认的商店决策：什么都不买"""
+    return []
+
+
+class GameRules():
+    """一局游戏的规则引擎"""
+    def __init__(self, board, players, max_rounds=8, seed=None, shop_prices=None,
+                 mini_game_policy=None, shop_policy=None, policies=None):
+        """
+        参数:
+            board: Tile 列表
+            players: PlayerState 列表
+            mini_game_policy: (rules, player, mini_game_id) -> {"money": 金钱变化, "score": 积分变化} 或 None
+            shop_policy: (rules, player) -> 要购买的商品名称列表
+            policies: 与 players 对应的决策者列表（见 bots.Policy），None 表示该座位不做背包和商店决策
+        """
+        self.board = board
+        self.players = players
+        self.max_rounds = max_rounds
+        # 每局独立的随机数服务：骰子、地点事件（含小游戏结果）和测量各用一条流
+        self.random = RandomService(seed, block_size=RULES_BLOCK_SIZE)
+        self.rng = self.random[EVENTS]
+        self.shop_prices = dict(SHOP_PRICES if shop_prices is None else shop_prices)
+        self.mini_game_policy = mini_game_policy or no_mini_game_reward
+        self.shop_policy = shop_policy or buy_nothing
+        self.policies = list(policies) if policies is not None else [None] * len(players)
+        self.cur_player_index = 0
+        self.current_round = 1
+        self.turns = 0
+        self.final_scores = None
+
+    @classmethod
+    def from_settings(cls, ai_settings, player_names, **kwargs):
+        """按游戏设置（地图文件、轮数、初始金钱）创建引擎"""
+        board = build_board(read_board(ai_settings.locations_data_path))
+        players = [PlayerState(name, ai_settings.player_init_money, i + 1)
+                   for i, name in enumerate(player_names)]
+        return cls(board, players, max_rounds=ai_settings.max_rounds, **kwargs)
+
+    def copy(self, seed=None, policies=None):
+        """复制当前局面（地图共用，玩家独立），用新的随机种子继续；policies 为空时沿用原来的决策者"""
+        rules = GameRules(self.board, [player.copy() for player in self.players], self.max_rounds, seed,
+                          self.shop_prices, self.mini_game_policy, self.shop_policy,
+                          self.policies if policies is None else policies)
+        rules.cur_player_index = self.cur_player_index
+        rules.current_round = self.current_round
+        rules.turns = self.turns
+        return rules
+
+    @property
+    def cur_player(self):
+        return self.players[self.cur_player_index]
+
+    def is_game_over(self):
+        """检查游戏是否应该结束"""
+        return self.current_round > self.max_rounds
+
+    def roll_dice(self):
+        return self.random[DICE].integers(1, DICE_FACES + 1)
+
+    def play_turn(self, step=None):
+        """结算当前玩家的一回合，返回本回合发生的事情"""
+        player = self.cur_player
+        if step is None:
+            step = self.roll_dice()
+        start = player.pos
+        player.pos = move_position(player.pos, step, len(self.board))
+        tile = self.board[player.pos]
+        # 与界面一致：移动后先在背包中使用门和道具，再结算地点事件
+        policy = self.policies[self.cur_player_index]
+        if policy is not None:
+            policy.observe(self)
+            self.use_inventory(player, policy)
+        reward = self.resolve_event(player, tile)
+        turn = {
+            "player": player,
+            "roll": step,
+            "from": start,
+            "to": player.pos,
+            "location": tile.name,
+            "event": tile.event,
+            "reward": reward,
+        }
+        self.end_turn()
+        return turn
+
+    def resolve_event(self, player, tile):
+        """结算地点事件并发放奖励，返回奖励内容"""
+        if tile.event == EVENT_MINI_GAME:
+            effect = self.mini_game_policy(self, player, tile.mini_game_id) or {}
+            player.money += effect.get("money", 0)
+            player.score += effect.get("score", 0)
+            for amplitudes in effect.get("qubits", ()):
+                player.qubits.append(Qubit(*amplitudes))
+            return effect
+        if tile.event == EVENT_SHOP:
+            policy = self.policies[self.players.index(player)]
+            if policy is not None:
+                wanted = policy.choose_purchases(player, self.shop_prices)
+            else:
+                wanted = self.shop_policy(self, player)
+            return [name for name in wanted if self.buy(player, name)]
+        if tile.event == EVENT_QUBIT:
+            return player.qubits.append(Qubit(*random_qubit_amplitudes(self.rng)))
+        if tile.event == EVENT_ITEM:
+            item = self.rng.choice(tile.item_pool)
+            player.items.append(item)
+            return item
+        return None
+
+    def use_inventory(self, player, policy):
+        """按决策者的选择使用门和测量卡"""
+        self.apply_inventory(player, policy.choose_gates(player))
+        # 测量在使用门之后决定，这时看到的是作用门后的量子态
+        self.apply_inventory(player, [], policy.choose_measurement(player))
+
+    def apply_inventory(self, player, gates, index=None):
+        """按顺序使用门 [(门名, 量子比特下标), ...]，index 不为空时再用测量卡测量该量子比特"""
+        for gate, qubit_index in gates:
+            player.qubits.apply_gate(gate, [qubit_index])
+            player.gates.remove(gate)
+        if index is not None and SHOP_ITEMS["测量卡"] in player.items:
+            # 与 UnlimitedMeasurementCard 一致：测得 |1> 加 1 分，|0> 减 1 分，测量后移除该量子比特
+            _, score_change = player.qubits[index].measure(self.random[MEASUREMENT])
+            player.score += score_change
+            player.qubits.pop(index)
+            player.items.remove(SHOP_ITEMS["测量卡"])
+
+    def buy(self, player, name):
+        """购买一件商品，金钱不足时返回 False"""
+        price = self.shop_prices[name]
+        if player.money < price:
+            return False
+        player.money -= price
+        if name in SHOP_GATES:
+            player.gates.append(SHOP_GATES[name])
+        elif name in SHOP_ITEMS:
+            player.items.append(SHOP_ITEMS[name])
+        else:
+            player.qubits.append(Qubit(*SHOP_QUBITS[name]))
+        return True
+
+    def end_turn(self):
+        """轮到下一位玩家，所有玩家都走过一次后进入下一轮"""
+        self.turns += 1
+        self.cur_player_index, round_completed = next_player_index(self.cur_player_index, len(self.players))
+        if round_completed:
+            self.current_round += 1
+
+    def finish(self):
+        """游戏结束时测量全部量子比特计分，只计一次"""
+        if self.final_scores is None:
+            self.final_scores = score_players(self.players, rng=self.random[MEASUREMENT].generator)
+        return self.final_scores
+
+    def play_game(self):
+        """一直进行到游戏结束，返回计分结果"""
+        while not self.is_game_over():
+            self.play_turn()
+        return self.finish()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""场景栈：整个游戏只保留一个显示窗口，小游戏和商店绘制到各自的逻辑画布上"""
+import pygame
+
+# 逻辑画布没有铺满窗口时，四周留白的颜色
+LETTERBOX_COLOR = (0, 0, 0)
+
+# 鼠标事件的类型，需要把坐标换算到逻辑画布上
+_MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+
+class Scene():
+    """一个场景：逻辑画布及其在窗口上的位置和缩放"""
+    def __init__(self, display, size, caption):
+        self.size = tuple(size)
+        self.caption = caption
+        display_rect = display.get_rect()
+        # 逻辑画布放得下时不缩放，否则按比例缩小
+        self.scale = min(1.0, display_rect.width / self.size[0],
+                         display_rect.height / self.size[1])
+        scaled_size = (int(self.size[0] * self.scale), int(self.size[1] * self.scale))
+        # 逻辑画布在窗口中居中，多出的部分留白
+        self.rect = pygame.Rect((0, 0), scaled_size)
+        self.rect.center = display_rect.center
+        if self.scale == 1.0:
+            # 直接绘制到窗口的子表面上，推送时不需要额外拷贝
+            self.surface = display.subsurface(self.rect)
+        else:
+            self.surface = pygame.Surface(self.size).convert()
+
+    def to_logical(self, pos):
+        """把窗口坐标换算成逻辑画布坐标"""
+        return (int((pos[0] - self.rect.left) / self.scale),
+                int((pos[1] - self.rect.top) / self.scale))
+
+
+class SceneStack():
+    """场景栈，进入和离开小游戏时不再重新创建显示窗口"""
+    def __init__(self):
+        self.scenes = []
+        # 每个场景进入前的窗口标题，离开时恢复
+        self.captions = []
+
+    def push(self, size, caption=None):
+        """进入一个新场景，返回该场景的逻辑画布"""
+        display = pygame.display.get_surface()
+        if display is None:
+            # 独立运行小游戏时还没有窗口，只在这里创建一次
+            display = pygame.display.set_mode(size)
+        self.captions.append(pygame.display.get_caption()[0])
+        if caption is not None:
+            pygame.display.set_caption(caption)
+        display.fill(LETTERBOX_COLOR)
+        scene = Scene(display, size, caption)
+        self.scenes.append(scene)
+        return scene.surface
+
+    def pop(self):
+        """离开当前场景，恢复上一层的窗口标题"""
+        if not self.scenes:
+            return
+        self.scenes.pop()
+        pygame.display.set_caption(self.captions.pop())
+        # 上一层画面需要整屏重绘
+        display = pygame.display.get_surface()
+        if display is not None:
+            display.fill(LETTERBOX_COLOR)
+
+    @property
+    def current(self):
+        """当前场景，没有时为 None"""
+        return self.scenes[-1] if self.scenes else None
+
+    def present(self):
+        """把当前场景推送到显示器"""
+        scene = self.current
+        if scene is not None and scene.scale != 1.0:
+            display = pygame.display.get_surface()
+            pygame.transform.smoothscale(scene.surface, scene.rect.size,
+                                         display.subsurface(scene.rect))
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        """把窗口坐标换算成当前场景的逻辑坐标"""
+        scene = self.current
+        if scene is None:
+            return pos
+        return scene.to_logical(pos)
+
+
+# 全局唯一的场景栈
+scenes = SceneStack()
+
+
+def push_scene(size, caption=None):
+    """进入一个新场景，返回该场景的逻辑画布"""
+    return scenes.push(size, caption)
+
+
+def pop_scene():
+    """离开当前场景"""
+    scenes.pop()
+
+
+def present_scene():
+    """把当前场景推送到显示器"""
+    scenes.present()
+
+
+def get_mouse_pos():
+    """当前场景中的鼠标位置"""
+    return scenes.to_logical(pygame.mouse.get_pos())
+
+
+def get_events():
+    """取出所有事件，鼠标事件的坐标已换算到当前场景"""
+    events = pygame.event.get()
+    if scenes.current is None:
+        return events
+    converted = []
+    for event in events:
+        if event.type in _MOUSE_EVENTS:
+            attrs = dict(event.dict)
+            attrs["pos"] = scenes.to_logical(event.pos)
+            event = pygame.event.Event(event.type, attrs)
+        converted.append(event)
+    return converted
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""游戏结束时的计分：所有玩家的全部量子比特以 |0>, |1> 为基一次性测量，每个 |1> 计 1 分"""
+import numpy as np
+
+
+def score_players(players, rng=None, seed=None):
+    """
+    批量测量所有玩家的量子比特并计分
+    参数:
+        players: 玩家列表，每个玩家的 qubits 为 QubitRegister
+        rng: numpy.random.Generator，为 None 时用 seed 新建
+    返回:
+        与 players 顺序一致的字典列表，包含测得 |1> 的个数以及测量前的期望得分和方差
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+
+    counts = np.array([len(player.qubits) for player in players], dtype=int)
+    if counts.sum():
+        probs = np.concatenate([player.qubits.probabilities() for player in players])
+    else:
+        probs = np.zeros(0)
+
+    # 所有量子比特共用一次随机数抽样
+    outcomes = rng.random(len(probs)) < probs
+    owners = np.repeat(np.arange(len(players)), counts)
+    ones = np.bincount(owners, weights=outcomes, minlength=len(players))
+    # 每个量子比特是独立的伯努利变量：期望 p，方差 p(1-p)
+    expected = np.bincount(owners, weights=probs, minlength=len(players))
+    variance = np.bincount(owners, weights=probs * (1 - probs), minlength=len(players))
+
+    results = []
+    start = 0
+    for i, player in enumerate(players):
+        end = start + counts[i]
+        # 测量后量子比特坍缩到经典态
+        player.qubits.collapse(None, outcomes[start:end])
+        score_before = player.score
+        player.score += int(ones[i])
+        results.append({
+            'player': player,
+            'qubit_count': int(counts[i]),
+            'ones': int(ones[i]),
+            'expected': float(expected[i]),
+            'variance': float(variance[i]),
+            'score_before': score_before,
+            'score': player.score,
+        })
+        start = end
+    return results
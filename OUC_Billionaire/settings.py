@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 import pygame
+from fonts import FONT_PATH, get_font
+from assets import load_image, get_scaled_image
 
 class Settings():
     """初始化游戏设置"""
@@ -10,6 +12,16 @@ class Settings():
         self.screen_size = (self.screen_width, self.screen_height)
         self.bg_color = (230, 230, 230)
         self.max_rounds = 8 # 最大游戏轮数
+        # 有动画时的帧率
+        self.fps = 30
+        # 空闲时等待事件的最长时间（毫秒），超时后刷新一次画面
+        self.idle_wait_ms = 500
+        # 主地图画面只刷新发生变化的区域，关闭后每帧整屏刷新
+        self.dirty_rect_rendering = True
+        # 由机器人操作的座位 {玩家id: "random"/"greedy"/"lookahead"/"mcts"}，其余座位由人操作
+        self.bot_seats = {}
+        # 机器人每一步操作之间的间隔（毫秒），方便观看
+        self.bot_step_ms = 600
         
         # 设置游戏统计信息
         self.ROLL_DICE = 0
@@ -33,6 +45,13 @@ class Settings():
         # 用于从其他模块安全访问地点实例列表 (例如传送功能)
         self.locations_instance_list = []
 
+        # 量子迷宫（Grover）小游戏的网格边长，不是16时使用随机生成的迷宫
+        self.grover_grid_size = 16  # 最大800（棋盘800像素，每格至少1像素）
+        # 为 True 时16×16也使用随机生成的迷宫
+        self.grover_procedural_maze = False
+        # 量子迷宫中是否默认显示概率热力图（游戏中按H键切换）
+        self.grover_heatmap = False
+
         # 小游戏列表
         self.minigame_configs={
             "mini_game_2": {"name": "liuliu的小游戏"},
@@ -40,33 +59,16 @@ class Settings():
             "simon": {"name": "众里寻s千百度"},
         }
         
-        # 设置游戏开始前的背景图片
-        self.bg_image = pygame.image.load("images/enter.png")
-        # 设置开始游戏按钮
-        self.play_button = pygame.image.load("images/play_button.png")
-        
-        # 设置清华地图
-        self.map = pygame.image.load("images/map.png")
-
-        #设置商店图片
-        self.shop_image = pygame.image.load("images/shop.png")
-
-        # 设置背包背景
-        self.backpack_image = pygame.transform.scale(
-            pygame.image.load("images/backpack.jpeg"),
-            (self.screen_width, self.screen_height)
-        )
-
-        # 设置获得qubit/道具时图片
-        self.get_qubit_item_image = pygame.image.load("images/get_qubit_item.png")
         # 奖励信息字体设置
-        self.reward_font_large = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 32)
-        self.reward_font_small = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
+        self.reward_font_large = get_font(FONT_PATH, 32)
+        self.reward_font_small = get_font(FONT_PATH, 24)
         self.reward_text_color = (0, 0, 0)
         self.reward_bg_color = (255, 255, 255, 200)  # 半透明白色
         
         # 设置玩家初始拥有的金钱
         self.player_init_money = 1000
+        # 整局游戏的随机数种子（骰子、地点事件、测量、Oracle 都由它派生），None 表示每局随机
+        self.random_seed = None
         
         # 设置地点圆点半径大小和颜色
         self.circle_radius = 6
@@ -94,4 +96,35 @@ class Settings():
         
         # 设置地点事件图片路径
         self.event_images_dir = "event_images"
-        
\ No newline at end of file
+        
+
+    # 图片资源在第一次使用时才加载，由 assets 模块缓存并转换像素格式
+    @property
+    def bg_image(self):
+        """游戏开始前的背景图片"""
+        return load_image("images/enter.png")
+
+    @property
+    def play_button(self):
+        """开始游戏按钮"""
+        return load_image("images/play_button.png")
+
+    @property
+    def map(self):
+        """清华地图"""
+        return load_image("images/map.png")
+
+    @property
+    def shop_image(self):
+        """商店图片"""
+        return load_image("images/shop.png")
+
+    @property
+    def backpack_image(self):
+        """背包背景（缩放到屏幕大小）"""
+        return get_scaled_image("images/backpack.jpeg", self.screen_size)
+
+    @property
+    def get_qubit_item_image(self):
+        """获得qubit/道具时的背景图片（缩放到屏幕大小）"""
+        return get_scaled_image("images/get_qubit_item.png", self.screen_size)
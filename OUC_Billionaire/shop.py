@@ -3,19 +3,21 @@ import sys
 from player import Qubit
 from tools import StealCard,UnlimitedMeasurementCard,Item
 from gate import *
+from fonts import FONT_PATH, get_font, render_text
+from scene import push_scene, pop_scene, present_scene, get_mouse_pos, get_events
+from assets import get_scaled_image
+from rules import SHOP_PRICES, SHOP_QUBITS
 def play(screen, ai_settings, current_player):
     print("11111111111111")
     global player_gold
-    main_size = screen.get_size()
-    main_caption = pygame.display.get_caption()[0]    
     # 初始化pygame
     pygame.init()
 
     # 设置屏幕尺寸
     SCREEN_WIDTH = 1000
     SCREEN_HEIGHT = 1000
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("量子商店")
+    # 在主窗口上进入商店场景，不重新创建显示窗口
+    screen = push_scene((SCREEN_WIDTH, SCREEN_HEIGHT), "量子商店")
 
     # 颜色定义
     WHITE = (255, 255, 255)
@@ -42,14 +44,8 @@ def play(screen, ai_settings, current_player):
                 player.add_item(Item())
 
         elif item.char == 3:
-            if item.name == "量子位0":
-                player.add_qubit(Qubit(alpha=1,beta=0))
-            elif item.name == "量子位1":
-                player.add_qubit(Qubit(alpha=0,beta=1))
-            elif item.name == "正向量子位":
-                player.add_qubit(Qubit(alpha=1, beta=1))
-            elif item.name == "负向量子位":
-                player.add_qubit(Qubit(alpha=1, beta=1))
+            alpha, beta = SHOP_QUBITS[item.name]
+            player.add_qubit(Qubit(alpha=alpha, beta=beta))
            
 
 
@@ -57,30 +53,25 @@ def play(screen, ai_settings, current_player):
 
     # 加载图片
     try:
-        background = pygame.image.load("images/shop.png").convert()
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        # 图片由 assets 模块缓存，再次进入商店时不再读盘和缩放
+        background = get_scaled_image("images/shop.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
         
-        # 假设我们有3种商品
-        item_images = [
-            pygame.image.load("images/card_X.png").convert_alpha(),
-            pygame.image.load("images/card_Z.png").convert_alpha(),
-            pygame.image.load("images/card_H.png").convert_alpha(),
-            pygame.image.load("images/card_Measure.png").convert_alpha(),
-            pygame.image.load("images/card_Grab.png").convert_alpha(),
-            pygame.image.load("images/card_qubit_pos.png").convert_alpha(),
-            pygame.image.load("images/card_qubit_neg.png").convert_alpha(),
-            pygame.image.load("images/card_qubit_0.png").convert_alpha(),
-            pygame.image.load("images/card_qubit_1.png").convert_alpha(),
-            
+        # 商品图片，缩放到合适大小
+        item_paths = [
+            "images/card_X.png",
+            "images/card_Z.png",
+            "images/card_H.png",
+            "images/card_Measure.png",
+            "images/card_Grab.png",
+            "images/card_qubit_pos.png",
+            "images/card_qubit_neg.png",
+            "images/card_qubit_0.png",
+            "images/card_qubit_1.png",
         ]
-        button_image = pygame.image.load("images/button_Buy.png").convert_alpha()
-        button_image = pygame.transform.scale(button_image, (200, 80))  # 缩放按钮图片到合适大小
+        item_images = [get_scaled_image(path, (100, 100)) for path in item_paths]
 
-        btn_return_image=pygame.image.load("images/button_return.png").convert_alpha()
-        btn_return_image = pygame.transform.scale(btn_return_image, (100, 80))  # 缩放按钮图片到合适大小
-        
-        # 缩放商品图片到合适大小
-        item_images = [pygame.transform.scale(img, (100, 100)) for img in item_images]
+        button_image = get_scaled_image("images/button_Buy.png", (200, 80))  # 缩放按钮图片到合适大小
+        btn_return_image = get_scaled_image("images/button_return.png", (100, 80))  # 缩放按钮图片到合适大小
         
     except pygame.error as e:
         print(f"无法加载图片: {e}")
@@ -157,9 +148,9 @@ def play(screen, ai_settings, current_player):
             
             # 显示商品信息
             if self.hovered or self.selected:
-                font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
-                name_text = font.render(f"{self.name}", True, BLACK)
-                price_text = font.render(f"价格: ${self.price}", True, RED)
+                font = get_font(FONT_PATH, 24)
+                name_text = render_text(font, f"{self.name}", BLACK)
+                price_text = render_text(font, f"价格: ${self.price}", RED)
                 
                 info_rect = pygame.Rect(self.rect.x, self.rect.bottom + 5, 
                                     max(name_text.get_width(), price_text.get_width()),
@@ -190,22 +181,22 @@ def play(screen, ai_settings, current_player):
     return_button = ReturnButton(btn_return_image, 180, 800)
     # 创建商品列表
     items = [
-        ShopItem(item_images[0], 170, 230, 200, "X门",1),
-        ShopItem(item_images[1], 370, 230, 200, "Z门",1),
-        ShopItem(item_images[2], 550, 230, 200, "H门",1),
-        ShopItem(item_images[3], 136, 410, 250, "测量卡",2),
-        ShopItem(item_images[4], 292, 410, 250, "抢夺卡",2),
-        ShopItem(item_images[5], 130, 570, 520, "正向量子位",3),
-        ShopItem(item_images[6], 280, 570, 520, "负向量子位",3),
-        ShopItem(item_images[7], 440, 570, 320, "量子位0",3),
-        ShopItem(item_images[8], 600, 570, 320, "量子位1",3),
+        ShopItem(item_images[0], 170, 230, SHOP_PRICES["X门"], "X门",1),
+        ShopItem(item_images[1], 370, 230, SHOP_PRICES["Z门"], "Z门",1),
+        ShopItem(item_images[2], 550, 230, SHOP_PRICES["H门"], "H门",1),
+        ShopItem(item_images[3], 136, 410, SHOP_PRICES["测量卡"], "测量卡",2),
+        ShopItem(item_images[4], 292, 410, SHOP_PRICES["抢夺卡"], "抢夺卡",2),
+        ShopItem(item_images[5], 130, 570, SHOP_PRICES["正向量子位"], "正向量子位",3),
+        ShopItem(item_images[6], 280, 570, SHOP_PRICES["负向量子位"], "负向量子位",3),
+        ShopItem(item_images[7], 440, 570, SHOP_PRICES["量子位0"], "量子位0",3),
+        ShopItem(item_images[8], 600, 570, SHOP_PRICES["量子位1"], "量子位1",3),
     ]
 
     # 玩家金币
     player_gold = current_player.money
 
     # 字体
-    font = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
+    font = get_font(FONT_PATH, 24)
 
     # 游戏主循环
     # 游戏主循环
@@ -222,9 +213,9 @@ def play(screen, ai_settings, current_player):
     total_cost = 0        # 记录总花费
     
     while running:
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 running = False
             
@@ -275,28 +266,27 @@ def play(screen, ai_settings, current_player):
         return_button.draw(screen)
         
         # 显示玩家金币
-        gold_text = font.render(f"金币: ${player_gold}", True, BLACK)
+        gold_text = render_text(font, f"金币: ${player_gold}", BLACK)
         screen.blit(gold_text, (20, 20))
         
         # 显示购买提示
         if selected_item:
-            hint_text = font.render(f"已选择: {selected_item.name}", True, BLACK)
+            hint_text = render_text(font, f"已选择: {selected_item.name}", BLACK)
             screen.blit(hint_text, (20, 60))
 
         # 显示已购商品列表
         if purchased_items:
-            purchased_text = font.render("已购: " + ", ".join([item.name for item in purchased_items]), True, BLACK)
+            purchased_text = render_text(font, "已购: " + ", ".join([item.name for item in purchased_items]), BLACK)
             screen.blit(purchased_text, (20, 100))
 
         
-        pygame.display.flip()
+        present_scene()
         clock.tick(60)
 
         if finished:
             running= False
 
-    pygame.display.set_mode(main_size)
-    pygame.display.set_caption(main_caption)
+    pop_scene()
 
     if purchased_items:
         message = "已购买：" + "、".join([item.name for item in purchased_items]) + f"，总花费：{total_cost}"
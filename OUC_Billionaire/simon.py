@@ -1,8 +1,10 @@
 import pygame
 import sys
-import random
 import math
-from typing import Dict
+import numpy as np
+from fonts import FONT_PATH, get_font, render_text
+from scene import push_scene, pop_scene, present_scene, get_events
+from random_service import stream, MEASUREMENT, ORACLES
 
 # 初始化pygame
 pygame.init()
@@ -29,79 +31,70 @@ NAVY = (25, 25, 112)
 ## 确认一下不同量子数应用测量数等于几比较好：不能让玩家有机会枚举了（  但是也要给oracle的随机留够机会
 
 # 字体初始化
-try:
-    font_title = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 36)
-    font_large = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 24)
-    font_medium = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 20)
-    font_small = pygame.font.Font('fonts/Noto_Sans_SC.ttf', 16)
-except:
-    font_title = pygame.font.Font(None, 36)
-    font_large = pygame.font.Font(None, 24)
-    font_medium = pygame.font.Font(None, 20)
-    font_small = pygame.font.Font(None, 16)
+font_title = get_font(FONT_PATH, 36)
+font_large = get_font(FONT_PATH, 24)
+font_medium = get_font(FONT_PATH, 20)
+font_small = get_font(FONT_PATH, 16)
+
+def fwht(amplitudes):
+    """原地快速沃尔什-阿达马变换（未归一化），长度必须是2的幂"""
+    size = len(amplitudes)
+    h = 1
+    while h < size:
+        # 每一轮把下标第 log2(h) 位为0和为1的振幅两两配对做蝶形运算
+        pairs = amplitudes.reshape(-1, 2, h)
+        low = pairs[:, 0, :].copy()
+        pairs[:, 0, :] += pairs[:, 1, :]
+        pairs[:, 1, :] = low - pairs[:, 1, :]
+        h *= 2
+    return amplitudes
+
+def make_simon_oracle(n_qubits, s):
+    """生成满足 f(x) = f(x⊕s) 的随机二对一 Oracle，返回长度为 2^n 的整数查找表"""
+    size = 1 << n_qubits
+    outputs = stream(ORACLES).generator.permutation(size)
+    x = np.arange(size)
+    # x 与 x⊕s 共用较小者的输出，不同的 {x, x⊕s} 对输出互不相同
+    return outputs[np.minimum(x, x ^ s)]
 
 class QuantumState:
-    """简化的量子态类"""
+    """Simon算法的量子态：寄存器A为稠密振幅向量，纠缠态用寄存器B的取值数组表示"""
     def __init__(self, n_qubits: int):
         self.n_qubits = n_qubits
-        self.register_a = {0: 1.0}  # |000...>
-        self.register_b = {0: 1.0}
+        self.size = 1 << n_qubits
+        # 寄存器A的振幅，初始为|000...>
+        self.register_a = np.zeros(self.size)
+        self.register_a[0] = 1.0
+        # 寄存器B始终处于计算基态，只记录其取值
+        self.register_b = 0
         self.is_entangled = False
-        self.entangled_state = {}
+        # 纠缠态 Σ a_x |x>|b_index[x]>：Oracle作用时A的振幅，以及每个x对应的B取值
+        self.entangled_amplitudes = None
+        self.b_index = None
         self.had_final_h = False
         
     def set_input(self, x: int):
         """设置输入状态"""
         print(f"DEBUG: 设置输入状态 x = {bin(x)[2:].zfill(self.n_qubits)}")
-        self.register_a = {x: 1.0}
-        self.register_b = {0: 1.0}
+        self.register_a = np.zeros(self.size)
+        self.register_a[x] = 1.0
+        self.register_b = 0
         self.is_entangled = False
         
     def apply_hadamard_a(self):
-        """对寄存器A应用H变换"""
+        """对寄存器A应用H变换（快速沃尔什-阿达马变换，O(n·2^n)）"""
         print(f"DEBUG: 对寄存器A应用Hadamard变换")
-        print(f"DEBUG: 变换前 register_a = {self.register_a}")
-        
-        new_register = {}
-        norm_factor = 1.0 / math.sqrt(2 ** self.n_qubits)
-
-        # 对每个可能的输出状态y计算振幅
-        for y in range(2 ** self.n_qubits):
-            total_amplitude = 0
-            
-            # 对寄存器A中的每个状态x计算贡献
-            for x, amplitude in self.register_a.items():
-                # 计算 (-1)^(x·y) 相位因子
-                phase = (-1) ** (bin(x & y).count('1'))
-                total_amplitude += amplitude * phase * norm_factor
-            
-            # 只保留非零振幅的状态
-            if abs(total_amplitude) > 1e-10:
-                new_register[y] = total_amplitude
-    
-        self.register_a = new_register
+        fwht(self.register_a)
+        self.register_a /= math.sqrt(self.size)
         self.had_final_h = True
-        print(f"DEBUG: 变换后 register_a = {new_register}")
-        print(f"DEBUG: Hadamard变换完成，had_final_h = {self.had_final_h}")
+        print(f"DEBUG: Hadamard变换完成，非零振幅 {np.count_nonzero(np.abs(self.register_a) > 1e-10)} 个")
         
-    def apply_oracle(self, oracle_func: Dict[int, int]):
-        """应用Oracle"""
+    def apply_oracle(self, oracle_func):
+        """应用Oracle：|x>|y> -> |x>|y⊕f(x)>，oracle_func 为整数查找表"""
         print(f"DEBUG: 应用Oracle")
-        print(f"DEBUG: Oracle前 register_a = {self.register_a}")
-        print(f"DEBUG: Oracle前 register_b = {self.register_b}")
-        
-        new_state = {}
-        for x, amp_a in self.register_a.items():
-            for y, amp_b in self.register_b.items():
-                fx = oracle_func.get(x, 0)
-                new_y = y ^ fx
-                key = (x, new_y)
-                new_state[key] = new_state.get(key, 0) + amp_a * amp_b
-                print(f"DEBUG: Oracle映射 x={bin(x)[2:].zfill(self.n_qubits)} -> f(x)={bin(fx)[2:].zfill(self.n_qubits)}, y={bin(y)[2:].zfill(self.n_qubits)} -> new_y={bin(new_y)[2:].zfill(self.n_qubits)}")
-        
-        self.entangled_state = new_state
+        self.entangled_amplitudes = self.register_a.copy()
+        self.b_index = np.bitwise_xor(oracle_func, self.register_b)
         self.is_entangled = True
-        print(f"DEBUG: Oracle后纠缠态 = {new_state}")
         
     def measure_b(self):
         """测量寄存器B"""
@@ -110,36 +103,17 @@ class QuantumState:
             print(f"DEBUG: 未纠缠状态，返回B=0")
             return 0, self.register_a
             
-        # 计算B的概率分布
-        b_probs = {}
-        for (x, b), amplitude in self.entangled_state.items():
-            b_probs[b] = b_probs.get(b, 0) + abs(amplitude) ** 2
-            
-        print(f"DEBUG: B寄存器概率分布 = {b_probs}")
-        
-        # 随机选择测量结果
-        b_values = list(b_probs.keys())
-        probabilities = list(b_probs.values())
-        measured_b = random.choices(b_values, weights=probabilities)[0]
-        
+        # 计算B的边缘概率分布
+        weights = np.abs(self.entangled_amplitudes) ** 2
+        b_probs = np.bincount(self.b_index, weights=weights, minlength=self.size)
+        measured_b = int(stream(MEASUREMENT).generator.choice(self.size, p=b_probs / b_probs.sum()))
         print(f"DEBUG: 测量得到B = {bin(measured_b)[2:].zfill(self.n_qubits)}")
         
-        # 坍缩寄存器A
-        collapsed_a = {}
-        total_prob = 0
-        for (x, b), amplitude in self.entangled_state.items():
-            if b == measured_b:
-                collapsed_a[x] = amplitude
-                total_prob += abs(amplitude) ** 2
-                print(f"DEBUG: A寄存器坍缩包含状态 x={bin(x)[2:].zfill(self.n_qubits)}, amplitude={amplitude}")
-                
-        # 归一化
+        # 坍缩寄存器A并归一化
+        collapsed_a = np.where(self.b_index == measured_b, self.entangled_amplitudes, 0.0)
+        total_prob = b_probs[measured_b]
         if total_prob > 0:
-            norm_factor = 1.0 / math.sqrt(total_prob)
-            for x in collapsed_a:
-                collapsed_a[x] *= norm_factor
-        
-        print(f"DEBUG: 坍缩后A寄存器 = {collapsed_a}")
+            collapsed_a /= math.sqrt(total_prob)
         
         self.register_a = collapsed_a
         self.is_entangled = False
@@ -148,78 +122,92 @@ class QuantumState:
     def measure_a(self):
         """测量寄存器A"""
         print(f"DEBUG: 开始测量寄存器A")
-        if not self.register_a:
+        probs = np.abs(self.register_a) ** 2
+        total_prob = probs.sum()
+        if total_prob == 0:
             print(f"DEBUG: A寄存器为空，返回0")
             return 0
-            
-        probs = {x: abs(amp)**2 for x, amp in self.register_a.items()}
-        print(f"DEBUG: A寄存器概率分布 = {probs}")
-        x_values = list(probs.keys())
-        probabilities = list(probs.values())
-        result = random.choices(x_values, weights=probabilities)[0]
+        result = int(stream(MEASUREMENT).generator.choice(self.size, p=probs / total_prob))
         print(f"DEBUG: 测量得到A = {bin(result)[2:].zfill(self.n_qubits)}")
         return result
 
-def gf2_rank(matrix):
-    """计算GF(2)矩阵的秩"""
-    if not matrix:
-        return 0
-    
-    rows, cols = len(matrix), len(matrix[0])
-    rank = 0
-    work_matrix = [row[:] for row in matrix]
-    
-    for col in range(cols):
-        # 找主元
-        pivot_row = -1
-        for row in range(rank, rows):
-            if work_matrix[row][col] == 1:
-                pivot_row = row
-                break
-        
-        if pivot_row == -1:
-            continue
-        
-        # 交换行
-        if pivot_row != rank:
-            work_matrix[rank], work_matrix[pivot_row] = work_matrix[pivot_row], work_matrix[rank]
-        
-        # 消元
-        for row in range(rows):
-            if row != rank and work_matrix[row][col] == 1:
-                for c in range(cols):
-                    work_matrix[row][c] ^= work_matrix[rank][c]
-        
-        rank += 1
-    
-    return rank
+def gf2_insert(pivots, vector):
+    """
+    把一个方程（整数位掩码）加入简化行阶梯形 pivots = {主元位: 行}
+    每次只做整数异或，返回该方程是否与已有方程线性无关
+    """
+    # 用已有的主元行消去该方程的主元位
+    for bit, row in pivots.items():
+        if vector >> bit & 1:
+            vector ^= row
+    if not vector:
+        return False
+    # 最高位作为新的主元，并从其他行中消去这一位，保持简化行阶梯形
+    bit = vector.bit_length() - 1
+    for other in pivots:
+        if pivots[other] >> bit & 1:
+            pivots[other] ^= vector
+    pivots[bit] = vector
+    return True
+
+def gf2_eliminate(vectors):
+    """GF(2)高斯消元，每行用整数位掩码表示，返回简化行阶梯形 {主元位: 行}"""
+    pivots = {}
+    for vector in vectors:
+        gf2_insert(pivots, vector)
+    return pivots
+
+def gf2_rank(vectors):
+    """计算GF(2)矩阵的秩（每行为整数位掩码）"""
+    return len(gf2_eliminate(vectors))
+
+def gf2_null_vector(pivots, n):
+    """秩为 n-1 时从简化行阶梯形直接读出唯一的非零零空间向量，否则返回 None"""
+    if len(pivots) != n - 1:
+        return None
+    # 唯一的自由位取1，每个主元位等于其所在行在自由位上的值
+    free_bit = next(bit for bit in range(n) if bit not in pivots)
+    s = 1 << free_bit
+    for bit, row in pivots.items():
+        if row >> free_bit & 1:
+            s |= 1 << bit
+    return s
+
+class GF2Basis:
+    """增量维护的GF(2)方程组：每加入一个测得的向量只需 O(n) 次整数异或，随时可读出秩和冗余数"""
+    def __init__(self, n):
+        self.n = n
+        self.pivots = {}  # 简化行阶梯形 {主元位: 行}
+        self.count = 0    # 已加入的方程总数
+
+    def add(self, vector):
+        """加入一个方程，返回它是否与已有方程线性无关"""
+        self.count += 1
+        return gf2_insert(self.pivots, vector)
+
+    @property
+    def rank(self):
+        """线性无关方程的个数"""
+        return len(self.pivots)
+
+    @property
+    def redundant(self):
+        """与已有方程线性相关（没有提供新信息）的方程个数"""
+        return self.count - self.rank
+
+    def is_complete(self):
+        """是否已收集到 n-1 个线性无关方程，可以唯一确定 s"""
+        return self.rank >= self.n - 1
+
+    def solve(self):
+        """方程足够时返回隐藏字符串 s，否则返回 None"""
+        return gf2_null_vector(self.pivots, self.n)
 
 def solve_simon(vectors, n):
-    """求解Simon问题"""
+    """求解Simon问题：s 是所有测得向量 y 满足 s·y = 0 (mod 2) 的唯一非零解"""
     if len(vectors) < n - 1:
         return None
-    
-    unique_vectors = list(set(vectors))
-    matrix = []
-    for v in unique_vectors:
-        row = [(v >> (n-1-i)) & 1 for i in range(n)]
-        matrix.append(row)
-        
-    rank = gf2_rank(matrix)
-    if rank < n - 1:
-        return None
-    
-    # 枚举所有可能解
-    for s in range(1, 2**n):
-        valid = True
-        for v in unique_vectors:
-            if bin(s & v).count('1') % 2 != 0:
-                valid = False
-                break
-        if valid:
-            return s
-    
-    return None
+    return gf2_null_vector(gf2_eliminate(vectors), n)
 
 def draw_panel(screen, x, y, width, height, title=""):
     """绘制面板"""
@@ -228,7 +216,7 @@ def draw_panel(screen, x, y, width, height, title=""):
     pygame.draw.rect(screen, NAVY, rect, 2)
     
     if title:
-        title_surface = font_medium.render(title, True, NAVY)
+        title_surface = render_text(font_medium, title, NAVY)
         screen.blit(title_surface, (x + 10, y + 5))
 
 def draw_button(screen, x, y, width, height, text, color=BLUE, enabled=True):
@@ -240,7 +228,7 @@ def draw_button(screen, x, y, width, height, text, color=BLUE, enabled=True):
     pygame.draw.rect(screen, DARK_GRAY, rect, 1)
     
     text_color = WHITE if enabled else DARK_GRAY
-    text_surface = font_small.render(text, True, text_color)
+    text_surface = render_text(font_small, text, text_color)
     text_rect = text_surface.get_rect(center=rect.center)
     screen.blit(text_surface, text_rect)
     
@@ -248,20 +236,20 @@ def draw_button(screen, x, y, width, height, text, color=BLUE, enabled=True):
 
 class SimonGame:
     """简化的Simon算法游戏"""
-    def __init__(self, player):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Simon算法游戏")
+    def __init__(self, player, screen):
+        self.screen = screen
         self.clock = pygame.time.Clock()
         self.running = True
         
         # 游戏参数
         self.n = 3
         self.s = 0
-        self.oracle_func = {}
+        self.oracle_func = None
         
         # 游戏状态
         self.quantum_state = QuantumState(self.n)
         self.orthogonal_vectors = []
+        self.basis = GF2Basis(self.n)  # 与 orthogonal_vectors 同步的增量方程组
         self.player = player
         self.oracle_queries = 0
         self.max_queries = self.n * 2
@@ -294,34 +282,21 @@ class SimonGame:
         
     def init_new_game(self):
         """初始化新游戏"""
-        self.s = random.randint(1, (1 << self.n) - 1)
+        self.s = stream(ORACLES).randint(1, (1 << self.n) - 1)
         print(f"DEBUG: ===== 新游戏开始 =====")
         print(f"DEBUG: 隐藏的s = {bin(self.s)[2:].zfill(self.n)} (十进制: {self.s})")
         
-        # 生成Simon Oracle
-        self.oracle_func = {}
-        processed = set()
-        available_outputs = list(range(1 << self.n))
-        random.shuffle(available_outputs)
-        
-        for x in range(1 << self.n):
-            if x in processed:
-                continue
-            x_xor_s = x ^ self.s
-            if available_outputs:
-                y = available_outputs.pop()
-                self.oracle_func[x] = y
-                self.oracle_func[x_xor_s] = y
-                processed.add(x)
-                processed.add(x_xor_s)
-        
-        print(f"DEBUG: Oracle函数:")
-        for x, fx in sorted(self.oracle_func.items()):
-            print(f"DEBUG:   f({bin(x)[2:].zfill(self.n)}) = {bin(fx)[2:].zfill(self.n)}")
+        # 生成Simon Oracle（整数查找表）
+        self.oracle_func = make_simon_oracle(self.n, self.s)
+        if self.n <= 4:
+            print(f"DEBUG: Oracle函数:")
+            for x, fx in enumerate(self.oracle_func.tolist()):
+                print(f"DEBUG:   f({bin(x)[2:].zfill(self.n)}) = {bin(fx)[2:].zfill(self.n)}")
         
         # 重置状态
         self.quantum_state = QuantumState(self.n)
         self.orthogonal_vectors = []
+        self.basis = GF2Basis(self.n)  # 与 orthogonal_vectors 同步的增量方程组
         self.oracle_queries = 0
         self.max_queries = self.n * 2
         self.game_won = False
@@ -441,26 +416,8 @@ class SimonGame:
         
         print(f"DEBUG: ----- 测量寄存器A -----")
         
-        # 计算每个状态的概率（振幅的模平方）
-        probs = {}
-        total_prob = 0
-        for x, amplitude in self.quantum_state.register_a.items():
-            prob = abs(amplitude) ** 2
-            probs[x] = prob
-            total_prob += prob
-        
-        # 归一化概率
-        if total_prob > 0:
-            for x in probs:
-                probs[x] /= total_prob
-        
-        # 根据概率随机选择
-        if probs:
-            x_values = list(probs.keys())
-            probabilities = list(probs.values())
-            measured_y = random.choices(x_values, weights=probabilities)[0]
-        else:
-            measured_y = 0
+        # 按振幅的模平方随机得到测量结果
+        measured_y = self.quantum_state.measure_a()
         
         had_final_h = self.quantum_state.had_final_h
         
@@ -493,7 +450,8 @@ class SimonGame:
         # 如果是正交且非零向量，加入向量集合
         if is_orthogonal and measured_y != 0:
             self.orthogonal_vectors.append(measured_y)
-            print(f"DEBUG: 添加正交向量到集合: {y_str}")
+            independent = self.basis.add(measured_y)
+            print(f"DEBUG: 添加正交向量到集合: {y_str}, 线性无关: {independent}")
         elif measured_y == 0:
             self.add_message("测量结果为0，无信息量", GRAY)
         
@@ -506,10 +464,9 @@ class SimonGame:
         # 重置量子态
         self.quantum_state = QuantumState(self.n)
 
-    # 计算线性无关向量数量用于按钮启用判断 - 删除此功能
     def get_independent_vector_count(self):
-        """获取线性无关向量数量 - 已禁用"""
-        return 0  # 始终返回0，禁用自动求解按钮
+        """获取线性无关向量数量（由增量方程组直接给出）"""
+        return self.basis.rank
 
     def auto_solve(self):
         """自动求解"""
@@ -592,7 +549,7 @@ class SimonGame:
     
     def handle_events(self):
         """处理事件"""
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -676,7 +633,7 @@ class SimonGame:
         self.screen.fill((250, 250, 250))
         
         # 标题
-        title_surface = font_title.render("众里寻s千百度", True, NAVY)
+        title_surface = render_text(font_title, "众里寻s千百度", NAVY)
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH // 2, 25))
         self.screen.blit(title_surface, title_rect)
         
@@ -684,7 +641,7 @@ class SimonGame:
         status = f"金钱:{self.player.money} | Oracle:{self.oracle_queries}/{self.max_queries}"
         if self.game_won:
             status += " | 胜利！"
-        status_surface = font_small.render(status, True, NAVY)
+        status_surface = render_text(font_small, status, NAVY)
         self.screen.blit(status_surface, (20, 50))
         
         # 难度选择
@@ -712,12 +669,12 @@ class SimonGame:
             
             # 显示输入内容
             input_text = self.custom_input + "_" if len(self.custom_input) < self.n else self.custom_input
-            input_surface = font_medium.render(input_text, True, NAVY)
+            input_surface = render_text(font_medium, input_text, NAVY)
             self.screen.blit(input_surface, (35, 270))
             
             # 显示提示
             hint_text = f"请输入{self.n}位二进制数 (例: {'0'*(self.n-1)}1)"
-            hint_surface = font_small.render(hint_text, True, GRAY)
+            hint_surface = render_text(font_small, hint_text, GRAY)
             self.screen.blit(hint_surface, (30, 295))
         
         # Simon算法步骤 - 位置下移
@@ -756,11 +713,11 @@ class SimonGame:
             pygame.draw.rect(self.screen, BLUE, answer_rect, 2)
             
             answer_text = self.answer_input + "_" if len(self.answer_input) < self.n else self.answer_input
-            answer_surface = font_medium.render(answer_text, True, NAVY)
+            answer_surface = render_text(font_medium, answer_text, NAVY)
             self.screen.blit(answer_surface, (35, 635))
             
             hint_text = f"输入{self.n}位二进制答案"
-            hint_surface = font_small.render(hint_text, True, GRAY)
+            hint_surface = render_text(font_small, hint_text, GRAY)
             self.screen.blit(hint_surface, (30, 660))
         
         self.button_rects["reset"] = draw_button(self.screen, 30, 690, 230, 25, 
@@ -781,7 +738,7 @@ class SimonGame:
         y_pos = 110
         for message, color in self.messages:
             if message:
-                text_surface = font_small.render(message, True, color)
+                text_surface = render_text(font_small, message, color)
                 self.screen.blit(text_surface, (310, y_pos))
             y_pos += 18
         
@@ -811,29 +768,14 @@ class SimonGame:
         if not self.measurement_results:
             status_lines.append("(暂无测量结果)")
         
-        # 删除正交向量和线性无关性显示
-        # if self.orthogonal_vectors:
-        #     status_lines.append("")
-        #     status_lines.append("有效正交向量:")
-        #     for i, v in enumerate(self.orthogonal_vectors):
-        #         v_str = bin(v)[2:].zfill(self.n)
-        #         # 验证显示
-        #         dot_check = "√" if bin(self.s & v).count('1') % 2 == 0 else "×"
-        #         status_lines.append(f"v{i+1}: {v_str} {dot_check}")
-        
-        # if self.orthogonal_vectors:
-        #     # 检查线性无关性
-        #     unique_vectors = list(set(self.orthogonal_vectors))
-        #     matrix = []
-        #     for v in unique_vectors:
-        #         row = [(v >> (self.n-1-i)) & 1 for i in range(self.n)]
-        #         matrix.append(row)
-        #     rank = gf2_rank(matrix)
-        #     status_lines.extend([
-        #         "",
-        #         f"线性无关向量: {rank}/{self.n-1}",
-        #         "√ 可以尝试求解！" if rank >= self.n-1 else "还需要更多向量"
-        #     ])
+        # 线性无关方程进度，由增量方程组直接读出，不需要每帧重新消元
+        status_lines.extend([
+            "",
+            f"线性无关方程: {self.basis.rank}/{self.n - 1}",
+        ])
+        if self.basis.redundant:
+            status_lines.append(f"线性相关（冗余）方程: {self.basis.redundant}")
+        status_lines.append("√ 可以尝试求解！" if self.basis.is_complete() else "还需要更多方程")
         
         if self.game_won:
             status_lines.extend([
@@ -845,7 +787,7 @@ class SimonGame:
         y_pos = 110
         for line in status_lines:
             color = GOLD if "胜利" in line or "√" in line else NAVY
-            text_surface = font_small.render(line, True, color)
+            text_surface = render_text(font_small, line, color)
             self.screen.blit(text_surface, (730, y_pos))
             y_pos += 18
         
@@ -868,11 +810,11 @@ class SimonGame:
         for line in guide_lines:
             color = GRAY if line else BLACK
             if line:
-                text_surface = font_small.render(line, True, color)
+                text_surface = render_text(font_small, line, color)
                 self.screen.blit(text_surface, (310, y_pos))
             y_pos += 15
         
-        pygame.display.flip()
+        present_scene()
     
     def run(self):
         """运行游戏"""
@@ -888,16 +830,11 @@ class SimonGame:
 def play(screen, ai_settings, current_player):
     """小游戏入口函数 - 使用独立屏幕"""
     
-    # 保存主游戏的屏幕信息
-    main_size = (ai_settings.screen_width, ai_settings.screen_height)
-    main_caption = pygame.display.get_caption()[0]
-    
-    # 创建独立的小游戏屏幕（使用您自己调整的尺寸）
-    game_screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Simon算法游戏")
+    # 在主窗口上进入小游戏场景，不重新创建显示窗口
+    game_screen = push_scene((WINDOW_WIDTH, WINDOW_HEIGHT), "Simon算法游戏")
     
-    # 创建游戏实例，使用独立屏幕
-    game = SimonGame(current_player)  # 不传入外部屏幕，让它使用自己的
+    # 创建游戏实例，绘制到小游戏场景的画布上
+    game = SimonGame(current_player, game_screen)
     
     try:
         # 运行完整的游戏循环
@@ -927,23 +864,22 @@ def play(screen, ai_settings, current_player):
         }
     
     finally:
-        # 恢复主游戏屏幕（关键步骤！）
-        pygame.display.set_mode(main_size)
-        pygame.display.set_caption(main_caption)
+        # 离开小游戏场景，回到主画面
+        pop_scene()
     
     return result
 
 def main():
     """主函数 - 独立运行"""
     pygame.init()
-    screen = pygame.display.set_mode((800, 600))
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     class MockPlayer:
         def __init__(self):
             self.money = 1000
             self.score = 0
     
     player = MockPlayer()
-    game = SimonGame(player)
+    game = SimonGame(player, push_scene((WINDOW_WIDTH, WINDOW_HEIGHT), "Simon算法游戏"))
     game.run()
 
 if __name__ == "__main__":
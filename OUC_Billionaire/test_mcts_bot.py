@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""MCTSBot 的思考时间：候选决策很多时也要在 budget_ms 内给出决策"""
+import itertools
+import os
+import time
+
+from batch_sim import SampledMiniGames
+from mcts_bot import MCTSBot, SHOP, INVENTORY, inventory_actions
+from qubit import Qubit
+from rules import GameRules, PlayerState, SHOP_PRICES, build_board, read_board
+
+BUDGET_MS = 200
+MARGIN_MS = 100
+
+
+def make_rules():
+    """两个玩家的对局，当前玩家有 8 个量子比特、4 个门、一张测量卡和 1500 金钱"""
+    board = build_board(read_board(os.path.join(os.path.dirname(__file__), "data", "locations_list.txt")))
+    players = [PlayerState("红色小人", 1500, 1), PlayerState("橙色小人", 1000, 2)]
+    for i in range(8):
+        players[0].qubits.append(Qubit(*[(1, 0), (0.6, 0.8), (1, 1), (1, -1)][i % 4]))
+    players[0].gates = ["X", "Z", "H", "H"]
+    players[0].items = ["不限回合测量卡"]
+    return GameRules(board, players, max_rounds=8, seed=0, mini_game_policy=SampledMiniGames())
+
+
+def many_bundles():
+    """最多买三件的所有组合，共 200 多个候选决策"""
+    bundles = []
+    for size in (1, 2, 3):
+        bundles += itertools.combinations_with_replacement(SHOP_PRICES, size)
+    return bundles
+
+
+def timed_best_action(bot, kind, actions):
+    start = time.perf_counter()
+    action = bot.best_action(kind, actions)
+    return action, (time.perf_counter() - start) * 1000
+
+
+def test_many_actions_within_budget():
+    actions = many_bundles()
+    assert len(actions) >= 200
+    bot = MCTSBot(budget_ms=BUDGET_MS, workers=0, seed=0)
+    bot.observe(make_rules())
+    action, elapsed = timed_best_action(bot, SHOP, actions)
+    assert action in actions
+    assert elapsed < BUDGET_MS + MARGIN_MS
+
+
+def test_process_pool_within_budget():
+    bot = MCTSBot(budget_ms=BUDGET_MS, workers=2, seed=0)
+    bot.observe(make_rules())
+    try:
+        for kind, actions in ((SHOP, many_bundles()),
+                              (INVENTORY, inventory_actions(bot.rules.cur_player))):
+            action, elapsed = timed_best_action(bot, kind, actions)
+            assert action in actions
+            assert elapsed < BUDGET_MS + MARGIN_MS
+    finally:
+        bot.close()
@@ -1,7 +1,7 @@
 import pygame
 import numpy as np
-import random
 from mini_game_teleportation import QuantumTeleportationGame
+from random_service import stream, EVENTS
 
 class Item:
     """基础道具类"""
@@ -148,7 +148,7 @@ class DuelCard(Item):
             {"question": "|+>态测量得到|1>的概率是多少?", "answer": "50%"},
             {"question": "量子隐形传态需要多少经典比特?", "answer": "2"}
         ]
-        problem = random.choice(problems)
+        problem = stream(EVENTS).choice(problems)
         
         print(f"\n问题: {problem['question']}")
         
@@ -162,7 +162,7 @@ class DuelCard(Item):
         
         if player_correct and not target_correct:
             # 玩家赢
-            reward = random.choice(["qubit", "score"])
+            reward = stream(EVENTS).choice(["qubit", "score"])
             if reward == "qubit" and target_player.qubits:
                 stolen_qubit = target_player.qubits.pop()
                 target_player.qubit_count -= 1
@@ -174,7 +174,7 @@ class DuelCard(Item):
                 result = "赢得对战! 获得2分"
         elif target_correct and not player_correct:
             # 对手赢
-            penalty = random.choice(["qubit", "score"])
+            penalty = stream(EVENTS).choice(["qubit", "score"])
             if penalty == "qubit" and player.qubits:
                 lost_qubit = player.qubits.pop()
                 player.qubit_count -= 1
@@ -218,7 +218,7 @@ class ForcedMeasurementCard(Item):
         if not player.qubits:
             return "没有可测量的量子比特"
         
-        index = random.randint(0, len(player.qubits)-1)
+        index = stream(EVENTS).randint(0, len(player.qubits)-1)
         outcome, score_change = player.measure_qubit(index)
         return f"被迫测量量子比特，结果为{outcome}，得分变化{score_change}"
 
@@ -237,8 +237,8 @@ class FixedRotationCard(Item):
             return "没有可干扰的量子比特"
         
         # 随机选择量子比特和旋转角度
-        qubit_index = random.randint(0, len(player.qubits)-1)
-        angle = random.choice(self.possible_angles)
+        qubit_index = stream(EVENTS).randint(0, len(player.qubits)-1)
+        angle = stream(EVENTS).choice(self.possible_angles)
         
         # 创建旋转门矩阵
         gate = np.array([